@@ -1,67 +1,16 @@
-import re
 import json
-from .course_grouping_service import CourseGroupingService
-from .scraper_service import get_course_data_and_update_cache
-
-def _simplify_name(name: str) -> str:
-    """Simplifies a name to only its lowercase letters."""
-    if not isinstance(name, str):
-        return ""
-    return "".join(filter(str.isalpha, name)).lower()
+from .course_grouping_service import get_grouping_service
+from .instance_keys import parse_instance_key
+from .sufficient_statistics import STAT_MAPPINGS, _simplify_name, compute_sufficient_statistics
+from .scraper_service import get_courses_data_batch
 
 def parse_semester_year(instance_key: str) -> tuple[int, int]:
     """Parse semester and year from instance key for chronological sorting."""
-    # Updated regex to be more specific and include 'IN' for intersession
-    match = re.search(r'\.((?:IN|SP|SU|FA))(\d{2})$', instance_key)
-    if match:
-        semester, year = match.groups()
-        year_num = int('20' + year)  # Convert '24' to 2024
-
-        # Convert semesters to numbers for sorting (IN=0, SP=1, SU=2, FA=3)
-        semester_order = {'IN': 0, 'SP': 1, 'SU': 2, 'FA': 3}
-        semester_num = semester_order.get(semester, 0)
-
-        return (year_num, semester_num)
-    return (0, 0)  # Default for unparseable keys
-
-
-# --- Mappings for Statistical Calculations ---
-
-# Maps frequency keys to a tuple: (name for UI, numerical value mapping)
-STAT_MAPPINGS = {
-    "overall_quality_frequency": (
-        "Overall Quality",
-        {"Poor": 1, "Weak": 2, "Satisfactory": 3, "Good": 4, "Excellent": 5}
-    ),
-    "instructor_effectiveness_frequency": (
-        "Instructor Effectiveness",
-        {"Poor": 1, "Weak": 2, "Satisfactory": 3, "Good": 4, "Excellent": 5}
-    ),
-    "intellectual_challenge_frequency": (
-        "Intellectual Challenge",
-        {"Poor": 1, "Weak": 2, "Satisfactory": 3, "Good": 4, "Excellent": 5}
-    ),
-    "workload_frequency": (
-        "Workload",
-        {"Much lighter": 1, "Somewhat lighter": 2, "Typical": 3, "Somewhat heavier": 4, "Much heavier": 5}
-    ),
-    "feedback_frequency": (
-        "Helpful Feedback",
-        {"Disagree strongly": 1, "Disagree somewhat": 2, "Neither agree nor disagree": 3, "Agree somewhat": 4, "Agree strongly": 5}
-    ),
-    "ta_frequency": (
-        "TA Quality",
-        {"Poor": 1, "Weak": 2, "Satisfactory": 3, "Good": 4, "Excellent": 5}
-    ),
-    "periods_course_has_been_run": (
-        "Periods Course Has Been Run",
-        {}  # Special case - computed field, no frequency mapping needed
-    )
-}
+    # (year, semester) with IN=0, SP=1, SU=2, FA=3, or (0, 0) for unparseable keys
+    return parse_instance_key(instance_key).sort_key
 
-# --- Core Calculation Functions ---
 
-grouping_service = CourseGroupingService()
+# --- Core Calculation Functions ---
 
 def calculate_weighted_average(frequency_dict: dict, value_mapping: dict) -> float:
     """
@@ -88,6 +37,32 @@ def calculate_weighted_average(frequency_dict: dict, value_mapping: dict) -> flo
     return round(weighted_sum / total_responses, 2)
 
 
+def moments_to_statistics(n, total, total_squares) -> dict:
+    """
+    Turns the count, sum and sum of squares of a set of responses into their mean, sample standard
+    deviation and count, rounded like the rest of the analysis.
+
+    Returns:
+        dict: Contains 'mean', 'std', 'n' keys. Returns None values if there are no responses.
+    """
+    if n == 0:
+        return {"mean": None, "std": None, "n": 0}
+
+    mean = total / n
+    if n == 1:
+        std = 0.0
+    else:
+        # The numerator is an exact integer, so the closed form loses no precision to cancellation
+        variance = max(n * total_squares - total * total, 0) / (n * (n - 1))
+        std = variance ** 0.5
+
+    return {
+        "mean": round(mean, 2),
+        "std": round(std, 2),
+        "n": n
+    }
+
+
 def calculate_detailed_statistics(frequency_dict: dict, value_mapping: dict) -> dict:
     """
     Calculates detailed statistics including mean, standard deviation, and count.
@@ -102,33 +77,61 @@ def calculate_detailed_statistics(frequency_dict: dict, value_mapping: dict) ->
     if not frequency_dict or not value_mapping:
         return {"mean": None, "std": None, "n": 0}
 
-    # Collect all individual data points
-    data_points = []
-    total_responses = 0
-
+    n = total = total_squares = 0
     for response_text, count in frequency_dict.items():
-        if response_text in value_mapping and count > 0:
-            value = value_mapping[response_text]
-            data_points.extend([value] * count)
-            total_responses += count
+        value = value_mapping.get(response_text)
+        if value is not None and count > 0:
+            n += count
+            total += count * value
+            total_squares += count * value * value
+    return moments_to_statistics(n, total, total_squares)
 
-    if total_responses == 0:
-        return {"mean": None, "std": None, "n": 0}
 
-    # Calculate mean
-    mean = sum(data_points) / total_responses
+def calculate_statistics_batch(groups: dict, stats_to_calculate: list) -> dict:
+    """
+    Calculates mean, std and n for every stat of every group in a single pass over the instances.
+    Responses are reduced to a count, sum and sum of squares per group and stat, so individual
+    responses are never materialized and large groups cost no more than their frequency dicts.
 
-    # Calculate standard deviation
-    if total_responses == 1:
-        std = 0.0
-    else:
-        variance = sum((x - mean) ** 2 for x in data_points) / (total_responses - 1)
-        std = variance ** 0.5
+    Args:
+        groups (dict): Maps group names to {instance_key: course data} dicts, as returned by separate_instances.
+        stats_to_calculate (list): Frequency keys to calculate; computed fields are skipped.
 
+    Returns:
+        dict: {group_name: {stat_key: {"mean": ..., "std": ..., "n": ...}}}
+    """
+    value_mappings = [(key, STAT_MAPPINGS[key][1]) for key in stats_to_calculate if STAT_MAPPINGS[key][1]]
+
+    results = {}
+    for group_name, instances in groups.items():
+        moments = {key: [0, 0, 0] for key, _ in value_mappings}
+        for instance in instances.values():
+            for key, value_mapping in value_mappings:
+                frequency_dict = instance.get(key)
+                if not frequency_dict:
+                    continue
+                stat_moments = moments[key]
+                for response_text, count in frequency_dict.items():
+                    value = value_mapping.get(response_text)
+                    if value is not None and count > 0:
+                        stat_moments[0] += count
+                        stat_moments[1] += count * value
+                        stat_moments[2] += count * value * value
+        results[group_name] = {key: moments_to_statistics(*stat_moments) for key, stat_moments in moments.items()}
+    return results
+
+
+def calculate_statistics_from_sums(sums_by_question: dict) -> dict:
+    """
+    Calculates mean, std and n per question from summed sufficient statistics, e.g. the sums of
+    instance_question_stats rows, without decoding any instance data.
+
+    Returns:
+        dict: {question: {"mean": ..., "std": ..., "n": ...}}
+    """
     return {
-        "mean": round(mean, 2),
-        "std": round(std, 2),
-        "n": total_responses
+        question: moments_to_statistics(n, total, total_squares)
+        for question, (n, total, total_squares) in sums_by_question.items()
     }
 
 
@@ -153,8 +156,7 @@ def extract_course_metadata(course_names: dict, course_code: str, metadata_from_
     if primary_course_code and not primary_course_has_no_data:
         # Only include instances matching the base code, e.g., "AS.050.375" from "AS.050.375.01.FA23"
         def matches_primary(instance_key):
-            match = re.match(r'([A-Z]+\.\d+\.\d+)', instance_key)
-            return match and match.group(1) == primary_course_code
+            return parse_instance_key(instance_key).course_code == primary_course_code
 
         filtered_course_names = {k: v for k, v in course_names.items() if matches_primary(k)}
 
@@ -209,33 +211,28 @@ def calculate_group_statistics(course_instances: list, stats_to_calculate: list,
             "details": {stat_key: {"n": count, "std": std_dev}}
         }
     """
-    # Aggregate frequencies from all instances in the group
-    aggregated_frequencies = {}
-    for key in stats_to_calculate:
-        aggregated_frequencies[key] = {}
+    group_statistics = calculate_statistics_batch({"group": dict(enumerate(course_instances))}, stats_to_calculate)["group"]
+    return format_group_statistics(group_statistics, stats_to_calculate, instance_keys)
 
-    for instance in course_instances:
-        for key in stats_to_calculate:
-            if key in instance:
-                for response_text, count in instance[key].items():
-                    agg_dict = aggregated_frequencies[key]
-                    agg_dict[response_text] = agg_dict.get(response_text, 0) + count
 
-    # Calculate the final statistics from the aggregated frequencies
+def format_group_statistics(group_statistics: dict, stats_to_calculate: list, instance_keys: list = None,
+                            periods: str = None) -> dict:
+    """
+    Shapes one group's output of calculate_statistics_batch into the values/details structure of
+    calculate_group_statistics, filling in the computed periods_course_has_been_run field from the
+    group's instance keys, or from periods when it is already known.
+    """
     results = {}
     details = {}
 
     for key in stats_to_calculate:
-        ui_name, value_mapping = STAT_MAPPINGS[key]
         if key == "periods_course_has_been_run":
             # Compute periods_course_has_been_run using actual instance keys from the filtered group
-            value = compute_periods_from_instance_keys(instance_keys)
-            results[key] = value
+            results[key] = periods if periods is not None else compute_periods_from_instance_keys(instance_keys)
             # No detailed stats for periods_course_has_been_run
             details[key] = {"n": None, "std": None}
         else:
-            # Calculate detailed statistics
-            detailed_stats = calculate_detailed_statistics(aggregated_frequencies[key], value_mapping)
+            detailed_stats = group_statistics[key]
             results[key] = detailed_stats["mean"] if detailed_stats["mean"] is not None else 0.0
             details[key] = {
                 "n": detailed_stats["n"],
@@ -251,17 +248,11 @@ def calculate_group_statistics(course_instances: list, stats_to_calculate: list,
 
 def get_instance_year(instance_key: str) -> int:
     """Extracts the four-digit year from a course instance key."""
-    match = re.search(r'\.(?:FA|SP|SU|IN)(\d{2})$', instance_key)
-    if match:
-        year_short = int(match.group(1))
-        return 2000 + year_short
-    return 0
+    return parse_instance_key(instance_key).year or 0
 
 def get_instance_season(instance_key: str) -> str:
     """Extracts the season (e.g., 'Fall') from a course instance key."""
-    match = re.search(r'\.((?:FA|SP|SU|IN))\d{2}$', instance_key)
-    seasons = {"FA": "Fall", "SP": "Spring", "SU": "Summer", "IN": "Intersession"}
-    return seasons.get(match.group(1)) if match else "Unknown"
+    return parse_instance_key(instance_key).season_name or "Unknown"
     
 def compute_periods_course_has_been_run(course_instances):
     """Compute Periods Course Has Been Run from actual course instances in the group."""
@@ -287,19 +278,17 @@ def compute_periods_from_instance_keys(instance_keys):
     if not instance_keys:
         return "N/A"
     
-    periods = set()
-    for key in instance_keys:
-        # Extract period from instance key (e.g., "AS.100.101.01.FA24" -> "FA24")
-        match = re.search(r'\.([A-Z]{2}\d{2})$', key)
-        if match:
-            periods.add(match.group(1))
-    
+    # Extract period from instance key (e.g., "AS.100.101.01.FA24" -> "FA24")
+    return format_periods(parse_instance_key(key).period for key in instance_keys)
+
+def format_periods(periods) -> str:
+    """Joins the distinct periods of a group into a sorted, comma-separated string."""
+    periods = {period for period in periods if period}
     if not periods:
         return "N/A"
-    
+
     # Sort periods chronologically
-    sorted_periods = sorted(periods)
-    return ', '.join(sorted_periods)
+    return ', '.join(sorted(periods))
 
 def filter_instances(all_instances: dict, filters: dict) -> dict:
     """Filters course instances based on a set of criteria."""
@@ -329,6 +318,17 @@ def filter_instances(all_instances: dict, filters: dict) -> dict:
         
     return filtered
 
+def normalize_separation_keys(separation_keys) -> list:
+    """Turns the separation key(s) of a request into a list; a single string is a one-key list."""
+    if not separation_keys:
+        return []
+    # Backward compatibility: single string handled as single-key list
+    if isinstance(separation_keys, str):
+        return [separation_keys]
+    if not isinstance(separation_keys, list):
+        return []
+    return separation_keys
+
 def separate_instances(instances: dict, separation_keys=None) -> dict:
     """
     Separates instances into groups based on one or more separation keys.
@@ -339,19 +339,12 @@ def separate_instances(instances: dict, separation_keys=None) -> dict:
             Can be a single key (str), multiple keys (list of str), or None.
 
     Returns:
-        dict: Groups of instances, keyed by composite group name.
+        dict: Groups keyed by composite group name. Each group maps its instance keys to their
+              instances, so callers never have to match instances back to their keys.
     """
+    separation_keys = normalize_separation_keys(separation_keys)
     if not separation_keys:
-        return {"All Data": list(instances.values())}
-
-    # Backward compatibility: single string handled as single-key list
-    if isinstance(separation_keys, str):
-        separation_keys = [separation_keys]
-    elif not isinstance(separation_keys, list):
-        separation_keys = []
-
-    if not separation_keys:
-        return {"All Data": list(instances.values())}
+        return {"All Data": dict(instances)}
 
     # If separating by instructor, create a map from simplified names to the most recent display name
     simplified_to_display_name = {}
@@ -367,11 +360,12 @@ def separate_instances(instances: dict, separation_keys=None) -> dict:
             if not simplified_name:
                 continue
 
-            period_tuple = parse_semester_year(key)
+            candidate = (parse_semester_year(key), instructor_name)
 
-            # If this instructor's name is new or from a more recent period, update the map
-            if simplified_name not in temp_map or period_tuple > temp_map[simplified_name][0]:
-                temp_map[simplified_name] = (period_tuple, instructor_name)
+            # If this instructor's name is new or from a more recent period, update the map.
+            # Variants from the same period are ordered by name, so row order never picks the winner.
+            if simplified_name not in temp_map or candidate > temp_map[simplified_name]:
+                temp_map[simplified_name] = candidate
         
         # Finalize the mapping from simplified name to the chosen display name
         for simplified_name, (_, display_name) in temp_map.items():
@@ -395,56 +389,34 @@ def separate_instances(instances: dict, separation_keys=None) -> dict:
                 value = instance.get("course_name", "Unknown")
             elif sep_key == "exact_period":
                 # Extract period from instance key (e.g., "AS.100.101.01.FA24" -> "FA24")
-                match = re.search(r'\.([A-Z]{2}\d{2})$', key)
-                value = match.group(1) if match else "Unknown"
+                value = parse_instance_key(key).period or "Unknown"
             elif sep_key == "course_code":
                 # Use the course_code field if available, otherwise extract from instance key
                 value = instance.get("course_code", "Unknown")
                 if value == "Unknown":
                     # Extract course code from instance key (e.g., "AS.100.101.01.FA24" -> "AS.100.101")
-                    match = re.match(r'([A-Z]+\.\d+\.\d+)', key)
-                    value = match.group(1) if match else "Unknown"
+                    value = parse_instance_key(key).course_code or "Unknown"
             else:
                 value = str(instance.get(sep_key, "Unknown"))
             group_parts.append(value)
         group_name = ", ".join(group_parts)
         if group_name not in groups:
-            groups[group_name] = []
-        groups[group_name].append(instance)
+            groups[group_name] = {}
+        groups[group_name][key] = instance
 
     return groups
 
-def process_analysis_request(
-    all_course_data: dict,
-    params: dict,
-    primary_course_code: str = None,
-    skip_grouping: bool = False
-) -> dict:
-    """
-    Main function to process an analysis request.
-
-    Args:
-        all_course_data (dict): The complete, raw data for a course from data.json.
-        params (dict): A dictionary of analysis parameters from the API request.
-                       - 'filters': {'min_year', 'max_year', 'seasons', 'instructors'}
-                       - 'separation_keys': list of keys, e.g. ['instructor', 'year']
-                         (backward compatible with 'separation_key': str)
-                       - 'stats_to_calculate': list of frequency keys
-        primary_course_code (str, optional): The base code for grouping analysis.
-        skip_grouping (bool): Whether to skip course grouping logic.
-
-    Returns:
-        A dictionary with three keys:
-            - "data": renderable statistical data by group
-            - "metadata": course metadata (names, grouping info, etc.)
-            - "statistics_metadata": detailed stats info (n, std) by group and stat
-    """
-    filters = params.get('filters', {})
+def get_separation_keys(params: dict) -> list:
+    """Reads the separation keys of an analysis request as a list."""
     separation_keys = params.get('separation_keys')
     # Backward compatibility: accept 'separation_key' as string
     if separation_keys is None:
         separation_keys = params.get('separation_key')
-    
+    return normalize_separation_keys(separation_keys)
+
+
+def get_stats_to_calculate(params: dict) -> list:
+    """Reads the frontend stat keys of an analysis request, in either the old or the new format."""
     # Handle both old format (stats_to_calculate) and new format (stats object)
     stats_to_calculate = params.get('stats_to_calculate')
     if stats_to_calculate is None:
@@ -471,6 +443,92 @@ def process_analysis_request(
                 'workload', 'feedback_frequency', 'ta_frequency',
                 'periods_course_has_been_run'
             ]
+    return stats_to_calculate
+
+
+def get_backend_stat_keys(stats_to_calculate: list) -> tuple:
+    """
+    Maps frontend stat keys to the data keys they are calculated from. Most stats read
+    "<key>_frequency"; feedback_frequency, ta_frequency and computed fields use their key as is.
+
+    Returns:
+        tuple: (backend_keys, {backend_key: frontend_key})
+    """
+    backend_keys = []
+    statkey_reverse_map = {}
+    for frontend_key in stats_to_calculate:
+        if frontend_key in ["feedback_frequency", "ta_frequency", "periods_course_has_been_run"]:
+            backend_key = frontend_key
+        elif frontend_key.endswith("_frequency"):
+            backend_key = frontend_key
+        else:
+            backend_key = frontend_key + "_frequency"
+        backend_keys.append(backend_key)
+        statkey_reverse_map[backend_key] = frontend_key
+    return backend_keys, statkey_reverse_map
+
+
+def shape_analysis_results(statistics_by_group: dict, periods_by_group: dict,
+                           backend_keys: list, statkey_reverse_map: dict) -> tuple:
+    """
+    Shapes the per-group output of calculate_statistics_batch into the "data" and
+    "statistics_metadata" parts of an analysis response, keyed by frontend stat keys.
+
+    Args:
+        periods_by_group (dict): Each group's periods_course_has_been_run string (see format_periods).
+
+    Returns:
+        tuple: (analysis_results, statistics_metadata)
+    """
+    analysis_results = {}
+    statistics_metadata = {}
+    for group_name, group_statistics in statistics_by_group.items():
+        backend_result = format_group_statistics(
+            group_statistics, backend_keys, periods=periods_by_group[group_name]
+        )
+
+        # Convert backend keys back to frontend keys for both values and details
+        analysis_results[group_name] = {
+            statkey_reverse_map[k]: v
+            for k, v in backend_result["values"].items()
+            if k in statkey_reverse_map
+        }
+        statistics_metadata[group_name] = {
+            statkey_reverse_map[k]: v
+            for k, v in backend_result["details"].items()
+            if k in statkey_reverse_map
+        }
+    return analysis_results, statistics_metadata
+
+
+def process_analysis_request(
+    all_course_data: dict,
+    params: dict,
+    primary_course_code: str = None,
+    skip_grouping: bool = False
+) -> dict:
+    """
+    Main function to process an analysis request.
+
+    Args:
+        all_course_data (dict): The complete, raw data for a course from data.json.
+        params (dict): A dictionary of analysis parameters from the API request.
+                       - 'filters': {'min_year', 'max_year', 'seasons', 'instructors'}
+                       - 'separation_keys': list of keys, e.g. ['instructor', 'year']
+                         (backward compatible with 'separation_key': str)
+                       - 'stats_to_calculate': list of frequency keys
+        primary_course_code (str, optional): The base code for grouping analysis.
+        skip_grouping (bool): Whether to skip course grouping logic.
+
+    Returns:
+        A dictionary with three keys:
+            - "data": renderable statistical data by group
+            - "metadata": course metadata (names, grouping info, etc.)
+            - "statistics_metadata": detailed stats info (n, std) by group and stat
+    """
+    filters = params.get('filters', {})
+    separation_keys = get_separation_keys(params)
+    stats_to_calculate = get_stats_to_calculate(params)
 
     # 1. Get course metadata and grouping info
     metadata_from_file = {}
@@ -488,7 +546,7 @@ def process_analysis_request(
     }
     
     if primary_course_code:
-        group_info = grouping_service.get_group_info(primary_course_code)
+        group_info = get_grouping_service().get_group_info(primary_course_code)
         if group_info:
             grouping_metadata = {
                 "grouped_courses": group_info.get("courses", []),
@@ -503,20 +561,25 @@ def process_analysis_request(
     
     # Add grouped course data to the main dataset if grouping is enabled
     if not skip_grouping and grouping_metadata["is_grouped"] and grouping_metadata["grouped_courses"]:
-        for course_code in grouping_metadata["grouped_courses"]:
-            if course_code != primary_course_code:  # Don't duplicate primary course
-                try:
-                    grouped_data = get_course_data_and_update_cache(course_code)
-                    if grouped_data and isinstance(grouped_data, dict):
-                        # Add course code prefix to instance keys to avoid conflicts
-                        for instance_key, instance_data in grouped_data.items():
-                            if isinstance(instance_data, dict):
-                                # Add course_code field to each instance for separation
-                                instance_data_with_code = instance_data.copy()
-                                instance_data_with_code['course_code'] = course_code
-                                all_instances[f"{course_code}_{instance_key}"] = instance_data_with_code
-                except Exception as e:
-                    print(f"Warning: Could not load grouped course {course_code}: {e}")
+        # Load every other grouped course in one batch
+        other_courses = [code for code in grouping_metadata["grouped_courses"] if code != primary_course_code]
+        try:
+            # Loaded unfiltered: course names and the no-data check need every instance, and the
+            # combined dataset is filtered below
+            grouped_data_by_code = get_courses_data_batch(other_courses)
+        except Exception as e:
+            print(f"Warning: Could not load grouped courses {', '.join(other_courses)}: {e}")
+            grouped_data_by_code = {}
+        for course_code in other_courses:
+            grouped_data = grouped_data_by_code.get(course_code)
+            if grouped_data and isinstance(grouped_data, dict):
+                # Add course code prefix to instance keys to avoid conflicts
+                for instance_key, instance_data in grouped_data.items():
+                    if isinstance(instance_data, dict):
+                        # Add course_code field to each instance for separation
+                        instance_data_with_code = instance_data.copy()
+                        instance_data_with_code['course_code'] = course_code
+                        all_instances[f"{course_code}_{instance_key}"] = instance_data_with_code
 
     # If after all checks, there are no instances, return None to indicate no data
     if not all_instances:
@@ -533,9 +596,7 @@ def process_analysis_request(
             course_names[instance_key] = instance_data['course_name']
         # Extract course code from the first instance key
         if course_code is None:
-            match = re.match(r'([A-Z]+\.\d+\.\d+)', instance_key)
-            if match:
-                course_code = match.group(1)
+            course_code = parse_instance_key(instance_key).course_code
 
     # Find the most recent course name and collect former names, merging with metadata from file
     course_metadata = extract_course_metadata(
@@ -545,64 +606,18 @@ def process_analysis_request(
     # 5. Separate the filtered data into groups
     separated_groups = separate_instances(filtered_data, separation_keys)
 
-    # 4. Calculate statistics for each group
-    # Map stats_to_calculate to data keys (statKey → statKey + "_frequency", except special keys)
-    stats_backend_keys = []
-    statkey_reverse_map = {}  # For mapping backend key to frontend/UI key
-    for s in stats_to_calculate:
-        if s == "periods_course_has_been_run":
-            stats_backend_keys.append(s)
-            statkey_reverse_map[s] = s
-        else:
-            backend_key = s + "_frequency"
-            stats_backend_keys.append(backend_key)
-            statkey_reverse_map[backend_key] = s
-
-    # 4. Calculate statistics for each group
-    analysis_results = {}
-    statistics_metadata = {}
-
-    for group_name, instances in separated_groups.items():
-        # Patch: Special stats (feedback_frequency, ta_frequency) use the raw key from the UI/config, not "_frequency"
-        backend_keys_fixed = []
-        statkey_reverse_map_fixed = {}
-        for frontend_key in stats_to_calculate:
-            if frontend_key in ["feedback_frequency", "ta_frequency", "periods_course_has_been_run"]:
-                backend_key = frontend_key
-            elif frontend_key.endswith("_frequency"):
-                backend_key = frontend_key
-            else:
-                backend_key = frontend_key + "_frequency"
-            backend_keys_fixed.append(backend_key)
-            statkey_reverse_map_fixed[backend_key] = frontend_key
-
-        # Extract instance keys from the filtered data for this group
-        group_instance_keys = []
-        for instance_key, instance_data in filtered_data.items():
-            if instance_data in instances:
-                group_instance_keys.append(instance_key)
-
-        # Calculate statistics with detailed info
-        backend_result = calculate_group_statistics(
-            instances, backend_keys_fixed, course_metadata, group_instance_keys
-        )
+    # 4. Calculate every stat of every group in one pass
+    backend_keys, statkey_reverse_map = get_backend_stat_keys(stats_to_calculate)
+    statistics_by_group = calculate_statistics_batch(separated_groups, backend_keys)
 
-        # Separate values and details
-        values_data = backend_result["values"]
-        details_data = backend_result["details"]
-
-        # Convert backend keys back to frontend keys for both values and details
-        analysis_results[group_name] = {
-            statkey_reverse_map_fixed[k]: v
-            for k, v in values_data.items()
-            if k in statkey_reverse_map_fixed
-        }
-
-        statistics_metadata[group_name] = {
-            statkey_reverse_map_fixed[k]: v
-            for k, v in details_data.items()
-            if k in statkey_reverse_map_fixed
-        }
+    # Groups carry their instance keys, so their periods come straight from the keys
+    periods_by_group = {
+        group_name: compute_periods_from_instance_keys(list(instances))
+        for group_name, instances in separated_groups.items()
+    }
+    analysis_results, statistics_metadata = shape_analysis_results(
+        statistics_by_group, periods_by_group, backend_keys, statkey_reverse_map
+    )
 
     # Return clean separated data structure
     return {
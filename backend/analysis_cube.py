@@ -0,0 +1,237 @@
+from .analysis import (
+    STAT_MAPPINGS, _simplify_name, compute_sufficient_statistics, format_periods, get_backend_stat_keys,
+    get_separation_keys, get_stats_to_calculate, moments_to_statistics, shape_analysis_results
+)
+from .instance_keys import parse_instance_key, parse_period
+
+# Separation keys a roll-up can answer; any other key reads arbitrary instance fields and needs
+# the raw instances
+CUBE_SEPARATION_KEYS = {"instructor", "year", "season", "course_name", "exact_period", "course_code"}
+
+
+def build_cube_cells(instances: dict, course_code: str = None) -> list:
+    """
+    Aggregates instances into analysis cube cells, one per (course code, period, instructor name,
+    course name). Each cell holds its instance count and the per-option response counts of every
+    question, summed over its instances (see compute_sufficient_statistics).
+
+    Instructor names are stored as scraped; the canonical display name depends on the whole course
+    group, so it is chosen when cells are rolled up.
+
+    Args:
+        instances (dict): Instance key -> instance data.
+        course_code (str, optional): The course every instance belongs to. Defaults to the instance's
+            course_code field, then to the code in its key, like the course_code separation.
+
+    Returns:
+        list: Cell dicts with course_code, period, instructor_name, course_name, instance_count and
+              option_counts ({question: [count per option, ordered by value]}).
+    """
+    cells = {}
+    for instance_key, instance in instances.items():
+        if not isinstance(instance, dict):
+            continue
+        parsed_key = parse_instance_key(instance_key)
+        cell_key = (
+            course_code or instance.get("course_code") or parsed_key.course_code,
+            parsed_key.period,
+            instance.get("instructor_name"),
+            instance.get("course_name"),
+        )
+        cell = cells.get(cell_key)
+        if cell is None:
+            cell = cells[cell_key] = {
+                "course_code": cell_key[0],
+                "period": cell_key[1],
+                "instructor_name": cell_key[2],
+                "course_name": cell_key[3],
+                "instance_count": 0,
+                "option_counts": {},
+            }
+        cell["instance_count"] += 1
+        add_option_counts(cell["option_counts"], {
+            question: option_counts
+            for question, (_, _, _, option_counts) in compute_sufficient_statistics(instance).items()
+        })
+    return list(cells.values())
+
+
+def can_rollup(params: dict) -> bool:
+    """Whether an analysis request only separates by keys the cube has dimensions for."""
+    return set(get_separation_keys(params)) <= CUBE_SEPARATION_KEYS
+
+
+def cell_matches_filters(cell: dict, filters: dict) -> bool:
+    """Applies the analysis filters of filter_instances to a cube cell."""
+    min_year = int(filters['min_year']) if filters.get('min_year') else None
+    max_year = int(filters['max_year']) if filters.get('max_year') else None
+    seasons = filters.get('seasons')
+    instructors = filters.get('instructors')
+
+    period = parse_period(cell["period"])
+    year = period.year or 0
+    if min_year and year < min_year:
+        return False
+    if max_year and year > max_year:
+        return False
+    if seasons and (period.season_name or "Unknown") not in seasons:
+        return False
+    if instructors and cell["instructor_name"] not in instructors:
+        return False
+    return True
+
+
+def get_canonical_instructor_names(cells: list) -> dict:
+    """
+    Maps simplified instructor names to the variant used in the most recent period, breaking ties by
+    name, exactly like separate_instances does for raw instances.
+    """
+    latest = {}
+    for cell in cells:
+        instructor_name = cell["instructor_name"]
+        if not instructor_name:
+            continue
+        simplified_name = _simplify_name(instructor_name)
+        if not simplified_name:
+            continue
+        candidate = (parse_period(cell["period"]).sort_key, instructor_name)
+        if simplified_name not in latest or candidate > latest[simplified_name]:
+            latest[simplified_name] = candidate
+    return {simplified_name: display_name for simplified_name, (_, display_name) in latest.items()}
+
+
+def get_cell_group_parts(cell: dict, separation_keys: list, canonical_names: dict) -> tuple:
+    """The values separate_instances would use to name the group a cube cell falls into."""
+    period = parse_period(cell["period"])
+    group_parts = []
+    for sep_key in separation_keys:
+        if sep_key == "instructor":
+            instructor_name = cell["instructor_name"]
+            if instructor_name is None:
+                instructor_name = "Unknown"
+            value = canonical_names.get(_simplify_name(instructor_name), instructor_name)
+        elif sep_key == "year":
+            value = str(period.year or 0)
+        elif sep_key == "season":
+            value = period.season_name or "Unknown"
+        elif sep_key == "course_name":
+            value = cell["course_name"] if cell["course_name"] is not None else "Unknown"
+        elif sep_key == "exact_period":
+            value = cell["period"] or "Unknown"
+        else:
+            value = cell["course_code"] or "Unknown"
+        group_parts.append(value)
+    return tuple(group_parts)
+
+
+def add_option_counts(summed_counts: dict, option_counts: dict):
+    """Adds per-question option counts into a running total, in place."""
+    for question, counts in option_counts.items():
+        summed = summed_counts.get(question)
+        if summed is None:
+            summed_counts[question] = list(counts)
+        else:
+            for index, count in enumerate(counts):
+                summed[index] += count
+
+
+def group_cube_cells(cells: list, filters: dict, separation_keys: list) -> dict:
+    """
+    Filters cube cells and rolls them up by separation keys.
+
+    Returns:
+        dict: {group_parts: {"option_counts": {question: [...]}, "periods": set}}, keyed by the tuple
+              of the group's separation values (empty without separation keys).
+    """
+    filtered_cells = [cell for cell in cells if cell_matches_filters(cell, filters)]
+    canonical_names = get_canonical_instructor_names(filtered_cells) if "instructor" in separation_keys else {}
+
+    groups = {}
+    for cell in filtered_cells:
+        group_parts = get_cell_group_parts(cell, separation_keys, canonical_names)
+        group = groups.get(group_parts)
+        if group is None:
+            group = groups[group_parts] = {"option_counts": {}, "periods": set()}
+        group["periods"].add(cell["period"])
+        add_option_counts(group["option_counts"], cell["option_counts"])
+    return groups
+
+
+def merge_cube_groups(groups: dict, kept_positions: list) -> dict:
+    """
+    Derives a coarser grouping from the output of group_cube_cells by keeping only the separation
+    values at kept_positions and merging the groups that then coincide. Filters are unchanged, so
+    instructor canonical names are the same as for the finer grouping and the result is exact.
+    """
+    merged = {}
+    for group_parts, group in groups.items():
+        merged_parts = tuple(group_parts[position] for position in kept_positions)
+        merged_group = merged.get(merged_parts)
+        if merged_group is None:
+            merged_group = merged[merged_parts] = {"option_counts": {}, "periods": set()}
+        merged_group["periods"] |= group["periods"]
+        add_option_counts(merged_group["option_counts"], group["option_counts"])
+    return merged
+
+
+def summarize_cube_groups(groups: dict, params: dict) -> dict:
+    """
+    Turns rolled-up cube groups into the "data" and "statistics_metadata" of process_analysis_request.
+    Groups are named like separate_instances names them, so differently separated values that join
+    to the same name share a group there and here.
+    """
+    separation_keys = get_separation_keys(params)
+    backend_keys, statkey_reverse_map = get_backend_stat_keys(get_stats_to_calculate(params))
+    value_mappings = [(key, STAT_MAPPINGS[key][1]) for key in backend_keys if STAT_MAPPINGS[key][1]]
+
+    # Without separation everything is one group, even if no cell passed the filters
+    named_groups = {"All Data": {"option_counts": {}, "periods": set()}} if not separation_keys else {}
+    for group_parts, group in groups.items():
+        group_name = ", ".join(group_parts) if separation_keys else "All Data"
+        named_group = named_groups.get(group_name)
+        if named_group is None:
+            named_group = named_groups[group_name] = {"option_counts": {}, "periods": set()}
+        named_group["periods"] |= group["periods"]
+        add_option_counts(named_group["option_counts"], group["option_counts"])
+
+    statistics_by_group = {}
+    for group_name, group in named_groups.items():
+        group_statistics = {}
+        for key, value_mapping in value_mappings:
+            n = total = total_squares = 0
+            # option_counts[i] holds the responses worth i + 1
+            for value, count in enumerate(group["option_counts"].get(key, ()), start=1):
+                n += count
+                total += count * value
+                total_squares += count * value * value
+            group_statistics[key] = moments_to_statistics(n, total, total_squares)
+        statistics_by_group[group_name] = group_statistics
+
+    analysis_results, statistics_metadata = shape_analysis_results(
+        statistics_by_group,
+        {group_name: format_periods(group["periods"]) for group_name, group in named_groups.items()},
+        backend_keys,
+        statkey_reverse_map
+    )
+    return {"data": analysis_results, "statistics_metadata": statistics_metadata}
+
+
+def rollup_cube(cells: list, params: dict):
+    """
+    Answers an analysis request from cube cells instead of raw instances: cells are filtered, grouped
+    by the requested separation keys and their option counts summed, so the cost depends on the
+    number of cells rather than on the number of instances.
+
+    Args:
+        cells (list): The cube cells of every course in the group (see build_cube_cells).
+        params (dict): Analysis parameters, as for process_analysis_request. Only separation keys in
+            CUBE_SEPARATION_KEYS are supported; check can_rollup first.
+
+    Returns:
+        dict: The "data" and "statistics_metadata" of process_analysis_request for the same
+              instances, or None if there are no cells.
+    """
+    if not cells:
+        return None
+    groups = group_cube_cells(cells, params.get('filters', {}), get_separation_keys(params))
+    return summarize_cube_groups(groups, params)
@@ -0,0 +1,154 @@
+import json
+import time
+import threading
+from collections import OrderedDict
+from .analysis_cube import group_cube_cells, merge_cube_groups, summarize_cube_groups
+from .analysis import get_separation_keys
+from .config import ANALYSIS_RESULT_CACHE_MAX_ENTRIES
+
+
+def normalize_filters(filters: dict) -> str:
+    """
+    Canonical form of analysis filters for cache keys: empty filters are dropped, years become
+    integers and season and instructor lists become sorted sets, so equivalent requests share a key.
+    """
+    filters = filters or {}
+    normalized = {}
+    for year_key in ('min_year', 'max_year'):
+        if filters.get(year_key):
+            normalized[year_key] = int(filters[year_key])
+    for list_key in ('seasons', 'instructors'):
+        if filters.get(list_key):
+            normalized[list_key] = sorted(set(filters[list_key]), key=str)
+    return json.dumps(normalized, sort_keys=True)
+
+
+class AnalysisResultCache:
+    """
+    A thread-safe LRU cache of rolled-up analysis groupings (see analysis_cube.group_cube_cells).
+
+    Entries are keyed by course group, data version, normalized filters and separation keys. The
+    data version changes whenever a member course is scraped, so outdated groupings are never read
+    and just age out. Statistics are summarized from the cached groupings on every request, which is
+    cheap, so requests that only differ in their stats share an entry. A request whose separation
+    keys are a subset of a cached entry's, with the same filters, is derived by merging that entry's
+    groups instead of reading the cube again.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # (scope, separation_keys) -> (groups, compute_seconds)
+        self._separations_by_scope = {}  # scope -> set of cached separation key tuples
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.derived_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.seconds_saved = 0.0
+
+    def rollup(self, course_codes: list, data_version: str, params: dict, load_cells):
+        """
+        Answers an analysis request like analysis_cube.rollup_cube, from cache when possible.
+
+        Args:
+            course_codes (list): The course group's member codes.
+            data_version (str): A stamp of the group's data, e.g. an ETag of its course versions.
+                None bypasses the cache.
+            params (dict): Analysis parameters, as for process_analysis_request.
+            load_cells (callable): Returns the group's cube cells on a miss.
+
+        Returns:
+            dict: The "data" and "statistics_metadata" of the analysis, or None if there are no cells.
+        """
+        separation_keys = tuple(get_separation_keys(params))
+        scope = (tuple(sorted(set(course_codes))), data_version, normalize_filters(params.get('filters')))
+        started = time.perf_counter()
+
+        groups = None
+        if data_version is not None:
+            groups = self._lookup(scope, separation_keys, started)
+        if groups is None:
+            cells = load_cells()
+            if not cells:
+                return None
+            groups = group_cube_cells(cells, params.get('filters', {}), list(separation_keys))
+            if data_version is not None:
+                self._store(scope, separation_keys, groups, time.perf_counter() - started)
+        return summarize_cube_groups(groups, params)
+
+    def _lookup(self, scope: tuple, separation_keys: tuple, started: float):
+        """Returns cached or derived groups, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get((scope, separation_keys))
+            if entry is not None:
+                self._entries.move_to_end((scope, separation_keys))
+                self.hits += 1
+                self.seconds_saved += entry[1]
+                self._log("hit", scope)
+                return entry[0]
+
+            # Derive from the finest cached grouping that separates by at least these keys
+            candidates = [
+                (len(self._entries[(scope, cached_keys)][0]), cached_keys)
+                for cached_keys in self._separations_by_scope.get(scope, ())
+                if set(separation_keys) <= set(cached_keys)
+            ]
+            if not candidates:
+                self.misses += 1
+                self._log("miss", scope)
+                return None
+            _, source_keys = min(candidates)
+            source_groups, source_seconds = self._entries[(scope, source_keys)]
+            self._entries.move_to_end((scope, source_keys))
+
+        groups = merge_cube_groups(source_groups, [source_keys.index(key) for key in separation_keys])
+        derive_seconds = time.perf_counter() - started
+        with self._lock:
+            self.derived_hits += 1
+            self.seconds_saved += max(source_seconds - derive_seconds, 0.0)
+            self._log(f"derived from [{', '.join(source_keys)}]", scope)
+        self._store(scope, separation_keys, groups, source_seconds)
+        return groups
+
+    def _store(self, scope: tuple, separation_keys: tuple, groups: dict, compute_seconds: float):
+        with self._lock:
+            self._entries[(scope, separation_keys)] = (groups, compute_seconds)
+            self._entries.move_to_end((scope, separation_keys))
+            self._separations_by_scope.setdefault(scope, set()).add(separation_keys)
+            while len(self._entries) > self.max_entries:
+                oldest_scope, oldest_keys = next(iter(self._entries))
+                self._remove(oldest_scope, oldest_keys)
+                self.evictions += 1
+
+    def _remove(self, scope: tuple, separation_keys: tuple):
+        del self._entries[(scope, separation_keys)]
+        separations = self._separations_by_scope.get(scope)
+        if separations is not None:
+            separations.discard(separation_keys)
+            if not separations:
+                del self._separations_by_scope[scope]
+
+    def _log(self, outcome: str, scope: tuple):
+        # Called with the lock held
+        lookups = self.hits + self.derived_hits + self.misses
+        hit_rate = (self.hits + self.derived_hits) / lookups if lookups else 0.0
+        print(f"Analysis result cache {outcome} for {', '.join(scope[0])} "
+              f"(hit rate {hit_rate:.0%}, {self.seconds_saved * 1000:.0f} ms saved)")
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.derived_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "derived_hits": self.derived_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.derived_hits) / lookups, 3) if lookups else None,
+                "evictions": self.evictions,
+                "ms_saved": round(self.seconds_saved * 1000),
+            }
+
+
+# Rolled-up analysis groupings, shared by all requests in this process
+analysis_result_cache = AnalysisResultCache(ANALYSIS_RESULT_CACHE_MAX_ENTRIES)
@@ -1,12 +1,19 @@
-from flask import Flask, jsonify, request
+import time
+_import_started = time.perf_counter()
+
+from flask import Flask, Response, request
 from flask_cors import CORS
 import re
 import json
 from urllib.parse import unquote
-from .scraper_service import get_course_data_and_update_cache, find_courses_by_name, find_courses_by_name_with_details, force_recheck_course, get_course_grace_status
-from .db_utils import find_instructor_variants_db
-from .analysis import process_analysis_request, extract_course_metadata
-from .course_grouping_service import CourseGroupingService
+from .scraper_service import get_course_data_and_update_cache, get_courses_data_batch, get_course_versions, find_courses_by_name, find_courses_by_name_with_details, force_recheck_course, get_course_grace_status, find_instructor_variants, get_catalog_version_cached, get_course_rankings, find_instructors, get_instructor_profile, get_course_trend
+from .course_grouping_service import get_grouping_service
+from .config import BATCH_MAX_COURSES, COURSE_CACHE_CONTROL, SEARCH_CACHE_CONTROL, ANALYZE_CACHE_CONTROL, RANKINGS_DEFAULT_LIMIT, RANKINGS_MAX_LIMIT, RANKINGS_DEFAULT_MIN_N, TREND_DEFAULT_WINDOW, TREND_MAX_WINDOW
+from .payload_encoding import encode_instances_columnar
+from .instance_keys import parse_instance_key
+from .response_utils import json_response, compress_response
+from .response_cache import analyze_response_cache
+from .http_caching import make_etag, is_not_modified, not_modified_response, with_cache_headers
 
 app = Flask(__name__, static_folder='../static', static_url_path='/')
 
@@ -31,7 +38,26 @@ allowed_origins = [
 ]
 CORS(app, origins=allowed_origins)  # Enable Cross-Origin Resource Sharing
 
-grouping_service = CourseGroupingService()
+# Time spent importing the API, reported once per cold start
+IMPORT_SECONDS = time.perf_counter() - _import_started
+print(f"API imported in {IMPORT_SECONDS * 1000:.0f} ms")
+
+@app.after_request
+def compress_api_response(response):
+    """Compresses large responses with brotli or gzip when the client accepts it."""
+    return compress_response(response, request.headers.get('Accept-Encoding', ''))
+
+def get_course_etag(course_codes, *request_parts):
+    """
+    Builds an ETag for a response derived from these courses' data, using only their metadata.
+    Returns None if any course would be refreshed, since the response can't be validated yet.
+    """
+    all_fresh, versions = get_course_versions(course_codes)
+    return make_etag(*request_parts, versions) if all_fresh else None
+
+def get_search_etag(*request_parts):
+    """Builds an ETag for a search response from the dataset version stamp."""
+    return make_etag(*request_parts, get_catalog_version_cached())
 
 @app.route('/')
 def home():
@@ -45,25 +71,59 @@ def get_course_data(course_code):
     """
     # Validate course code format
     if not validate_course_code(course_code):
-        return jsonify({"error": "Invalid course code format. Expected format: XX.###.###"}), 400
+        return json_response({"error": "Invalid course code format. Expected format: XX.###.###"}), 400
 
     # Normalize course code to uppercase to match stored format
     course_code = course_code.upper()
     print(f"Received request for course code: {course_code}")
     try:
+        # Answer revalidations of up-to-date courses without loading their data
+        etag = get_course_etag([course_code], 'course')
+        if etag and is_not_modified(etag):
+            return not_modified_response(etag, COURSE_CACHE_CONTROL)
+
         # Call the centralized scraping and caching logic
         data = get_course_data_and_update_cache(course_code)
         if not data:
-            return jsonify({"error": "No data found for this course."}), 404
+            return json_response({"error": "No data found for this course."}), 404
         # Check if the response contains an error
         if isinstance(data, dict) and "error" in data:
-            return jsonify(data), 500
-        return jsonify(data)
+            return json_response(data), 500
+
+        # A scrape may have just updated the course, so its validator is built afterwards
+        etag = etag or get_course_etag([course_code], 'course')
+        response = json_response(data)
+        return with_cache_headers(response, etag, COURSE_CACHE_CONTROL) if etag else response
     except Exception as e:
         # Log the exception for debugging
         print(f"An error occurred: {e}")
         # Return a generic error message to the client
-        return jsonify({"error": "An internal server error occurred."}), 500
+        return json_response({"error": "An internal server error occurred."}), 500
+
+@app.route('/api/courses')
+def get_courses_data():
+    """
+    API endpoint to get evaluation data for several courses at once, e.g. /api/courses?codes=EN.601.415,EN.601.615
+    Up-to-date courses are loaded in a couple of queries; only stale courses trigger a scrape.
+    """
+    codes_param = request.args.get('codes', '')
+    course_codes = [code.strip() for code in codes_param.split(',') if code.strip()]
+    if not course_codes:
+        return json_response({"error": "Missing course codes. Expected ?codes=XX.###.###,XX.###.###"}), 400
+    if len(course_codes) > BATCH_MAX_COURSES:
+        return json_response({"error": f"Too many course codes. Maximum {BATCH_MAX_COURSES} allowed."}), 400
+    invalid_codes = [code for code in course_codes if not validate_course_code(code)]
+    if invalid_codes:
+        return json_response({"error": f"Invalid course code format: {', '.join(invalid_codes)}. Expected format: XX.###.###"}), 400
+
+    # Normalize course codes to uppercase to match stored format
+    course_codes = [code.upper() for code in course_codes]
+    print(f"Received batch request for course codes: {', '.join(course_codes)}")
+    try:
+        return json_response(get_courses_data_batch(course_codes))
+    except Exception as e:
+        print(f"An error occurred during batch lookup: {e}")
+        return json_response({"error": "An internal server error occurred."}), 500
 
 @app.route('/api/search/course_name/<string:search_query>')
 def search_by_course_name(search_query):
@@ -75,15 +135,18 @@ def search_by_course_name(search_query):
 
     # Prevent extremely long search queries that could cause performance issues
     if len(search_query) > 1000:
-        return jsonify({"error": "Search query too long. Maximum 1000 characters allowed."}), 400
+        return json_response({"error": "Search query too long. Maximum 1000 characters allowed."}), 400
 
     print(f"Received search request for: {search_query}")
     try:
+        etag = get_search_etag('course_name', search_query)
+        if is_not_modified(etag):
+            return not_modified_response(etag, SEARCH_CACHE_CONTROL)
         course_codes = find_courses_by_name(search_query)
-        return jsonify(course_codes)
+        return with_cache_headers(json_response(course_codes), etag, SEARCH_CACHE_CONTROL)
     except Exception as e:
         print(f"An error occurred during search: {e}")
-        return jsonify({"error": "An internal server error occurred during search."}), 500
+        return json_response({"error": "An internal server error occurred during search."}), 500
 
 @app.route('/api/search/course_name_detailed/<string:search_query>')
 def search_by_course_name_detailed(search_query):
@@ -96,7 +159,7 @@ def search_by_course_name_detailed(search_query):
 
     # Prevent extremely long search queries that could cause performance issues
     if len(search_query) > 1000:
-        return jsonify({"error": "Search query too long. Maximum 1000 characters allowed."}), 400
+        return json_response({"error": "Search query too long. Maximum 1000 characters allowed."}), 400
 
     # Get pagination parameters
     limit = request.args.get('limit', type=int)
@@ -104,17 +167,20 @@ def search_by_course_name_detailed(search_query):
 
     # Validate pagination parameters
     if limit is not None and (limit <= 0 or limit > 100):
-        return jsonify({"error": "Limit must be between 1 and 100."}), 400
+        return json_response({"error": "Limit must be between 1 and 100."}), 400
     if offset < 0:
-        return jsonify({"error": "Offset must be non-negative."}), 400
+        return json_response({"error": "Offset must be non-negative."}), 400
 
     print(f"Received detailed search request for: {search_query} (limit={limit}, offset={offset})")
     try:
+        etag = get_search_etag('course_name_detailed', search_query, limit, offset)
+        if is_not_modified(etag):
+            return not_modified_response(etag, SEARCH_CACHE_CONTROL)
         results = find_courses_by_name_with_details(search_query, limit, offset)
-        return jsonify(results)
+        return with_cache_headers(json_response(results), etag, SEARCH_CACHE_CONTROL)
     except Exception as e:
         print(f"An error occurred during detailed search: {e}")
-        return jsonify({"error": "An internal server error occurred during search."}), 500
+        return json_response({"error": "An internal server error occurred during search."}), 500
 
 @app.route('/api/search/instructor/<string:instructor_name>')
 def search_by_instructor_name(instructor_name):
@@ -126,15 +192,166 @@ def search_by_instructor_name(instructor_name):
 
     # Prevent extremely long instructor names that could cause performance issues
     if len(instructor_name) > 1000:
-        return jsonify({"error": "Instructor name too long. Maximum 1000 characters allowed."}), 400
+        return json_response({"error": "Instructor name too long. Maximum 1000 characters allowed."}), 400
 
     print(f"Received instructor search for: {instructor_name}")
     try:
-        variants = find_instructor_variants_db(instructor_name)
-        return jsonify(variants)
+        etag = get_search_etag('instructor', instructor_name)
+        if is_not_modified(etag):
+            return not_modified_response(etag, SEARCH_CACHE_CONTROL)
+        variants = find_instructor_variants(instructor_name)
+        return with_cache_headers(json_response(variants), etag, SEARCH_CACHE_CONTROL)
     except Exception as e:
         print(f"An error occurred during instructor search: {e}")
-        return jsonify({"error": "An internal server error occurred during instructor search."}), 500
+        return json_response({"error": "An internal server error occurred during instructor search."}), 500
+
+@app.route('/api/rankings')
+def get_rankings():
+    """
+    API endpoint to rank course groups across the catalog, e.g.
+    /api/rankings?by=mean&stat=overall_quality&department=EN.601,EN.553&from=FA17&to=SP24&limit=10
+    'by' is 'mean' or 'n' (the default). Rankings by mean skip groups with fewer than min_n responses.
+    """
+    # The ranking helpers are only needed when rankings are asked for
+    from .rankings import RANKING_SORT_KEYS, get_period_order, get_question_key
+
+    sort_by = request.args.get('by', 'n')
+    if sort_by not in RANKING_SORT_KEYS:
+        return json_response({"error": f"Invalid ranking order. Expected one of: {', '.join(RANKING_SORT_KEYS)}"}), 400
+    stat = request.args.get('stat', 'overall_quality')
+    question = get_question_key(stat)
+    if not question:
+        return json_response({"error": f"Invalid stat: {stat}"}), 400
+
+    departments = [code.strip().upper() for code in request.args.get('department', '').split(',') if code.strip()]
+    invalid_departments = [code for code in departments if not re.match(r'^[A-Z]{2}\.\d{3}$', code)]
+    if invalid_departments:
+        return json_response({"error": f"Invalid department: {', '.join(invalid_departments)}. Expected format: XX.###"}), 400
+
+    periods = {}
+    for bound in ('from', 'to'):
+        period = request.args.get(bound, '').strip().upper()
+        if period and get_period_order(period) is None:
+            return json_response({"error": f"Invalid period: {period}. Expected format: FA17"}), 400
+        periods[bound] = period or None
+
+    try:
+        limit = min(max(int(request.args.get('limit', RANKINGS_DEFAULT_LIMIT)), 1), RANKINGS_MAX_LIMIT)
+        min_n = max(int(request.args.get('min_n', RANKINGS_DEFAULT_MIN_N if sort_by == 'mean' else 0)), 0)
+    except ValueError:
+        return json_response({"error": "limit and min_n must be integers."}), 400
+
+    ranking_params = (question, sort_by, limit, min_n, departments or None, periods['from'], periods['to'])
+    try:
+        etag = get_search_etag('rankings', *ranking_params)
+        if is_not_modified(etag):
+            return not_modified_response(etag, SEARCH_CACHE_CONTROL)
+        rankings = get_course_rankings(*ranking_params)
+        return with_cache_headers(json_response({
+            "rankings": rankings,
+            "by": sort_by,
+            "stat": stat,
+            "departments": departments,
+            "from": periods['from'],
+            "to": periods['to'],
+            "min_n": min_n
+        }), etag, SEARCH_CACHE_CONTROL)
+    except Exception as e:
+        print(f"An error occurred during rankings lookup: {e}")
+        return json_response({"error": "An internal server error occurred."}), 500
+
+@app.route('/api/trend/<string:course_code>')
+def get_course_trend_data(course_code):
+    """
+    API endpoint for a course group's per-period mean, std and n of each stat, oldest period first, e.g.
+    /api/trend/EN.601.226?stats=overall_quality,workload&trend=moving_average&window=3
+    'trend' is 'none' (the default), 'moving_average' or 'regression'.
+    """
+    # Validate course code format
+    if not validate_course_code(course_code):
+        return json_response({"error": "Invalid course code format. Expected format: XX.###.###"}), 400
+
+    # The trend and ranking helpers are only needed when a trend is asked for
+    from .rankings import get_question_key
+    from .trends import TREND_METHODS
+
+    stats = [stat.strip() for stat in request.args.get('stats', '').split(',') if stat.strip()]
+    invalid_stats = [stat for stat in stats if not get_question_key(stat)]
+    if invalid_stats:
+        return json_response({"error": f"Invalid stat: {', '.join(invalid_stats)}"}), 400
+    method = request.args.get('trend', 'none')
+    if method not in TREND_METHODS:
+        return json_response({"error": f"Invalid trend. Expected one of: {', '.join(TREND_METHODS)}"}), 400
+    try:
+        window = min(max(int(request.args.get('window', TREND_DEFAULT_WINDOW)), 1), TREND_MAX_WINDOW)
+    except ValueError:
+        return json_response({"error": "window must be an integer."}), 400
+
+    # Normalize course code to uppercase to match stored format
+    course_code = course_code.upper()
+    print(f"Received trend request for course: {course_code}")
+    try:
+        group_info = get_grouping_service().get_group_info(course_code)
+        member_codes = [course_code] + (group_info.get("courses", []) if group_info else [])
+        trend_params = (sorted(stats) or None, method, window)
+        etag = get_course_etag(member_codes, 'trend', *trend_params)
+        if etag and is_not_modified(etag):
+            return not_modified_response(etag, COURSE_CACHE_CONTROL)
+        if not etag:
+            # Stale courses are refreshed first; writing their instances rebuilds their rollups
+            get_courses_data_batch(member_codes)
+            etag = get_course_etag(member_codes, 'trend', *trend_params)
+
+        # The ETag covers every member's version, so it also keys the cached trend
+        trend = get_course_trend(member_codes, *trend_params, data_version=etag)
+        if trend is None:
+            return json_response({"error": "No data found for this course."}), 404
+        response = json_response({"course_code": course_code, "grouped_courses": sorted(set(member_codes)), **trend})
+        return with_cache_headers(response, etag, COURSE_CACHE_CONTROL) if etag else response
+    except Exception as e:
+        print(f"An error occurred during trend lookup: {e}")
+        return json_response({"error": "An internal server error occurred."}), 500
+
+@app.route('/api/search/instructor_ids/<string:instructor_name>')
+def search_instructor_ids(instructor_name):
+    """
+    API endpoint to find canonical instructors, with their IDs and name variants, by last name.
+    """
+    # URL-decode the instructor name in case it's not automatically decoded
+    instructor_name = unquote(instructor_name)
+
+    # Prevent extremely long instructor names that could cause performance issues
+    if len(instructor_name) > 1000:
+        return json_response({"error": "Instructor name too long. Maximum 1000 characters allowed."}), 400
+
+    print(f"Received instructor ID search for: {instructor_name}")
+    try:
+        etag = get_search_etag('instructor_ids', instructor_name)
+        if is_not_modified(etag):
+            return not_modified_response(etag, SEARCH_CACHE_CONTROL)
+        instructors = find_instructors(instructor_name)
+        return with_cache_headers(json_response(instructors), etag, SEARCH_CACHE_CONTROL)
+    except Exception as e:
+        print(f"An error occurred during instructor ID search: {e}")
+        return json_response({"error": "An internal server error occurred during instructor search."}), 500
+
+@app.route('/api/instructor/<int:instructor_id>')
+def get_instructor(instructor_id):
+    """
+    API endpoint to aggregate one instructor's evaluations across every course they taught.
+    """
+    print(f"Received instructor request for: {instructor_id}")
+    try:
+        etag = get_search_etag('instructor', instructor_id)
+        if is_not_modified(etag):
+            return not_modified_response(etag, SEARCH_CACHE_CONTROL)
+        profile = get_instructor_profile(instructor_id)
+        if profile is None:
+            return json_response({"error": "No instructor found with this ID."}), 404
+        return with_cache_headers(json_response(profile), etag, SEARCH_CACHE_CONTROL)
+    except Exception as e:
+        print(f"An error occurred during instructor lookup: {e}")
+        return json_response({"error": "An internal server error occurred."}), 500
 
 @app.route('/api/grace-status/<string:course_code>')
 def get_grace_status(course_code):
@@ -143,16 +360,16 @@ def get_grace_status(course_code):
     """
     # Validate course code format
     if not validate_course_code(course_code):
-        return jsonify({"error": "Invalid course code format. Expected format: XX.###.###"}), 400
+        return json_response({"error": "Invalid course code format. Expected format: XX.###.###"}), 400
 
     # Normalize course code to uppercase to match stored format
     course_code = course_code.upper()
     try:
         status = get_course_grace_status(course_code)
-        return jsonify(status)
+        return json_response(status)
     except Exception as e:
         print(f"An error occurred checking grace status: {e}")
-        return jsonify({"error": "An internal server error occurred."}), 500
+        return json_response({"error": "An internal server error occurred."}), 500
 
 @app.route('/api/recheck/<string:course_code>', methods=['POST'])
 def recheck_course_data(course_code):
@@ -161,7 +378,7 @@ def recheck_course_data(course_code):
     """
     # Validate course code format
     if not validate_course_code(course_code):
-        return jsonify({"error": "Invalid course code format. Expected format: XX.###.###"}), 400
+        return json_response({"error": "Invalid course code format. Expected format: XX.###.###"}), 400
 
     # Normalize course code to uppercase to match stored format
     course_code = course_code.upper()
@@ -169,14 +386,14 @@ def recheck_course_data(course_code):
     try:
         data = force_recheck_course(course_code)
         if not data:
-            return jsonify({"error": "No data found for this course."}), 404
+            return json_response({"error": "No data found for this course."}), 404
         # Check if the response contains an error
         if isinstance(data, dict) and "error" in data:
-            return jsonify(data), 500
-        return jsonify(data)
+            return json_response(data), 500
+        return json_response(data)
     except Exception as e:
         print(f"An error occurred during recheck: {e}")
-        return jsonify({"error": "An internal server error occurred during recheck."}), 500
+        return json_response({"error": "An internal server error occurred during recheck."}), 500
 
 @app.route('/api/analyze/<string:course_code>', methods=['POST'])
 def analyze_course_data(course_code):
@@ -186,7 +403,7 @@ def analyze_course_data(course_code):
     """
     # Validate course code format
     if not validate_course_code(course_code):
-        return jsonify({"error": "Invalid course code format. Expected format: XX.###.###"}), 400
+        return json_response({"error": "Invalid course code format. Expected format: XX.###.###"}), 400
 
     # Normalize course code to uppercase to match stored format
     course_code = course_code.upper()
@@ -195,17 +412,78 @@ def analyze_course_data(course_code):
         # Get the analysis parameters from the request body
         analysis_params = request.get_json()
         if not analysis_params:
-            return jsonify({"error": "Missing analysis parameters in request body."}), 400
+            return json_response({"error": "Missing analysis parameters in request body."}), 400
 
         # This is now the only data path.
-        # Get all the data for the course
-        all_course_data = get_course_data_and_update_cache(course_code)
+        # Get grouping info
+        group_info = get_grouping_service().get_group_info(course_code)
+        grouped_courses = group_info.get("courses", []) if group_info else []
 
-        # If no data, check for groupings before returning an error
-        if not all_course_data:
-            group_info = grouping_service.get_group_info(course_code)
+        # The response depends on the group's data, the request body and the encoding asked for
+        etag_parts = ('analyze', course_code, request.args.get('format'), analysis_params)
+        etag = get_course_etag([course_code] + grouped_courses, *etag_parts)
+        if etag and is_not_modified(etag):
+            return not_modified_response(etag, ANALYZE_CACHE_CONTROL)
+
+        # The validator changes with any member's data or metadata, so it doubles as the cache key
+        cached_body = analyze_response_cache.get(etag) if etag else None
+        if cached_body is not None:
+            response = Response(cached_body, mimetype='application/json')
+            return with_cache_headers(response, etag, ANALYZE_CACHE_CONTROL)
+
+        # Opt-in server-side analysis, rolled up from the pre-aggregated analysis cube
+        if analysis_params.get('server_analysis'):
+            from .analysis_cube import can_rollup
+            from .analysis_result_cache import analysis_result_cache
+            from .db_utils import get_analysis_cube_cells
+            if can_rollup(analysis_params):
+                member_codes = [course_code] + grouped_courses
+                all_fresh, versions = get_course_versions(member_codes)
+                if not all_fresh:
+                    # Stale courses are refreshed first; writing their instances rebuilds their cells
+                    get_courses_data_batch(member_codes)
+                    all_fresh, versions = get_course_versions(member_codes)
+                # Groupings are cached per version of the group's data, and only once it is settled
+                result = analysis_result_cache.rollup(
+                    member_codes,
+                    make_etag(versions) if all_fresh else None,
+                    analysis_params,
+                    lambda: get_analysis_cube_cells(member_codes)
+                )
+                if result is None:
+                    return json_response({"error": "No data found for this course."}), 404
+                response = json_response(result)
+                etag = etag or get_course_etag(member_codes, *etag_parts)
+                if not etag:
+                    return response
+                analyze_response_cache.put(etag, response.get_data(), member_codes)
+                return with_cache_headers(response, etag, ANALYZE_CACHE_CONTROL)
+
+        # The analysis helpers are only needed when a response is assembled, not for cache hits
+        from .analysis import extract_course_metadata, filter_instances
+
+        # Filters are only pushed into the database when asked for: the frontend caches the raw
+        # data and re-filters it locally, so by default every instance is returned.
+        pushed_filters = analysis_params.get('filters') if analysis_params.get('push_filters') else None
+
+        # Get all the data for the course and its grouped courses in one batch
+        course_data_by_code = get_courses_data_batch([course_code] + grouped_courses, pushed_filters)
+        all_course_data = course_data_by_code.get(course_code)
+
+        names_by_code = None
+        if pushed_filters:
+            from .db_utils import get_course_names_grouped
+            # Names and grouping come from every stored instance, so they don't change with the filters
+            names_by_code = get_course_names_grouped([course_code] + grouped_courses)
+            course_has_data = bool(names_by_code.get(course_code))
+        else:
+            course_has_data = bool(all_course_data)
+
+        # If no data, check for groupings before returning an error. A course whose instances are
+        # all excluded by pushed filters still exists, and gets an empty analysis.
+        if not course_has_data:
             if not group_info or not group_info.get("courses"):
-                return jsonify({"error": "No data found for this course."}), 404
+                return json_response({"error": "No data found for this course."}), 404
         
         # Get metadata
         metadata_from_file = {}
@@ -215,42 +493,45 @@ def analyze_course_data(course_code):
         except (FileNotFoundError, json.JSONDecodeError):
             pass
         
-        # Get grouping info
-        group_info = grouping_service.get_group_info(course_code)
-        grouped_courses = []
         all_instances = {}
         
-        if group_info and group_info.get("courses"):
-            grouped_courses = group_info["courses"]
-            
+        if grouped_courses:
             # Add main course data
             if all_course_data:
                 all_instances.update(all_course_data)
             
-            # Fetch data for all grouped courses
+            # Add data for all grouped courses
             for grouped_code in grouped_courses:
                 if grouped_code != course_code:
-                    try:
-                        grouped_data = get_course_data_and_update_cache(grouped_code)
-                        if grouped_data and isinstance(grouped_data, dict):
-                            # Add course_code field to each instance for separation
-                            for instance_key, instance_data in grouped_data.items():
-                                if isinstance(instance_data, dict):
-                                    instance_data_with_code = instance_data.copy()
-                                    instance_data_with_code['course_code'] = grouped_code
-                                    all_instances[f"{grouped_code}_{instance_key}"] = instance_data_with_code
-                    except Exception as e:
-                        print(f"Warning: Could not load grouped course {grouped_code}: {e}")
+                    grouped_data = course_data_by_code.get(grouped_code)
+                    if grouped_data and isinstance(grouped_data, dict):
+                        # Add course_code field to each instance for separation.
+                        # The batch loader returns freshly decoded rows, so they can be tagged in place.
+                        for instance_key, instance_data in grouped_data.items():
+                            if isinstance(instance_data, dict):
+                                instance_data['course_code'] = grouped_code
+                                all_instances[f"{grouped_code}_{instance_key}"] = instance_data
         else:
             # No grouping, just use the main course data
             if all_course_data:
                 all_instances.update(all_course_data)
         
+        # Stale courses are refreshed in full, so re-apply pushed filters to catch their instances
+        if pushed_filters:
+            all_instances = filter_instances(all_instances, pushed_filters)
+
         # Extract course names for metadata
         course_names = {}
-        for instance_key, instance_data in all_instances.items():
-            if 'course_name' in instance_data:
-                course_names[instance_key] = instance_data['course_name']
+        if names_by_code is not None:
+            # Keyed like all_instances, where grouped courses' keys are prefixed with their code
+            for names_code, names in names_by_code.items():
+                for instance_key, course_name in names.items():
+                    if course_name is not None:
+                        course_names[instance_key if names_code == course_code else f"{names_code}_{instance_key}"] = course_name
+        else:
+            for instance_key, instance_data in all_instances.items():
+                if 'course_name' in instance_data:
+                    course_names[instance_key] = instance_data['course_name']
         
         # Get course metadata
         course_metadata = extract_course_metadata(
@@ -258,20 +539,29 @@ def analyze_course_data(course_code):
             course_code, 
             metadata_from_file,
             primary_course_code=course_code,
-            primary_course_has_no_data=not all_course_data
+            primary_course_has_no_data=not course_has_data
         )
         
         # From the final set of instances, find which courses actually contributed data
         actual_grouped_courses = set()
-        for key in all_instances.keys():
-            match = re.match(r'([A-Z]{2}\.\d{3}\.\d{3})', key)
-            if match:
-                actual_grouped_courses.add(match.group(1))
+        if names_by_code is not None:
+            actual_grouped_courses.update(names_code for names_code, names in names_by_code.items() if names)
+        else:
+            for key in all_instances.keys():
+                course_code_from_key = parse_instance_key(key).course_code
+                if course_code_from_key:
+                    actual_grouped_courses.add(course_code_from_key)
+
+        # Opt-in compact encoding: ?format=columnar
+        if request.args.get('format') == 'columnar':
+            instances_payload = encode_instances_columnar(all_instances)
+        else:
+            instances_payload = all_instances
 
         # Return raw data structure
-        return jsonify({
+        response = json_response({
             "raw_data": {
-                "instances": all_instances,
+                "instances": instances_payload,
                 "metadata": {
                     "current_name": course_metadata.get("current_name"),
                     "former_names": course_metadata.get("former_names", []),
@@ -285,10 +575,102 @@ def analyze_course_data(course_code):
                 }
             }
         })
+        etag = etag or get_course_etag([course_code] + grouped_courses, *etag_parts)
+        if not etag:
+            return response
+        analyze_response_cache.put(etag, response.get_data(), [course_code] + grouped_courses)
+        return with_cache_headers(response, etag, ANALYZE_CACHE_CONTROL)
 
     except Exception as e:
         print(f"An error occurred during analysis: {e}")
-        return jsonify({"error": "An internal server error occurred during analysis."}), 500
+        return json_response({"error": "An internal server error occurred during analysis."}), 500
+
+@app.route('/api/compare', methods=['POST'])
+def compare_courses():
+    """
+    API endpoint to analyze several course groups side by side with shared filters and separation keys,
+    e.g. {"courses": ["EN.601.226", "EN.601.229"], "filters": {...}, "separation_keys": ["year"]}.
+    Groups are rolled up from the analysis cube, so only separation keys it can answer are accepted.
+    """
+    # The cube helpers are only needed when courses are compared
+    from .analysis_cube import CUBE_SEPARATION_KEYS, can_rollup
+    from .compare import compare_course_groups
+    from .db_utils import get_analysis_cube_cells
+
+    compare_params = request.get_json(silent=True)
+    if not compare_params:
+        return json_response({"error": "Missing comparison parameters in request body."}), 400
+    course_codes = compare_params.get('courses')
+    if not course_codes or not isinstance(course_codes, list):
+        return json_response({"error": "Missing course codes. Expected \"courses\": [\"XX.###.###\", ...]"}), 400
+    if len(course_codes) > BATCH_MAX_COURSES:
+        return json_response({"error": f"Too many course codes. Maximum {BATCH_MAX_COURSES} allowed."}), 400
+    invalid_codes = [str(code) for code in course_codes if not isinstance(code, str) or not validate_course_code(code)]
+    if invalid_codes:
+        return json_response({"error": f"Invalid course code format: {', '.join(invalid_codes)}. Expected format: XX.###.###"}), 400
+    if not can_rollup(compare_params):
+        return json_response({"error": f"Unsupported separation keys. Expected any of: {', '.join(sorted(CUBE_SEPARATION_KEYS))}"}), 400
+
+    # Normalize course codes to uppercase to match stored format
+    course_codes = list(dict.fromkeys(code.upper() for code in course_codes))
+    print(f"Received comparison request for courses: {', '.join(course_codes)}")
+    try:
+        grouping_service = get_grouping_service()
+        member_codes_by_course = {}
+        for course_code in course_codes:
+            group_info = grouping_service.get_group_info(course_code)
+            member_codes_by_course[course_code] = [course_code] + (group_info.get("courses", []) if group_info else [])
+        # Courses that share members are refreshed and read once
+        all_member_codes = list(dict.fromkeys(code for codes in member_codes_by_course.values() for code in codes))
+
+        etag_parts = ('compare', compare_params)
+        all_fresh, versions = get_course_versions(all_member_codes)
+        etag = make_etag(*etag_parts, versions) if all_fresh else None
+        if etag and is_not_modified(etag):
+            return not_modified_response(etag, ANALYZE_CACHE_CONTROL)
+        cached_body = analyze_response_cache.get(etag) if etag else None
+        if cached_body is not None:
+            response = Response(cached_body, mimetype='application/json')
+            return with_cache_headers(response, etag, ANALYZE_CACHE_CONTROL)
+
+        if not all_fresh:
+            # Stale courses are refreshed in one batch; writing their instances rebuilds their cells
+            get_courses_data_batch(all_member_codes)
+            all_fresh, versions = get_course_versions(all_member_codes)
+
+        comparison = compare_course_groups(
+            member_codes_by_course, compare_params, versions if all_fresh else None, get_analysis_cube_cells
+        )
+        if not any(comparison.values()):
+            return json_response({"error": "No data found for these courses."}), 404
+        response = json_response({
+            # Responses have sorted keys, so the requested order is listed separately
+            "course_codes": course_codes,
+            "courses": comparison,
+            "filters": compare_params.get('filters', {}),
+            "separation_keys": compare_params.get('separation_keys')
+        })
+        etag = etag or get_course_etag(all_member_codes, *etag_parts)
+        if not etag:
+            return response
+        analyze_response_cache.put(etag, response.get_data(), all_member_codes)
+        return with_cache_headers(response, etag, ANALYZE_CACHE_CONTROL)
+    except Exception as e:
+        print(f"An error occurred during comparison: {e}")
+        return json_response({"error": "An internal server error occurred during comparison."}), 500
+
+@app.route('/api/cache-stats')
+def get_cache_stats():
+    """
+    API endpoint to report this process's analyze response and analysis result cache counters and
+    cold-start import time.
+    """
+    from .analysis_result_cache import analysis_result_cache
+    return json_response({
+        "analyze": analyze_response_cache.stats(),
+        "analysis_results": analysis_result_cache.stats(),
+        "import_ms": round(IMPORT_SECONDS * 1000)
+    })
 
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,181 @@
+import os
+import time
+import json
+import sqlite3
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+from .response_cache import ResponseCache
+from .response_utils import dumps_json, loads_json
+from .config import CACHE_BACKEND, CACHE_SQLITE_PATH, CACHE_MAX_BYTES, CACHE_KEY_VERSION
+
+
+def make_cache_key(namespace: str, *parts) -> str:
+    """
+    Builds a fixed-length cache key from a namespace and any JSON-serializable parts.
+    Keys are versioned, so entries written by an older deployment or payload format are never read.
+    """
+    digest = hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode('utf-8'))
+    return f"{CACHE_KEY_VERSION}:{namespace}:{digest.hexdigest()[:32]}"
+
+
+class CacheBackend(ABC):
+    """
+    Interface for the byte caches behind course payloads and search results.
+    Backends must never raise on lookups: any failure is reported as a miss.
+    """
+    name = 'base'
+
+    @abstractmethod
+    def get(self, key: str):
+        """Returns the cached bytes for a key, or None on a miss."""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl_seconds: int):
+        """Stores bytes under a key for ttl_seconds."""
+
+    @abstractmethod
+    def delete(self, key: str):
+        """Drops a key, if present."""
+
+    def get_json(self, key: str):
+        body = self.get(key)
+        return loads_json(body) if body is not None else None
+
+    def set_json(self, key: str, payload, ttl_seconds: int):
+        self.set(key, dumps_json(payload), ttl_seconds)
+
+
+class NullCacheBackend(CacheBackend):
+    """Disables caching: every lookup is a miss."""
+    name = 'none'
+
+    def get(self, key: str):
+        return None
+
+    def set(self, key: str, value: bytes, ttl_seconds: int):
+        pass
+
+    def delete(self, key: str):
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Keeps entries in this process only, so every worker has its own copy."""
+    name = 'memory'
+
+    def __init__(self, max_bytes: int):
+        self._cache = ResponseCache(max_bytes, ttl_seconds=0)
+
+    def get(self, key: str):
+        return self._cache.get(key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: int):
+        self._cache.put(key, value, ttl_seconds=ttl_seconds)
+
+    def delete(self, key: str):
+        self._cache.delete(key)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Keeps entries in a single SQLite file, so every worker process on a host shares them and they
+    survive restarts. On Vercel the file lives in the function's writable temp directory, so warm
+    and semi-warm invocations of an instance start with the entries earlier invocations wrote. WAL mode lets readers proceed while another worker writes, and reads go
+    through a memory-mapped view of the file.
+    """
+    name = 'sqlite'
+    PRUNE_EVERY_WRITES = 100
+    MMAP_SIZE = 256 * 1024 * 1024
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._writes = 0
+
+    def _connection(self):
+        # One connection per thread and process, so forked workers never share a handle
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA mmap_size={self.MMAP_SIZE}")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_entries_expires_at ON cache_entries (expires_at)")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str):
+        try:
+            row = self._connection().execute(
+                "SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Warning: Cache lookup failed: {e}")
+            return None
+        return bytes(row[0]) if row else None
+
+    def set(self, key: str, value: bytes, ttl_seconds: int):
+        if len(value) > self.max_bytes:
+            return
+        try:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, size, expires_at) VALUES (?, ?, ?, ?)",
+                (key, value, len(value), time.time() + ttl_seconds)
+            )
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY_WRITES == 0:
+                self._prune(conn)
+        except sqlite3.Error as e:
+            print(f"Warning: Cache write failed: {e}")
+
+    def delete(self, key: str):
+        try:
+            self._connection().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            print(f"Warning: Cache delete failed: {e}")
+
+    def _prune(self, conn):
+        """Drops expired entries, then the entries closest to expiring until the file fits its budget."""
+        conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+        total_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+        if total_bytes <= self.max_bytes:
+            return
+        excess = total_bytes - self.max_bytes
+        freed = 0
+        doomed = []
+        for key, size in conn.execute("SELECT key, size FROM cache_entries ORDER BY expires_at"):
+            doomed.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM cache_entries WHERE key = ?", doomed)
+
+
+def create_cache_backend(name: str) -> CacheBackend:
+    """Builds the configured backend, falling back to a per-process cache if the shared one can't be opened."""
+    if name == 'none':
+        return NullCacheBackend()
+    if name == 'sqlite':
+        try:
+            # Only checks the file can be opened; workers open their own connections on first use
+            sqlite3.connect(CACHE_SQLITE_PATH).close()
+            return SQLiteCacheBackend(CACHE_SQLITE_PATH, CACHE_MAX_BYTES)
+        except sqlite3.Error as e:
+            print(f"Warning: Could not open shared cache at {CACHE_SQLITE_PATH}: {e}. Using an in-process cache.")
+    return MemoryCacheBackend(CACHE_MAX_BYTES)
+
+
+# Shared by the course payload and search result caches in scraper_service
+shared_cache = create_cache_backend(CACHE_BACKEND)
@@ -0,0 +1,46 @@
+from .analysis_result_cache import analysis_result_cache
+from .http_caching import make_etag
+
+
+def compare_course_groups(member_codes_by_course: dict, params: dict, versions: list, load_cells) -> dict:
+    """
+    Rolls up the analysis of several course groups side by side, with shared filters and separation
+    keys. The cube cells of every member are loaded at most once, in one call, however many groups
+    share a member; each group's grouping goes through the analysis result cache, so the groups
+    /api/analyze has already rolled up (and vice versa) are not recomputed.
+
+    Args:
+        member_codes_by_course (dict): {course_code: [member codes of its group]}.
+        params (dict): Analysis parameters, as for process_analysis_request. Only separation keys the
+            cube can answer are supported; check analysis_cube.can_rollup first.
+        versions (list): The [course_code, updated_at, relevant_periods] entries of every member, as
+            returned by get_course_versions, or None if the data is not settled and must not be cached.
+        load_cells (callable): Returns the cube cells of the given member codes.
+
+    Returns:
+        dict: {course_code: {"grouped_courses", "data", "statistics_metadata"}}, with None instead of
+              an entry for courses whose group has no data.
+    """
+    version_by_code = {version[0]: version for version in versions} if versions is not None else None
+    cells_by_code = None
+
+    def load_group_cells(member_codes):
+        nonlocal cells_by_code
+        if cells_by_code is None:
+            # The first miss reads the cells of every group's members at once
+            all_member_codes = sorted({code for codes in member_codes_by_course.values() for code in codes})
+            cells_by_code = {}
+            for cell in load_cells(all_member_codes):
+                cells_by_code.setdefault(cell["course_code"], []).append(cell)
+        return [cell for code in dict.fromkeys(member_codes) for cell in cells_by_code.get(code, ())]
+
+    comparison = {}
+    for course_code, member_codes in member_codes_by_course.items():
+        data_version = None
+        if version_by_code is not None:
+            data_version = make_etag([version_by_code.get(code) for code in dict.fromkeys(member_codes)])
+        result = analysis_result_cache.rollup(
+            member_codes, data_version, params, lambda member_codes=member_codes: load_group_cells(member_codes)
+        )
+        comparison[course_code] = result and {"grouped_courses": sorted(set(member_codes)), **result}
+    return comparison
@@ -4,6 +4,9 @@
 This file contains all the constants for the course evaluation scraper application.
 """
 
+import os
+import tempfile
+
 # File Paths
 METADATA_FILE = 'metadata.json'
 DATA_FILE = 'data.json'
@@ -35,6 +38,68 @@ PERIOD_GRACE_MONTHS = {
 }
 
 
+# Link Discovery
+# When a course is known to need section-based discovery, rescans within an academic year only cover
+# the sections seen before, plus this many section numbers after the highest one. The first scrape of
+# each academic year still sweeps every section.
+SECTION_LOOKAHEAD = 2
+
+# The first calendar year with published evaluations. Department crawls start here unless told otherwise.
+EARLIEST_REPORT_YEAR = 2009
+
+# Known Course Filter
+# How often the in-memory set of valid course codes is rebuilt in the background.
+KNOWN_COURSES_REFRESH_SECONDS = 6 * 60 * 60
+
+# Batch Loading
+BATCH_MAX_COURSES = 20        # Maximum number of course codes accepted by one batch request
+BATCH_REFRESH_WORKERS = 4     # Stale courses in a batch are refreshed concurrently with this many threads
+
+# Response Compression
+COMPRESSION_MIN_BYTES = 1024  # Responses smaller than this are sent uncompressed
+GZIP_COMPRESSION_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# HTTP Caching
+# Course data changes at most once per period, and explicit rechecks bypass these caches.
+COURSE_CACHE_CONTROL = 'public, max-age=300'
+SEARCH_CACHE_CONTROL = 'public, max-age=300'
+# POST responses are not keyed by their body in shared caches, so they are only revalidated by the client
+ANALYZE_CACHE_CONTROL = 'private, no-cache'
+ANALYZE_CACHE_MAX_BYTES = 64 * 1024 * 1024  # Memory budget for assembled /api/analyze responses per process
+ANALYZE_CACHE_TTL_SECONDS = 15 * 60
+
+# Shared Cache Tier
+# Course payloads and search results are cached in a backend shared by all workers on a host.
+# 'sqlite' keeps entries in one on-disk file, 'memory' keeps them per process, 'none' disables caching.
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'sqlite')
+CACHE_SQLITE_PATH = os.environ.get('CACHE_SQLITE_PATH', os.path.join(tempfile.gettempdir(), 'jhu-evals-cache.sqlite3'))
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+COURSE_PAYLOAD_CACHE_TTL_SECONDS = 24 * 60 * 60  # Keys include the course's metadata version, so this only bounds disk use
+SEARCH_CACHE_TTL_SECONDS = 60 * 60
+# Bumped whenever the format of cached payloads changes. Each deployment also gets its own key space.
+CACHE_KEY_VERSION = f"1-{os.environ.get('VERCEL_GIT_COMMIT_SHA', 'local')[:12]}"
+# How long an instance trusts cached course metadata and the dataset version stamp before re-reading
+# them. Within this window hot courses are served without touching the database; scrapes made by
+# other instances become visible once it passes.
+HOT_METADATA_TTL_SECONDS = 5 * 60
+
+# Analysis Result Cache
+# Rolled-up analysis groupings kept per process, keyed by course group, data version, filters and
+# separation keys. Coarser separations are derived from cached finer ones.
+ANALYSIS_RESULT_CACHE_MAX_ENTRIES = 512
+
+# Rankings
+RANKINGS_DEFAULT_LIMIT = 10
+RANKINGS_MAX_LIMIT = 100
+# Courses with fewer responses are left out of rankings by mean, where a handful of answers would dominate
+RANKINGS_DEFAULT_MIN_N = 20
+
+# Trends
+# Periods pooled by the moving average trend line of /api/trend
+TREND_DEFAULT_WINDOW = 3
+TREND_MAX_WINDOW = 12
+
 # Scraping Reliability
 SCRAPING_DELAY_SECONDS = 0    # No delay between scrapes
 MAX_RETRIES = 8               # Maximum number of retries for a failed scrape
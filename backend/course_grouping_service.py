@@ -3,6 +3,9 @@ import os
 import re
 from typing import List, Dict
 
+# Bounds the memoized groups; the catalog has far fewer course codes than this
+GROUPED_COURSES_CACHE_SIZE = 65536
+
 class CourseGroupingService:
     # Embedded default config for serverless deployments
     DEFAULT_CONFIG = {
@@ -52,6 +55,8 @@ class CourseGroupingService:
         self.config_path = config_path
         self.department_patterns = {}
         self.explicit_groupings = []
+        # The config never changes after loading, so each course's group is only worked out once
+        self._grouped_courses_cache = {}
         self._load_config()
 
     def _load_config(self):
@@ -110,6 +115,14 @@ class CourseGroupingService:
         return None
 
     def get_grouped_courses(self, course_code: str) -> List[str]:
+        grouped_courses = self._grouped_courses_cache.get(course_code)
+        if grouped_courses is None:
+            if len(self._grouped_courses_cache) >= GROUPED_COURSES_CACHE_SIZE:
+                self._grouped_courses_cache.clear()
+            grouped_courses = self._grouped_courses_cache[course_code] = self._compute_grouped_courses(course_code)
+        return list(grouped_courses)
+
+    def _compute_grouped_courses(self, course_code: str) -> List[str]:
         dept, number = self._parse_course_code(course_code)
         explicit_group = self._find_explicit_group(course_code)
         grouped_courses = set()
@@ -153,3 +166,16 @@ class CourseGroupingService:
                 info["description"] = ""
                 return info
         return {}
+
+
+_shared_grouping_service = None
+
+def get_grouping_service() -> CourseGroupingService:
+    """
+    Returns the grouping service shared by the whole process, loading its config on first use.
+    A race on first use at worst loads the config twice; both instances are equivalent.
+    """
+    global _shared_grouping_service
+    if _shared_grouping_service is None:
+        _shared_grouping_service = CourseGroupingService()
+    return _shared_grouping_service
@@ -1,12 +1,18 @@
 import os
-import psycopg2
 import json
-from dotenv import load_dotenv
 
-load_dotenv()
+# psycopg2 and python-dotenv are imported on first connection, so requests served from the cache
+# tiers never load them
+_environment_loaded = False
 
 def get_db_connection():
     """Establishes a connection to the database."""
+    global _environment_loaded
+    import psycopg2
+    if not _environment_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _environment_loaded = True
     conn_string = os.getenv("DATABASE_URL")
     if not conn_string:
         raise Exception("DATABASE_URL environment variable not set.")
@@ -24,28 +30,60 @@ def get_course_metadata(course_code):
                 return dict(zip(colnames, row))
     return None
 
+METADATA_UPSERT_SQL = """
+    INSERT INTO course_metadata (course_code, last_period_gathered, last_period_failed, relevant_periods, last_scrape_during_grace_period, last_probe_date, last_probe_outcome, discovery_mode, known_sections, no_data_until)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ON CONFLICT (course_code) DO UPDATE SET
+        last_period_gathered = EXCLUDED.last_period_gathered,
+        last_period_failed = EXCLUDED.last_period_failed,
+        relevant_periods = EXCLUDED.relevant_periods,
+        last_scrape_during_grace_period = EXCLUDED.last_scrape_during_grace_period,
+        last_probe_date = EXCLUDED.last_probe_date,
+        last_probe_outcome = EXCLUDED.last_probe_outcome,
+        discovery_mode = EXCLUDED.discovery_mode,
+        known_sections = EXCLUDED.known_sections,
+        no_data_until = EXCLUDED.no_data_until,
+        updated_at = NOW();
+"""
+
+def _metadata_params(course_code, metadata):
+    """Builds the parameter tuple for METADATA_UPSERT_SQL."""
+    return (
+        course_code,
+        metadata.get('last_period_gathered'),
+        metadata.get('last_period_failed', False),
+        json.dumps(metadata.get('relevant_periods')),
+        metadata.get('last_scrape_during_grace_period'),
+        metadata.get('last_probe_date'),
+        metadata.get('last_probe_outcome'),
+        metadata.get('discovery_mode'),
+        json.dumps(metadata.get('known_sections')),
+        metadata.get('no_data_until')
+    )
+
 def update_course_metadata(course_code, metadata):
     """Inserts or updates course metadata."""
     with get_db_connection() as conn:
         with conn.cursor() as cur:
-            cur.execute(
-                """
-                INSERT INTO course_metadata (course_code, last_period_gathered, last_period_failed, relevant_periods, last_scrape_during_grace_period)
-                VALUES (%s, %s, %s, %s, %s)
-                ON CONFLICT (course_code) DO UPDATE SET
-                    last_period_gathered = EXCLUDED.last_period_gathered,
-                    last_period_failed = EXCLUDED.last_period_failed,
-                    relevant_periods = EXCLUDED.relevant_periods,
-                    last_scrape_during_grace_period = EXCLUDED.last_scrape_during_grace_period,
-                    updated_at = NOW();
-                """,
-                (
-                    course_code,
-                    metadata.get('last_period_gathered'),
-                    metadata.get('last_period_failed', False),
-                    json.dumps(metadata.get('relevant_periods')),
-                    metadata.get('last_scrape_during_grace_period')
-                )
+            cur.execute(METADATA_UPSERT_SQL, _metadata_params(course_code, metadata))
+
+def get_course_metadata_bulk(course_codes):
+    """Fetches metadata for several courses in one query, keyed by course code."""
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT * FROM course_metadata WHERE course_code = ANY(%s)", (list(course_codes),))
+            colnames = [desc[0] for desc in cur.description]
+            return {row[0]: dict(zip(colnames, row)) for row in cur.fetchall()}
+
+def bulk_update_course_metadata(metadata_by_code):
+    """Inserts or updates metadata for several courses in a single transaction."""
+    if not metadata_by_code:
+        return
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.executemany(
+                METADATA_UPSERT_SQL,
+                [_metadata_params(course_code, metadata) for course_code, metadata in metadata_by_code.items()]
             )
 
 def get_course_data_by_keys(keys):
@@ -56,20 +94,591 @@ def get_course_data_by_keys(keys):
             rows = cur.fetchall()
             return {row[0]: row[1] for row in rows}
 
+# Maps the season names used by analysis filters to the period_season column values
+SEASON_CODES = {"Fall": "FA", "Spring": "SP", "Summer": "SU", "Intersession": "IN"}
+
+def build_instance_filter_clause(filters):
+    """
+    Translates analysis filters ({'min_year', 'max_year', 'seasons', 'instructors'}) into SQL
+    conditions on the generated period_year, period_season and instructor_name columns.
+    Returns a (sql, params) tuple; sql is empty when there is nothing to filter on.
+    """
+    clauses = []
+    params = []
+    if not filters:
+        return "", params
+    if filters.get('min_year'):
+        clauses.append("period_year >= %s")
+        params.append(int(filters['min_year']))
+    if filters.get('max_year'):
+        clauses.append("period_year <= %s")
+        params.append(int(filters['max_year']))
+    if filters.get('seasons'):
+        clauses.append("period_season = ANY(%s)")
+        params.append([SEASON_CODES.get(season, season) for season in filters['seasons']])
+    if filters.get('instructors'):
+        clauses.append("instructor_name = ANY(%s)")
+        params.append(list(filters['instructors']))
+    return "".join(f" AND {clause}" for clause in clauses), params
+
+def get_course_data_by_keys_grouped(keys, filters=None):
+    """
+    Fetches course data for a list of instance keys in one query, grouped by course code.
+    Optional analysis filters are applied in SQL so only the matching rows are read.
+    """
+    grouped = {}
+    if not keys:
+        return grouped
+    filter_sql, filter_params = build_instance_filter_clause(filters)
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT course_code, instance_key, data FROM courses WHERE instance_key = ANY(%s)" + filter_sql,
+                [list(keys)] + filter_params
+            )
+            for course_code, instance_key, data in cur.fetchall():
+                grouped.setdefault(course_code, {})[instance_key] = data
+    return grouped
+
+def get_course_names_grouped(course_codes):
+    """
+    Reads the course name of every stored instance of several courses, without loading the rest of
+    their data. Instances without a course name map to None.
+    Returns {course_code: {instance_key: course_name}}.
+    """
+    grouped = {}
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT course_code, instance_key, data->>'course_name' FROM courses WHERE course_code = ANY(%s)",
+                (list(course_codes),)
+            )
+            for course_code, instance_key, course_name in cur.fetchall():
+                grouped.setdefault(course_code, {})[instance_key] = course_name
+    return grouped
+
 def update_course_data(instance_key, course_code, data):
-    """Inserts or updates course data."""
+    """Inserts or updates one course instance; see bulk_update_course_data."""
+    bulk_update_course_data([(instance_key, course_code, data)])
+
+def assign_instructors(cur, rows):
+    """
+    Links instances to their canonical instructors inside the caller's transaction, creating
+    instructors and name variants as needed. Spellings that reduce to the same lowercase letters
+    share an instructor, whose display name is the spelling from the most recent period.
+    rows is a list of (instance_key, course_code, data) tuples.
+    """
+    from psycopg2.extras import execute_values
+    from .sufficient_statistics import _simplify_name
+    from .instance_keys import parse_instance_key
+
+    latest_by_key = {}  # canonical key -> (period order, display name)
+    canonical_key_by_instance = {}
+    variants = {}
+    for instance_key, _, data in rows:
+        instructor_name = data.get('instructor_name') if isinstance(data, dict) else None
+        canonical_key = _simplify_name(instructor_name)
+        if not canonical_key:
+            continue
+        candidate = (parse_instance_key(instance_key).period_order or 0, instructor_name)
+        if canonical_key not in latest_by_key or candidate > latest_by_key[canonical_key]:
+            latest_by_key[canonical_key] = candidate
+        canonical_key_by_instance[instance_key] = canonical_key
+        variants[instructor_name] = canonical_key
+
+    instructor_ids = {}
+    if latest_by_key:
+        # Names compare with the C collation so the most recent spelling wins ties like it does in Python
+        instructor_ids = dict(execute_values(
+            cur,
+            """
+            INSERT INTO instructors (canonical_key, display_name, latest_period_order)
+            VALUES %s
+            ON CONFLICT (canonical_key) DO UPDATE SET
+                display_name = CASE
+                    WHEN (EXCLUDED.latest_period_order, EXCLUDED.display_name COLLATE "C")
+                         > (instructors.latest_period_order, instructors.display_name COLLATE "C")
+                    THEN EXCLUDED.display_name ELSE instructors.display_name END,
+                latest_period_order = GREATEST(EXCLUDED.latest_period_order, instructors.latest_period_order)
+            RETURNING canonical_key, instructor_id
+            """,
+            [(canonical_key, display_name, period_order)
+             for canonical_key, (period_order, display_name) in latest_by_key.items()],
+            fetch=True
+        ))
+        execute_values(
+            cur,
+            """
+            INSERT INTO instructor_name_variants (name, instructor_id, last_name)
+            VALUES %s
+            ON CONFLICT (name) DO NOTHING
+            """,
+            [(name, instructor_ids[canonical_key], get_last_name(name)) for name, canonical_key in variants.items()]
+        )
+
+    # Instances without an instructor name are unlinked, in case a re-scrape dropped it
+    execute_values(
+        cur,
+        """
+        UPDATE courses SET instructor_id = v.instructor_id
+        FROM (VALUES %s) AS v (instance_key, instructor_id)
+        WHERE courses.instance_key = v.instance_key
+        """,
+        [(instance_key, instructor_ids.get(canonical_key_by_instance.get(instance_key)))
+         for instance_key, _, _ in rows],
+        template="(%s, %s::integer)"
+    )
+
+def write_question_stats(cur, rows):
+    """
+    Replaces the rows of instance_question_stats for the given instances, inside the caller's transaction.
+    rows is a list of (instance_key, course_code, data) tuples.
+    """
+    from psycopg2.extras import execute_values
+    from .sufficient_statistics import compute_sufficient_statistics
+
+    stats_rows = [
+        (instance_key, course_code, question, n, total, total_squares, option_counts)
+        for instance_key, course_code, data in rows
+        for question, (n, total, total_squares, option_counts) in compute_sufficient_statistics(data).items()
+    ]
+    # Questions dropped from a re-scraped instance must not keep their old statistics
+    cur.execute("DELETE FROM instance_question_stats WHERE instance_key = ANY(%s)", ([row[0] for row in rows],))
+    if stats_rows:
+        execute_values(
+            cur,
+            """
+            INSERT INTO instance_question_stats (instance_key, course_code, question, n, total, total_squares, option_counts)
+            VALUES %s
+            """,
+            stats_rows
+        )
+
+def get_existing_instance_keys(keys):
+    """Returns the subset of instance keys that are already stored, without loading their data."""
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT instance_key FROM courses WHERE instance_key = ANY(%s)", (list(keys),))
+            return {row[0] for row in cur.fetchall()}
+
+def bulk_update_course_data(rows):
+    """
+    Inserts or updates many course instances at once, along with their per-question sufficient statistics.
+    rows is a list of (instance_key, course_code, data) tuples. The analysis cube cells of the written
+    instances are updated in place, so callers can write a course's instances in any number of calls.
+    """
+    if not rows:
+        return
+    from psycopg2.extras import execute_values
     with get_db_connection() as conn:
         with conn.cursor() as cur:
+            course_codes = {course_code for _, course_code, _ in rows}
+            lock_courses(cur, course_codes)
+            # Instances being re-scraped must take their old contribution out of the cube
             cur.execute(
+                "SELECT instance_key, course_code, data FROM courses WHERE instance_key = ANY(%s)",
+                ([instance_key for instance_key, _, _ in rows],)
+            )
+            old_rows = cur.fetchall()
+            execute_values(
+                cur,
                 """
                 INSERT INTO courses (instance_key, course_code, data)
-                VALUES (%s, %s, %s)
+                VALUES %s
                 ON CONFLICT (instance_key) DO UPDATE SET
                     data = EXCLUDED.data,
                     updated_at = NOW();
                 """,
-                (instance_key, course_code, json.dumps(data))
+                [(instance_key, course_code, json.dumps(data)) for instance_key, course_code, data in rows]
+            )
+            assign_instructors(cur, rows)
+            write_question_stats(cur, rows)
+            update_analysis_cube(cur, rows, old_rows)
+            update_course_rollups(cur, rows + old_rows)
+
+def lock_courses(cur, course_codes):
+    """
+    Serializes writers of the same courses until the caller's transaction ends, so derived tables
+    updated from a read of their current state never lose a concurrent update. Locks are taken in
+    course code order to avoid deadlocks between batches.
+    """
+    for course_code in sorted(course_codes):
+        cur.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (course_code,))
+
+def update_analysis_cube(cur, rows, old_rows):
+    """
+    Applies written instances to the analysis cube inside the caller's transaction: the cells built
+    from rows are added to the stored cells, after subtracting the cells old_rows (the previous data
+    of re-scraped instances) contributed. Only the touched cells are read and written; the caller must
+    hold lock_courses for their courses. refresh_analysis_cube rebuilds whole courses for backfills.
+    """
+    from psycopg2.extras import execute_values
+    from .analysis_cube import add_option_counts, build_cube_cells
+
+    deltas = {}
+    for sign, delta_rows in ((-1, old_rows), (1, rows)):
+        instances_by_code = {}
+        for instance_key, course_code, data in delta_rows:
+            instances_by_code.setdefault(course_code, {})[instance_key] = data
+        for course_code, instances in instances_by_code.items():
+            for cell in build_cube_cells(instances, course_code):
+                cell_key = (cell["course_code"], cell["period"], cell["instructor_name"], cell["course_name"])
+                delta = deltas.setdefault(cell_key, {"instance_count": 0, "option_counts": {}})
+                delta["instance_count"] += sign * cell["instance_count"]
+                add_option_counts(delta["option_counts"], {
+                    question: [sign * count for count in counts] for question, counts in cell["option_counts"].items()
+                })
+    # Re-scrapes that changed nothing leave their cells alone
+    deltas = {
+        cell_key: delta for cell_key, delta in deltas.items()
+        if delta["instance_count"] or any(any(counts) for counts in delta["option_counts"].values())
+    }
+    if not deltas:
+        return
+
+    # Cells are matched with IS NOT DISTINCT FROM, since period, instructor and course name can be NULL
+    cell_match = """
+        a.course_code = v.course_code AND a.period IS NOT DISTINCT FROM v.period
+        AND a.instructor_name IS NOT DISTINCT FROM v.instructor_name AND a.course_name IS NOT DISTINCT FROM v.course_name
+    """
+    cell_template = "(%s, %s::varchar, %s::text, %s::text)"
+    stored_cells = {
+        tuple(row[:4]): (row[4], row[5])
+        for row in execute_values(
+            cur,
+            f"""
+            SELECT a.course_code, a.period, a.instructor_name, a.course_name, a.instance_count, a.option_counts
+            FROM analysis_cube a
+            JOIN (VALUES %s) AS v (course_code, period, instructor_name, course_name) ON {cell_match}
+            """,
+            list(deltas),
+            template=cell_template,
+            fetch=True
+        )
+    }
+
+    upserted_cells = []
+    emptied_cells = []
+    for cell_key, delta in deltas.items():
+        instance_count, option_counts = stored_cells.get(cell_key, (0, {}))
+        instance_count += delta["instance_count"]
+        add_option_counts(option_counts, delta["option_counts"])
+        if instance_count > 0:
+            upserted_cells.append((*cell_key, instance_count, json.dumps(option_counts)))
+        elif cell_key in stored_cells:
+            emptied_cells.append(cell_key)
+
+    if emptied_cells:
+        execute_values(
+            cur,
+            f"""
+            DELETE FROM analysis_cube a
+            USING (VALUES %s) AS v (course_code, period, instructor_name, course_name)
+            WHERE {cell_match}
+            """,
+            emptied_cells,
+            template=cell_template
+        )
+    if upserted_cells:
+        execute_values(
+            cur,
+            """
+            INSERT INTO analysis_cube (course_code, period, instructor_name, course_name, instance_count, option_counts)
+            VALUES %s
+            ON CONFLICT (course_code, period, instructor_name, course_name) DO UPDATE SET
+                instance_count = EXCLUDED.instance_count,
+                option_counts = EXCLUDED.option_counts
+            """,
+            upserted_cells
+        )
+
+def refresh_analysis_cube(cur, course_codes):
+    """
+    Rebuilds the analysis cube cells of the given courses from all their stored instances, inside the
+    caller's transaction. Writes update the cube incrementally (update_analysis_cube); this is for
+    backfills and repairs.
+    """
+    from psycopg2.extras import execute_values
+    from .analysis_cube import build_cube_cells
+
+    course_codes = list(course_codes)
+    if not course_codes:
+        return
+    lock_courses(cur, course_codes)
+    cur.execute("SELECT course_code, instance_key, data FROM courses WHERE course_code = ANY(%s)", (course_codes,))
+    instances_by_code = {}
+    for course_code, instance_key, data in cur.fetchall():
+        instances_by_code.setdefault(course_code, {})[instance_key] = data
+
+    cur.execute("DELETE FROM analysis_cube WHERE course_code = ANY(%s)", (course_codes,))
+    cell_rows = [
+        (cell["course_code"], cell["period"], cell["instructor_name"], cell["course_name"],
+         cell["instance_count"], json.dumps(cell["option_counts"]))
+        for course_code, instances in instances_by_code.items()
+        for cell in build_cube_cells(instances, course_code)
+    ]
+    if cell_rows:
+        execute_values(
+            cur,
+            """
+            INSERT INTO analysis_cube (course_code, period, instructor_name, course_name, instance_count, option_counts)
+            VALUES %s
+            """,
+            cell_rows
+        )
+
+def update_course_rollups(cur, rows):
+    """
+    Recomputes the course_period_rollups rows of the (course, period) pairs the given instances fall
+    in, inside the caller's transaction and after their sufficient statistics are written. The other
+    periods of their courses are not read. rows is a list of (instance_key, course_code, data) tuples;
+    instances without a period are left out.
+    """
+    from psycopg2.extras import execute_values
+    from .instance_keys import parse_instance_key
+
+    touched_periods = set()
+    for instance_key, course_code, _ in rows:
+        parsed_key = parse_instance_key(instance_key)
+        if parsed_key.period:
+            touched_periods.add((course_code, parsed_key.period, parsed_key.year, parsed_key.season))
+    if not touched_periods:
+        return
+    touched_periods = sorted(touched_periods)
+    template = "(%s, %s, %s::smallint, %s)"
+
+    execute_values(
+        cur,
+        """
+        INSERT INTO course_period_rollups
+            (course_code, department, period, period_order, question, n, total, total_squares, instance_count)
+        SELECT
+            s.course_code,
+            left(s.course_code, 6),
+            t.period,
+            c.period_year * 10 + CASE c.period_season WHEN 'IN' THEN 0 WHEN 'SP' THEN 1 WHEN 'SU' THEN 2 ELSE 3 END,
+            s.question,
+            SUM(s.n),
+            SUM(s.total),
+            SUM(s.total_squares),
+            COUNT(*)
+        FROM (VALUES %s) AS t (course_code, period, period_year, period_season)
+        JOIN courses c
+            ON c.course_code = t.course_code AND c.period_year = t.period_year AND c.period_season = t.period_season
+        JOIN instance_question_stats s ON s.instance_key = c.instance_key
+        GROUP BY 1, 2, 3, 4, 5
+        ON CONFLICT (course_code, period, question) DO UPDATE SET
+            n = EXCLUDED.n,
+            total = EXCLUDED.total,
+            total_squares = EXCLUDED.total_squares,
+            instance_count = EXCLUDED.instance_count
+        """,
+        touched_periods,
+        template=template
+    )
+    # A re-scrape can drop a question (or move an instance out of its period) and leave a stale row
+    execute_values(
+        cur,
+        """
+        DELETE FROM course_period_rollups r
+        USING (VALUES %s) AS t (course_code, period, period_year, period_season)
+        WHERE r.course_code = t.course_code AND r.period = t.period
+            AND NOT EXISTS (
+                SELECT 1
+                FROM courses c
+                JOIN instance_question_stats s ON s.instance_key = c.instance_key AND s.question = r.question
+                WHERE c.course_code = t.course_code AND c.period_year = t.period_year AND c.period_season = t.period_season
+            )
+        """,
+        touched_periods,
+        template=template
+    )
+
+def refresh_course_rollups(cur, course_codes):
+    """
+    Rebuilds the course_period_rollups rows of the given courses from all their instances' sufficient
+    statistics, inside the caller's transaction. Instances without a period are left out. Writes
+    update only the periods they touch (update_course_rollups); this is for backfills and repairs.
+    """
+    course_codes = list(course_codes)
+    if not course_codes:
+        return
+    lock_courses(cur, course_codes)
+    cur.execute("DELETE FROM course_period_rollups WHERE course_code = ANY(%s)", (course_codes,))
+    cur.execute(
+        """
+        INSERT INTO course_period_rollups
+            (course_code, department, period, period_order, question, n, total, total_squares, instance_count)
+        SELECT
+            s.course_code,
+            left(s.course_code, 6),
+            c.period_season || right(c.instance_key, 2),
+            c.period_year * 10 + CASE c.period_season WHEN 'IN' THEN 0 WHEN 'SP' THEN 1 WHEN 'SU' THEN 2 ELSE 3 END,
+            s.question,
+            SUM(s.n),
+            SUM(s.total),
+            SUM(s.total_squares),
+            COUNT(*)
+        FROM instance_question_stats s
+        JOIN courses c ON c.instance_key = s.instance_key
+        WHERE s.course_code = ANY(%s) AND c.period_season IS NOT NULL
+        GROUP BY 1, 2, 3, 4, 5
+        """,
+        (course_codes,)
+    )
+
+def get_course_rollup_sums(question, min_period_order=None, max_period_order=None, departments=None, course_codes=None):
+    """
+    Sums one question's rollups per course over a period range, for the whole catalog or only the
+    given departments (e.g. "EN.601") or courses.
+    Returns {course_code: (n, total, total_squares, instance_count)}.
+    """
+    clauses = ["question = %s"]
+    params = [question]
+    if min_period_order is not None:
+        clauses.append("period_order >= %s")
+        params.append(min_period_order)
+    if max_period_order is not None:
+        clauses.append("period_order <= %s")
+        params.append(max_period_order)
+    if departments:
+        clauses.append("department = ANY(%s)")
+        params.append(list(departments))
+    if course_codes is not None:
+        clauses.append("course_code = ANY(%s)")
+        params.append(list(course_codes))
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"""
+                SELECT course_code, SUM(n), SUM(total), SUM(total_squares), SUM(instance_count)
+                FROM course_period_rollups
+                WHERE {' AND '.join(clauses)}
+                GROUP BY course_code
+                """,
+                params
             )
+            return {row[0]: tuple(int(value) for value in row[1:]) for row in cur.fetchall()}
+
+def get_period_rollup_sums(course_codes):
+    """
+    Sums the course_period_rollups of several courses per period and question, in chronological order.
+    Returns a list of (period, period_order, question, n, total, total_squares, instance_count) tuples.
+    """
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT period, period_order, question, SUM(n), SUM(total), SUM(total_squares), SUM(instance_count)
+                FROM course_period_rollups
+                WHERE course_code = ANY(%s)
+                GROUP BY period, period_order, question
+                ORDER BY period_order, question
+                """,
+                (list(course_codes),)
+            )
+            return [(period, period_order, question, *(int(value) for value in sums))
+                    for period, period_order, question, *sums in cur.fetchall()]
+
+def get_analysis_cube_cells(course_codes):
+    """Fetches the analysis cube cells of several courses in one query; see analysis_cube.rollup_cube."""
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT course_code, period, instructor_name, course_name, instance_count, option_counts
+                FROM analysis_cube
+                WHERE course_code = ANY(%s)
+                """,
+                (list(course_codes),)
+            )
+            return [
+                {
+                    "course_code": course_code,
+                    "period": period,
+                    "instructor_name": instructor_name,
+                    "course_name": course_name,
+                    "instance_count": instance_count,
+                    "option_counts": option_counts,
+                }
+                for course_code, period, instructor_name, course_name, instance_count, option_counts in cur.fetchall()
+            ]
+
+# SIS terms make up a year only once all of its seasons have been synced
+SIS_SEASONS = ("IN", "SP", "SU", "FA")
+
+def get_sis_catalog(course_code):
+    """
+    Fetches the cached SIS catalog entry for a course.
+    Returns {'sections': [...], 'years': {...}, 'covered_years': {...}} or None if SIS has never listed the course.
+    'covered_years' are the years whose every term has been synced for each school that lists the course,
+    so only in those years does a missing listing mean the course did not run.
+    """
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT section, period, school FROM sis_sections WHERE course_code = %s", (course_code,))
+            rows = cur.fetchall()
+            if not rows:
+                return None
+            schools = {row[2] for row in rows}
+            synced_periods_by_school = {school: set() for school in schools}
+            if None not in schools:
+                cur.execute("SELECT school, period FROM sis_catalog_terms WHERE school = ANY(%s)", (list(schools),))
+                for school, period in cur.fetchall():
+                    synced_periods_by_school[school].add(period)
+
+            # Rows without a school can't be matched to synced terms, so they leave no year covered
+            covered_years = None
+            for school, synced_periods in synced_periods_by_school.items():
+                school_years = {
+                    2000 + int(period[-2:]) for period in synced_periods
+                    if school is not None and all(f"{season}{period[-2:]}" in synced_periods for season in SIS_SEASONS)
+                }
+                covered_years = school_years if covered_years is None else covered_years & school_years
+            return {
+                "sections": sorted({row[0] for row in rows}),
+                "years": {2000 + int(row[1][-2:]) for row in rows},
+                "covered_years": covered_years or set()
+            }
+
+def get_known_course_codes_db():
+    """Returns every course code that has stored evaluations or appears in the SIS catalog."""
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT DISTINCT course_code FROM courses
+                UNION
+                SELECT DISTINCT course_code FROM sis_sections;
+            """)
+            return [row[0] for row in cur.fetchall()]
+
+def get_sis_coverage_db():
+    """
+    Reads which schools list each department in the SIS catalog and which periods have been synced
+    for each school.
+    Returns ({department: {school, ...}}, {school: {period, ...}}), with departments like "EN.601".
+    """
+    schools_by_department = {}
+    periods_by_school = {}
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT DISTINCT left(course_code, 6), school FROM sis_sections")
+            for department, school in cur.fetchall():
+                schools_by_department.setdefault(department, set()).add(school)
+            cur.execute("SELECT school, period FROM sis_catalog_terms")
+            for school, period in cur.fetchall():
+                periods_by_school.setdefault(school, set()).add(period)
+    return schools_by_department, periods_by_school
+
+def get_catalog_version():
+    """
+    Returns a cheap version stamp for the whole dataset: the latest metadata update and the course count.
+    Every scrape updates its course's metadata row, so this changes whenever searchable data changes.
+    """
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT MAX(updated_at), COUNT(*) FROM course_metadata")
+            return cur.fetchone()
 
 def find_courses_by_name_db(search_query):
     """Finds course codes by searching for a query in the course names within the JSONB data."""
@@ -89,7 +698,7 @@ def find_courses_by_name_db(search_query):
 def find_courses_by_name_with_details_db(search_query, limit=None, offset=None):
     """Finds course codes and names by searching for a query in the course names within the JSONB data.
     Deduplicates by course code, applies course groupings, and returns the most recent course name for each group."""
-    from .course_grouping_service import CourseGroupingService
+    from .course_grouping_service import get_grouping_service
 
     with get_db_connection() as conn:
         with conn.cursor() as cur:
@@ -114,8 +723,7 @@ def find_courses_by_name_with_details_db(search_query, limit=None, offset=None):
             cur.execute(query, ('%' + search_query + '%',))
             rows = cur.fetchall()
 
-            # Create course grouping service
-            grouping_service = CourseGroupingService()
+            grouping_service = get_grouping_service()
 
             # Group courses and find the most recent name for each group
             processed_groups = set()
@@ -193,7 +801,7 @@ def find_courses_by_name_with_details_db(search_query, limit=None, offset=None):
 
 def count_courses_by_name_db(search_query):
     """Counts the total number of unique course groups matching a search query."""
-    from .course_grouping_service import CourseGroupingService
+    from .course_grouping_service import get_grouping_service
 
     with get_db_connection() as conn:
         with conn.cursor() as cur:
@@ -208,7 +816,7 @@ def count_courses_by_name_db(search_query):
             course_codes = [row[0] for row in rows]
 
             # Group courses and count unique groups
-            grouping_service = CourseGroupingService()
+            grouping_service = get_grouping_service()
             processed_groups = set()
             group_count = 0
 
@@ -230,6 +838,24 @@ def get_last_name(full_name: str) -> str:
         return ""
     return full_name.strip().split()[-1].lower()
 
+# Set once every stored instance is linked to an instructor; writes keep it true from then on
+_instructor_variants_complete = False
+
+def are_instructor_variants_complete(cur):
+    """
+    Whether instructor_name_variants lists every spelling in the data, i.e. no stored instance with an
+    instructor name is unlinked. Databases with instances from before the instructor tables only get
+    there once one-time-scripts/backfill_instructors.py has run. The check is answered by the partial
+    index idx_courses_unlinked_instructor and is skipped once it has passed.
+    """
+    global _instructor_variants_complete
+    if not _instructor_variants_complete:
+        cur.execute(
+            "SELECT NOT EXISTS (SELECT 1 FROM courses WHERE instructor_id IS NULL AND instructor_name ~ '[[:alpha:]]')"
+        )
+        _instructor_variants_complete = cur.fetchone()[0]
+    return _instructor_variants_complete
+
 def find_instructor_variants_db(instructor_name):
     """
     Finds variations of an instructor's name from the database based on last name.
@@ -240,15 +866,87 @@ def find_instructor_variants_db(instructor_name):
 
     with get_db_connection() as conn:
         with conn.cursor() as cur:
-            # This query finds all unique instructor names where the last part of the name matches.
-            # It's a simplified way to match by last name.
-            query = """
-                SELECT DISTINCT data->>'instructor_name'
-                FROM courses
-                WHERE lower(split_part(data->>'instructor_name', ' ', -1)) = %s;
-            """
-            cur.execute(query, (target_last_name,))
+            if are_instructor_variants_complete(cur):
+                # Every spelling seen in the data is indexed by its last name when instances are written
+                cur.execute("SELECT name FROM instructor_name_variants WHERE last_name = %s", (target_last_name,))
+            else:
+                # Until the instructor backfill has run, the variants table misses older spellings
+                cur.execute(
+                    """
+                    SELECT DISTINCT data->>'instructor_name'
+                    FROM courses
+                    WHERE lower(split_part(data->>'instructor_name', ' ', -1)) = %s;
+                    """,
+                    (target_last_name,)
+                )
             rows = cur.fetchall()
             variants = {row[0] for row in rows}
             variants.add(instructor_name) # Ensure the original name is included
             return sorted(list(variants))
+
+def find_instructors_db(instructor_name):
+    """
+    Finds canonical instructors with a name variant that shares the given name's last name.
+    Returns a list of {'instructor_id', 'name', 'variants'} dicts.
+    """
+    target_last_name = get_last_name(instructor_name)
+    if not target_last_name:
+        return []
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT i.instructor_id, i.display_name, array_agg(all_variants.name ORDER BY all_variants.name)
+                FROM instructors i
+                JOIN instructor_name_variants all_variants ON all_variants.instructor_id = i.instructor_id
+                WHERE i.instructor_id IN (
+                    SELECT instructor_id FROM instructor_name_variants WHERE last_name = %s
+                )
+                GROUP BY i.instructor_id, i.display_name
+                ORDER BY i.display_name
+                """,
+                (target_last_name,)
+            )
+            return [
+                {"instructor_id": instructor_id, "name": name, "variants": variants}
+                for instructor_id, name, variants in cur.fetchall()
+            ]
+
+def get_instructor_data_db(instructor_id):
+    """
+    Loads an instructor, their name variants, their instances and the per-course, per-question sums
+    of their instances' sufficient statistics, through the instructor_id index.
+    Returns None if there is no such instructor.
+    """
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT display_name FROM instructors WHERE instructor_id = %s", (instructor_id,))
+            row = cur.fetchone()
+            if not row:
+                return None
+            cur.execute("SELECT name FROM instructor_name_variants WHERE instructor_id = %s ORDER BY name", (instructor_id,))
+            variants = [variant_row[0] for variant_row in cur.fetchall()]
+            cur.execute(
+                """
+                SELECT c.course_code, s.question, SUM(s.n), SUM(s.total), SUM(s.total_squares)
+                FROM courses c
+                JOIN instance_question_stats s ON s.instance_key = c.instance_key
+                WHERE c.instructor_id = %s
+                GROUP BY c.course_code, s.question
+                """,
+                (instructor_id,)
+            )
+            sums = [(course_code, question, int(n), int(total), int(total_squares))
+                    for course_code, question, n, total, total_squares in cur.fetchall()]
+            cur.execute(
+                "SELECT course_code, instance_key, data->>'course_name' FROM courses WHERE instructor_id = %s",
+                (instructor_id,)
+            )
+            instances = cur.fetchall()
+    return {
+        "instructor_id": instructor_id,
+        "name": row[0],
+        "variants": variants,
+        "sums": sums,
+        "instances": instances,
+    }
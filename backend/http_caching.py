@@ -0,0 +1,33 @@
+import json
+import hashlib
+from flask import Response, request
+
+# Suffixes compress_response appends to a strong ETag for each content encoding
+ENCODING_ETAG_SUFFIXES = ('', '-gzip', '-br')
+
+
+def make_etag(*parts) -> str:
+    """Builds a strong ETag from any JSON-serializable parts (dates are serialized as strings)."""
+    digest = hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+
+def is_not_modified(etag: str) -> bool:
+    """Checks the request's If-None-Match header against an ETag and its compressed variants."""
+    if_none_match = request.if_none_match
+    if not if_none_match:
+        return False
+    return any(if_none_match.contains(etag + suffix) for suffix in ENCODING_ETAG_SUFFIXES)
+
+
+def not_modified_response(etag: str, cache_control: str) -> Response:
+    """Builds an empty 304 response carrying the validator and caching policy."""
+    response = Response(status=304)
+    return with_cache_headers(response, etag, cache_control)
+
+
+def with_cache_headers(response: Response, etag: str, cache_control: str) -> Response:
+    """Adds a strong ETag and Cache-Control header to a response."""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    return response
@@ -0,0 +1,67 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+# Matches the optional two-digit section and the period at the end of an instance key, e.g. ".01.FA17"
+SECTION_AND_PERIOD_RE = re.compile(r'(?:\.(\d{2}))?\.(FA|SP|SU|IN)(\d{2})$')
+COURSE_CODE_RE = re.compile(r'[A-Z]{2}\.\d{3}\.\d{3}')
+
+SEASON_ORDER = {'IN': 0, 'SP': 1, 'SU': 2, 'FA': 3}
+SEASON_NAMES = {'FA': 'Fall', 'SP': 'Spring', 'SU': 'Summer', 'IN': 'Intersession'}
+
+# Parsed keys are small tuples, so even a fully used cache stays around a few MB
+PARSE_CACHE_SIZE = 65536
+
+
+class InstanceKey(NamedTuple):
+    """
+    A parsed instance key such as "EN.601.475.01.FA17". Grouped keys prefixed with a member course
+    (e.g. "EN.601.675_EN.601.675.01.FA17") parse the same way. Any part missing from the key is None.
+    """
+    course_code: str
+    section: str
+    season: str
+    year_short: int
+
+    @property
+    def year(self) -> int:
+        """The four-digit year, e.g. 2017."""
+        return 2000 + self.year_short if self.season else None
+
+    @property
+    def period(self) -> str:
+        """The period string, e.g. "FA17"."""
+        return f"{self.season}{self.year_short:02d}" if self.season else None
+
+    @property
+    def season_name(self) -> str:
+        """The season's display name (e.g. "Fall"), as used by analysis filters."""
+        return SEASON_NAMES.get(self.season)
+
+    @property
+    def period_order(self) -> int:
+        """year * 10 + season order (e.g. 20173 for FA17), a single sortable number for the period."""
+        return self.year * 10 + SEASON_ORDER[self.season] if self.season else None
+
+    @property
+    def sort_key(self) -> tuple:
+        """(year, season order) for chronological sorting, or (0, 0) for keys without a period."""
+        return (self.year, SEASON_ORDER[self.season]) if self.season else (0, 0)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_instance_key(instance_key: str) -> InstanceKey:
+    """Parses an instance key once; repeated calls for the same key are served from a cache."""
+    code_match = COURSE_CODE_RE.match(instance_key)
+    period_match = SECTION_AND_PERIOD_RE.search(instance_key)
+    if period_match:
+        section, season, year_short = period_match.groups()
+        year_short = int(year_short)
+    else:
+        section = season = year_short = None
+    return InstanceKey(code_match.group(0) if code_match else None, section, season, year_short)
+
+
+def parse_period(period: str) -> InstanceKey:
+    """Parses a bare period such as "FA17"; the course code and section of the result are None."""
+    return parse_instance_key(f".{period}") if period else InstanceKey(None, None, None, None)
@@ -0,0 +1,63 @@
+from .analysis import calculate_statistics_from_sums, format_periods, get_backend_stat_keys, get_stats_to_calculate
+from .db_utils import get_instructor_data_db
+from .instance_keys import parse_instance_key
+
+
+def get_statistics_by_stat(sums_by_question: dict) -> dict:
+    """Calculates mean, std and n per question, keyed by the frontend stat keys /api/analyze uses."""
+    _, statkey_reverse_map = get_backend_stat_keys(get_stats_to_calculate({}))
+    return {
+        statkey_reverse_map.get(question, question): statistics
+        for question, statistics in calculate_statistics_from_sums(sums_by_question).items()
+    }
+
+
+def get_instructor_profile(instructor_id: int):
+    """
+    Aggregates one canonical instructor's evaluations across every course they taught, from the
+    stored sufficient statistics of their instances.
+
+    Returns:
+        dict: The instructor's name, name variants, overall stats and per-course stats, periods and
+              latest course name, with courses ordered by their most recent period. None if there is
+              no such instructor.
+    """
+    instructor_data = get_instructor_data_db(instructor_id)
+    if instructor_data is None:
+        return None
+
+    overall_sums = {}
+    sums_by_course = {}
+    for course_code, question, n, total, total_squares in instructor_data["sums"]:
+        course_sums = sums_by_course.setdefault(course_code, {})
+        course_sums[question] = (n, total, total_squares)
+        overall = overall_sums.get(question, (0, 0, 0))
+        overall_sums[question] = (overall[0] + n, overall[1] + total, overall[2] + total_squares)
+
+    courses = {}
+    latest_period_by_course = {}
+    for course_code, instance_key, course_name in instructor_data["instances"]:
+        parsed_key = parse_instance_key(instance_key)
+        course = courses.setdefault(course_code, {"course_code": course_code, "course_name": None,
+                                                  "instances": 0, "periods": []})
+        course["instances"] += 1
+        course["periods"].append(parsed_key.period)
+        if parsed_key.sort_key >= latest_period_by_course.get(course_code, (0, 0)):
+            latest_period_by_course[course_code] = parsed_key.sort_key
+            course["course_name"] = course_name or course["course_name"]
+
+    course_list = []
+    for course_code in sorted(courses, key=lambda code: (latest_period_by_course[code], code), reverse=True):
+        course = courses[course_code]
+        course["periods"] = format_periods(course["periods"])
+        course["stats"] = get_statistics_by_stat(sums_by_course.get(course["course_code"], {}))
+        course_list.append(course)
+
+    return {
+        "instructor_id": instructor_data["instructor_id"],
+        "name": instructor_data["name"],
+        "variants": instructor_data["variants"],
+        "instances": sum(course["instances"] for course in course_list),
+        "stats": get_statistics_by_stat(overall_sums),
+        "courses": course_list,
+    }
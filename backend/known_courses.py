@@ -0,0 +1,124 @@
+import os
+import time
+import threading
+from .db_utils import get_known_course_codes_db, get_sis_coverage_db
+from .config import KNOWN_COURSES_REFRESH_SECONDS, EARLIEST_REPORT_YEAR
+from .instance_keys import parse_period
+from .period_logic import get_current_period
+
+# Flat list of every AS/EN course code written by one-time-scripts/get_all_courses.py.
+# It is not deployed to Vercel, where the database sources are used on their own.
+KNOWN_COURSES_FILE = os.path.join(os.path.dirname(__file__), '..', 'one-time-scripts', 'jhu_as_en_courses.txt')
+
+# How long to wait before retrying after a failed rebuild
+REBUILD_RETRY_SECONDS = 60
+
+
+def get_covered_departments(schools_by_department: dict, periods_by_school: dict, current_period: str) -> set:
+    """
+    Returns the departments (e.g. "EN.601") for which a missing SIS listing means the course never ran:
+    every school listing the department has synced every term from EARLIEST_REPORT_YEAR through the
+    current period, without gaps. Schools whose sync failed for a term, or that were never synced,
+    leave their departments uncovered.
+    """
+    current_order = parse_period(current_period).period_order
+    covered_schools = set()
+    for school, periods in periods_by_school.items():
+        synced_orders = {parse_period(period).period_order for period in periods} - {None}
+        if not synced_orders or min(synced_orders) // 10 > EARLIEST_REPORT_YEAR:
+            continue
+        first_order = min(synced_orders)
+        expected_orders = {
+            year * 10 + season_order
+            for year in range(first_order // 10, current_order // 10 + 1)
+            for season_order in range(4)
+            if first_order <= year * 10 + season_order <= current_order
+        }
+        if expected_orders <= synced_orders:
+            covered_schools.add(school)
+    return {
+        department for department, schools in schools_by_department.items()
+        if None not in schools and schools <= covered_schools
+    }
+
+
+class KnownCourseFilter:
+    """
+    In-memory set of course codes that are known to exist, used to reject well-formed but
+    nonexistent codes before any session or listing request is made.
+
+    The set is built from the SIS catalog, the courses already stored in the database and
+    jhu_as_en_courses.txt. It is built on a background thread the first time it is needed and
+    rebuilt periodically, so startup stays cheap and requests never wait on it. A code is only
+    rejected when its department is fully covered by the synced SIS catalog (see
+    get_covered_departments); until the filter is loaded, and for every other department,
+    is_known returns None meaning "can't tell".
+    """
+
+    def __init__(self, refresh_seconds: int = KNOWN_COURSES_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        # (codes, covered departments) swapped in as one tuple so readers never see a half-built filter
+        self._state = None
+        self._loaded_at = 0.0
+        self._last_attempt = 0.0
+        self._building = False
+        self._lock = threading.Lock()
+        # Codes found by an explicit recheck since the last rebuild, trusted over the loaded set
+        self._found_codes = set()
+
+    def is_known(self, course_code: str):
+        """Returns True/False if the filter can tell whether course_code exists, None otherwise."""
+        self._maybe_rebuild()
+        state = self._state
+        if state is None:
+            return None
+        codes, covered_departments = state
+        if course_code[:6] not in covered_departments:
+            return None
+        return course_code in codes or course_code in self._found_codes
+
+    def mark_found(self, course_code: str):
+        """Records a course that a scrape found evaluations for, so it is never rejected."""
+        self._found_codes.add(course_code)
+
+    def _maybe_rebuild(self):
+        now = time.time()
+        if self._state is not None and now - self._loaded_at < self.refresh_seconds:
+            return
+        if now - self._last_attempt < REBUILD_RETRY_SECONDS:
+            return
+        with self._lock:
+            if self._building:
+                return
+            self._building = True
+            self._last_attempt = now
+        threading.Thread(target=self._rebuild, daemon=True).start()
+
+    def _rebuild(self):
+        try:
+            codes = set(get_known_course_codes_db())
+            try:
+                with open(KNOWN_COURSES_FILE, 'r') as f:
+                    codes.update(line.strip() for line in f if line.strip())
+            except FileNotFoundError:
+                pass
+            covered_departments = get_covered_departments(*get_sis_coverage_db(), get_current_period())
+            self._state = (frozenset(codes), frozenset(covered_departments))
+            self._loaded_at = time.time()
+            print(f"Known course filter loaded with {len(codes)} course codes, "
+                  f"{len(covered_departments)} fully synced departments.")
+        except Exception as e:
+            print(f"Warning: Could not build known course filter: {e}")
+        finally:
+            self._building = False
+
+
+known_course_filter = KnownCourseFilter()
+
+def is_known_course(course_code: str):
+    """Returns False only when the course code is known not to exist."""
+    return known_course_filter.is_known(course_code)
+
+def mark_course_found(course_code: str):
+    """Stops the known course filter from rejecting a course that turned out to have evaluations."""
+    known_course_filter.mark_found(course_code)
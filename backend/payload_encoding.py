@@ -0,0 +1,129 @@
+"""
+Compact columnar encoding for the raw_data.instances payload returned by /api/analyze.
+
+The default payload is a dict of full instance dicts, so every instance repeats the same field
+names and option labels ("Excellent", "Somewhat heavier", ...). The columnar format stores one
+column per field, every string once in a shared dictionary, and frequency questions as integer
+count arrays aligned to a per-column option list:
+
+    {
+        "format": "columnar",
+        "version": 1,
+        "keys": ["EN.601.475.01.FA17", ...],
+        "strings": ["Excellent", "Good", "Jane Doe", ...],
+        "columns": {
+            "instructor_name": {"type": "string", "values": [2, ...]},
+            "ta_names": {"type": "string_list", "values": [[5, 6], ...]},
+            "overall_quality_frequency": {"type": "frequency", "options": [0, 1, ...], "counts": [[20, 10, ...], ...]},
+            ...
+        }
+    }
+
+Instances that lack a field hold null in that column (raw columns list them under "missing"),
+and a frequency dict that lacks one of the column's options holds null at that position, so
+decoding gives back exactly the original dicts.
+"""
+
+COLUMNAR_FORMAT = "columnar"
+COLUMNAR_VERSION = 1
+
+
+def _column_type(value):
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, dict) and all(isinstance(count, int) and not isinstance(count, bool) for count in value.values()):
+        return "frequency"
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return "string_list"
+    return "raw"
+
+
+def encode_instances_columnar(instances: dict) -> dict:
+    """
+    Encodes a dict of instance key -> instance dict into the versioned columnar format.
+    """
+    keys = list(instances.keys())
+    strings = []
+    string_index = {}
+
+    def intern(text):
+        index = string_index.get(text)
+        if index is None:
+            index = string_index[text] = len(strings)
+            strings.append(text)
+        return index
+
+    # A field gets a specific column type only if every instance that has it agrees on that type
+    field_types = {}
+    for instance in instances.values():
+        for field, value in instance.items():
+            value_type = _column_type(value)
+            if field_types.setdefault(field, value_type) != value_type:
+                field_types[field] = "raw"
+
+    columns = {}
+    for field, column_type in field_types.items():
+        values = [instance.get(field) for instance in instances.values()]
+        if column_type == "string":
+            columns[field] = {"type": column_type, "values": [None if v is None else intern(v) for v in values]}
+        elif column_type == "string_list":
+            columns[field] = {"type": column_type, "values": [None if v is None else [intern(item) for item in v] for v in values]}
+        elif column_type == "frequency":
+            options = []
+            for value in values:
+                for option in value or ():
+                    if option not in options:
+                        options.append(option)
+            counts = [
+                None if value is None else [value.get(option) for option in options]
+                for value in values
+            ]
+            columns[field] = {"type": column_type, "options": [intern(option) for option in options], "counts": counts}
+        else:
+            # Raw values may themselves be null, so absent fields are listed explicitly
+            missing = [i for i, instance in enumerate(instances.values()) if field not in instance]
+            columns[field] = {"type": "raw", "values": values}
+            if missing:
+                columns[field]["missing"] = missing
+
+    return {
+        "format": COLUMNAR_FORMAT,
+        "version": COLUMNAR_VERSION,
+        "keys": keys,
+        "strings": strings,
+        "columns": columns
+    }
+
+
+def decode_instances_columnar(payload: dict) -> dict:
+    """
+    Decodes a columnar payload back into a dict of instance key -> instance dict.
+    """
+    if payload.get("format") != COLUMNAR_FORMAT or payload.get("version") != COLUMNAR_VERSION:
+        raise ValueError(f"Unsupported payload format: {payload.get('format')} v{payload.get('version')}")
+
+    strings = payload["strings"]
+    instances = [{} for _ in payload["keys"]]
+
+    for field, column in payload["columns"].items():
+        column_type = column["type"]
+        if column_type == "frequency":
+            options = [strings[index] for index in column["options"]]
+            for instance, counts in zip(instances, column["counts"]):
+                if counts is not None:
+                    instance[field] = {option: count for option, count in zip(options, counts) if count is not None}
+        elif column_type == "raw":
+            missing = set(column.get("missing", ()))
+            for i, (instance, value) in enumerate(zip(instances, column["values"])):
+                if i not in missing:
+                    instance[field] = value
+        else:
+            for instance, value in zip(instances, column["values"]):
+                if value is None:
+                    continue
+                if column_type == "string":
+                    instance[field] = strings[value]
+                else:
+                    instance[field] = [strings[index] for index in value]
+
+    return dict(zip(payload["keys"], instances))
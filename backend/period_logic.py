@@ -1,6 +1,5 @@
-import re
 from datetime import date
-from dateutil.relativedelta import relativedelta
+from .instance_keys import parse_instance_key
 from .config import PERIOD_RELEASE_DATES, PERIOD_GRACE_MONTHS
 
 def find_oldest_year_from_keys(keys: list) -> int:
@@ -12,12 +11,9 @@ def find_oldest_year_from_keys(keys: list) -> int:
     oldest_year = date.today().year
     found_year = False
     
-    year_re = re.compile(r'\.(?:FA|SP|SU|IN)(\d{2})$')
-    
     for key in keys:
-        match = year_re.search(key)
-        if match:
-            year_short = int(match.group(1))
+        year_short = parse_instance_key(key).year_short
+        if year_short is not None:
             # Convert 2-digit year to 4-digit year
             year = 2000 + year_short if year_short < 70 else 1900 + year_short
             if year < oldest_year:
@@ -36,12 +32,9 @@ def find_latest_year_from_keys(keys: list) -> int:
     latest_year = 0
     found_year = False
     
-    year_re = re.compile(r'\.(?:FA|SP|SU|IN)(\d{2})$')
-    
     for key in keys:
-        match = year_re.search(key)
-        if match:
-            year_short = int(match.group(1))
+        year_short = parse_instance_key(key).year_short
+        if year_short is not None:
             # Convert 2-digit year to 4-digit year
             year = 2000 + year_short if year_short < 70 else 1900 + year_short
             if year > latest_year:
@@ -56,13 +49,32 @@ def get_period_from_instance_key(instance_key: str) -> str:
     Extracts the period string (e.g., 'FA15') from a full course instance key.
     Example: "EN.601.475.01.FA17" -> "FA17"
     """
-    # This regex looks for a period separator, followed by a term code (FA, SP, etc.)
-    # and a two-digit year at the end of the string.
-    match = re.search(r'\.((?:FA|SP|SU|IN)\d{2})$', instance_key)
-    if match:
-        # group(1) will capture the content inside the outer parentheses, e.g., "FA17"
-        return match.group(1)
-    return None
+    return parse_instance_key(instance_key).period
+
+def get_section_from_instance_key(instance_key: str) -> str:
+    """
+    Extracts the two-digit section (e.g., '01') from a full course instance key.
+    Example: "EN.601.475.01.FA17" -> "01"
+    """
+    return parse_instance_key(instance_key).section
+
+def get_course_code_from_instance_key(instance_key: str) -> str:
+    """
+    Extracts the base course code from a full course instance key.
+    Example: "EN.601.475.01.FA17" -> "EN.601.475"
+    """
+    return parse_instance_key(instance_key).course_code
+
+def get_period_from_sis_term(term: str) -> str:
+    """
+    Converts a SIS term name to a period string.
+    Example: "Fall 2025" -> "FA25", "Intersession 2024" -> "IN24"
+    """
+    prefixes = {"Fall": "FA", "Spring": "SP", "Summer": "SU", "Intersession": "IN"}
+    parts = term.split() if term else []
+    if len(parts) != 2 or parts[0] not in prefixes or not parts[1].isdigit():
+        return None
+    return f"{prefixes[parts[0]]}{int(parts[1]) % 100:02d}"
 
 def get_year_from_period_string(period_string: str) -> int:
     """
@@ -102,6 +114,21 @@ def get_current_period() -> str:
         # If before the first period release of the year, it's the last period of the previous year
         return f"FA{year_short - 1}"
 
+def get_next_release_date() -> date:
+    """
+    Determines the next date on which a period's evaluations are released, based on today's date.
+
+    Returns:
+        date: The first release date strictly after today.
+    """
+    today = date.today()
+    release_dates = sorted(
+        date(year, month, day)
+        for year in (today.year, today.year + 1)
+        for month, day in PERIOD_RELEASE_DATES.values()
+    )
+    return next(release_date for release_date in release_dates if release_date > today)
+
 def is_course_up_to_date(last_period_gathered: str, course_metadata: dict, skip_grace_period_logic=False) -> bool:
     """
     Checks if the course data is up-to-date.
@@ -140,6 +167,7 @@ def is_grace_period_over(period: str) -> bool:
     release_date = date(year, release_month, release_day)
 
     grace_months = PERIOD_GRACE_MONTHS[period_prefix]
+    from dateutil.relativedelta import relativedelta
     grace_period_end = release_date + relativedelta(months=grace_months)
 
     return today > grace_period_end
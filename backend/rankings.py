@@ -0,0 +1,125 @@
+import heapq
+from .analysis import STAT_MAPPINGS, get_backend_stat_keys, moments_to_statistics
+from .course_grouping_service import get_grouping_service
+from .db_utils import get_course_rollup_sums
+from .instance_keys import parse_period
+
+RANKING_SORT_KEYS = ('mean', 'n')
+
+
+def get_period_order(period: str):
+    """Turns a period such as "FA17" into its course_period_rollups.period_order, or None if it is invalid."""
+    return parse_period(period).period_order
+
+
+def get_question_key(stat: str):
+    """Maps a frontend stat key (e.g. "overall_quality") to its frequency question, or None if it has no values."""
+    backend_keys, _ = get_backend_stat_keys([stat])
+    question = backend_keys[0]
+    return question if STAT_MAPPINGS.get(question, (None, None))[1] else None
+
+
+def get_group_members(grouping_service, course_code: str) -> tuple:
+    """The sorted members of a course's group as /api/analyze combines them: an explicit group wins over its department pattern."""
+    group_info = grouping_service.get_group_info(course_code)
+    return tuple(sorted(set([course_code] + group_info.get("courses", []))))
+
+
+def rank_course_groups(sums_by_code: dict, sort_by: str = 'n', limit: int = 10, min_n: int = 0,
+                       departments=None, course_codes=None) -> list:
+    """
+    Ranks course groups by the mean or the number of responses to one question. Each course is
+    ranked together with the courses /api/analyze groups it with, and groups are listed once.
+    Groups can overlap (a course in an explicit group can also match another course's department
+    pattern), so each course's responses only count in its own group, and only the members counted
+    are listed.
+
+    Args:
+        sums_by_code (dict): {course_code: (n, total, total_squares, instance_count)}, as returned by
+            db_utils.get_course_rollup_sums.
+        sort_by (str): 'mean' or 'n'.
+        limit (int): How many groups to return.
+        min_n (int): Groups with fewer responses are left out.
+        departments (iterable, optional): Only groups with a member in one of these departments are ranked.
+        course_codes (iterable, optional): The courses whose groups are ranked. Defaults to every
+            course in sums_by_code; other courses then only contribute as group members.
+
+    Returns:
+        list: Ranked entries with course_code (the first member with data), grouped_courses, mean,
+              std, n and instances. Ties are broken by n (or mean), then by course code.
+    """
+    grouping_service = get_grouping_service()
+    departments = set(departments) if departments else None
+    groups_by_code = {}
+
+    def get_group(course_code):
+        if course_code not in groups_by_code:
+            groups_by_code[course_code] = get_group_members(grouping_service, course_code)
+        return groups_by_code[course_code]
+
+    seen_groups = set()
+    group_sums = {}
+    for course_code in (sums_by_code if course_codes is None else course_codes):
+        group = get_group(course_code)
+        if group in seen_groups:
+            continue
+        seen_groups.add(group)
+        members = tuple(member for member in group if get_group(member) == group)
+        if departments and not any(member[:6] in departments for member in members):
+            continue
+        if len(members) == 1:
+            group_sums[members] = sums_by_code[course_code]
+            continue
+        n = total = total_squares = instances = 0
+        for member in members:
+            member_sums = sums_by_code.get(member)
+            if member_sums:
+                n += member_sums[0]
+                total += member_sums[1]
+                total_squares += member_sums[2]
+                instances += member_sums[3]
+        group_sums[members] = (n, total, total_squares, instances)
+
+    # Only the top groups are shaped into entries; the rest are compared on their raw sums
+    candidates = ((members, sums) for members, sums in group_sums.items() if sums[0] and sums[0] >= min_n)
+    if sort_by == 'mean':
+        top = heapq.nsmallest(limit, candidates, key=lambda item: (-item[1][1] / item[1][0], -item[1][0], item[0]))
+    else:
+        top = heapq.nsmallest(limit, candidates, key=lambda item: (-item[1][0], -item[1][1] / item[1][0], item[0]))
+
+    rankings = []
+    for rank, (members, (n, total, total_squares, instances)) in enumerate(top, start=1):
+        rankings.append({
+            "rank": rank,
+            "course_code": next(member for member in members if member in sums_by_code),
+            "grouped_courses": list(members) if len(members) > 1 else [],
+            **moments_to_statistics(n, total, total_squares),
+            "instances": instances,
+        })
+    return rankings
+
+
+def compute_course_rankings(question: str, sort_by: str, limit: int, min_n: int, departments=None,
+                            min_period: str = None, max_period: str = None) -> list:
+    """
+    Ranks course groups across the catalog (or some departments) from course_period_rollups, without
+    reading instance rows. Periods are inclusive bounds such as "FA17".
+    """
+    min_order = get_period_order(min_period) if min_period else None
+    max_order = get_period_order(max_period) if max_period else None
+    sums_by_code = get_course_rollup_sums(question, min_order, max_order, departments)
+    ranked_codes = list(sums_by_code)
+
+    if departments:
+        # Groups that cross departments also need their members from other departments
+        grouping_service = get_grouping_service()
+        missing_codes = {
+            member
+            for course_code in sums_by_code
+            for member in get_group_members(grouping_service, course_code)
+            if member[:6] not in departments
+        }
+        if missing_codes:
+            sums_by_code.update(get_course_rollup_sums(question, min_order, max_order, course_codes=missing_codes))
+
+    return rank_course_groups(sums_by_code, sort_by, limit, min_n, departments, ranked_codes)
@@ -0,0 +1,102 @@
+import time
+import threading
+from collections import OrderedDict
+from .config import ANALYZE_CACHE_MAX_BYTES, ANALYZE_CACHE_TTL_SECONDS
+
+
+class ResponseCache:
+    """
+    A thread-safe LRU cache of serialized response bodies, bounded by total body size and entry age.
+
+    Entries are keyed by their validator (see http_caching.make_etag), which already changes whenever
+    a member course's data or metadata changes, so an outdated entry can never be served; it just
+    ages out. Entries are also tagged with their course codes so a scrape in this process can drop
+    them right away.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: int):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (body, course_codes, expires_at)
+        self._keys_by_course = {}
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: str):
+        """Returns the cached body for a key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            body, _, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key: str, body: bytes, course_codes=(), ttl_seconds: int = None):
+        """Stores a body, evicting the least recently used entries to stay within the size budget."""
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (body, tuple(course_codes), time.monotonic() + (ttl_seconds or self.ttl_seconds))
+            self.current_bytes += len(body)
+            for course_code in course_codes:
+                self._keys_by_course.setdefault(course_code, set()).add(key)
+            while self.current_bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def invalidate_course(self, course_code: str):
+        """Drops every entry that includes a course, e.g. after it was scraped."""
+        with self._lock:
+            for key in list(self._keys_by_course.get(course_code, ())):
+                self._remove(key)
+                self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, key: str):
+        body, course_codes, _ = self._entries.pop(key)
+        self.current_bytes -= len(body)
+        for course_code in course_codes:
+            keys = self._keys_by_course.get(course_code)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_course[course_code]
+
+
+# Assembled /api/analyze responses, shared by all requests in this process
+analyze_response_cache = ResponseCache(ANALYZE_CACHE_MAX_BYTES, ANALYZE_CACHE_TTL_SECONDS)
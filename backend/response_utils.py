@@ -0,0 +1,96 @@
+import json
+import gzip
+from flask import Response
+from .config import COMPRESSION_MIN_BYTES, GZIP_COMPRESSION_LEVEL, BROTLI_QUALITY
+
+# Optional fast serializer and compressor. The stdlib json encoder and gzip are used when they are missing.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/html', 'text/plain', 'text/css', 'application/javascript'}
+
+
+def dumps_json(payload) -> bytes:
+    """
+    Serializes a payload to JSON bytes with orjson when available, falling back to the stdlib encoder.
+    Keys are sorted like Flask's jsonify, since the frontend iterates instances in response order.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS)
+        except TypeError:
+            # orjson rejects some types the stdlib handles (e.g. integers above 64 bits)
+            pass
+    return json.dumps(payload, separators=(',', ':'), sort_keys=True, default=str).encode('utf-8')
+
+
+def loads_json(body: bytes):
+    """Parses JSON bytes with orjson when available, falling back to the stdlib decoder."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def json_response(payload, status: int = 200) -> Response:
+    """Drop-in replacement for jsonify that uses the fast serializer."""
+    return Response(dumps_json(payload), status=status, mimetype='application/json')
+
+
+def choose_content_encoding(accept_encoding: str) -> str:
+    """Picks 'br' or 'gzip' from an Accept-Encoding header, or None if neither is acceptable."""
+    accepted = {}
+    for part in (accept_encoding or '').split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+    if brotli is not None and accepted.get('br', 0) > 0:
+        return 'br'
+    if accepted.get('gzip', 0) > 0:
+        return 'gzip'
+    return None
+
+
+def compress_response(response: Response, accept_encoding: str) -> Response:
+    """
+    Compresses a successful response body with brotli or gzip, as negotiated with the client,
+    if it is a compressible type and at least COMPRESSION_MIN_BYTES long.
+    """
+    if (response.direct_passthrough
+            or not 200 <= response.status_code < 300
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    data = response.get_data()
+    if len(data) < COMPRESSION_MIN_BYTES:
+        return response
+
+    encoding = choose_content_encoding(accept_encoding)
+    if encoding == 'br':
+        response.set_data(brotli.compress(data, quality=BROTLI_QUALITY))
+    elif encoding == 'gzip':
+        response.set_data(gzip.compress(data, compresslevel=GZIP_COMPRESSION_LEVEL))
+    else:
+        return response
+    response.headers['Content-Encoding'] = encoding
+
+    # Each encoding is a different representation, so a strong ETag gets a per-encoding suffix
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f"{etag}-{encoding}")
+    return response
@@ -1,18 +1,22 @@
-import requests
-from datetime import date
-from .course_grouping_service import CourseGroupingService
-from dateutil.relativedelta import relativedelta
-from .workflow_helpers import scrape_course_data_core
+from datetime import date, datetime
+from concurrent.futures import ThreadPoolExecutor
 from .db_utils import (
     get_course_metadata,
+    get_course_metadata_bulk,
     get_course_data_by_keys,
+    get_course_data_by_keys_grouped,
     update_course_metadata,
     find_courses_by_name_db,
     find_courses_by_name_with_details_db,
-    count_courses_by_name_db
+    count_courses_by_name_db,
+    find_instructor_variants_db,
+    find_instructors_db,
+    get_catalog_version
 )
-from .scraping_logic import get_authenticated_session
-from .config import PERIOD_RELEASE_DATES, PERIOD_GRACE_MONTHS
+from .known_courses import is_known_course, mark_course_found
+from .response_cache import analyze_response_cache
+from .cache_backends import shared_cache, make_cache_key
+from .config import PERIOD_RELEASE_DATES, PERIOD_GRACE_MONTHS, BATCH_REFRESH_WORKERS, COURSE_PAYLOAD_CACHE_TTL_SECONDS, SEARCH_CACHE_TTL_SECONDS, HOT_METADATA_TTL_SECONDS
 from .period_logic import (
     get_year_from_period_string,
     get_current_period,
@@ -21,7 +25,6 @@ from .period_logic import (
 )
 
 # --- Course Grouping Service Instance ---
-grouping_service = CourseGroupingService()
 
 # --- Custom Exceptions (from exceptions.py) ---
 
@@ -32,9 +35,99 @@ class SessionExpiredException(Exception):
 
 
 
+def has_fresh_negative_entry(metadata: dict) -> bool:
+    """
+    Checks whether a course's negative cache entry (no evaluations exist) is still valid.
+    """
+    no_data_until = metadata.get('no_data_until')
+    if not no_data_until:
+        return False
+    if isinstance(no_data_until, str):
+        no_data_until = date.fromisoformat(no_data_until)
+    return date.today() < no_data_until
+
+
 # --- Scraping Logic (from scraping_logic.py, scrape_search.py, scrape_link.py) ---
 
-# get_authenticated_session imported from scraping_logic.py
+# The scraping dependencies (requests, and BeautifulSoup through workflow_helpers) are imported inside
+# the functions that scrape, so instances that only serve up-to-date data never load them.
+
+# Metadata columns restored to date/datetime objects when metadata is read back from the shared cache
+METADATA_DATE_FIELDS = ('last_scrape_during_grace_period', 'last_probe_date', 'no_data_until')
+METADATA_TIMESTAMP_FIELDS = ('created_at', 'updated_at')
+
+def get_metadata_cache_key(course_code: str) -> str:
+    return make_cache_key('metadata', course_code)
+
+def decode_cached_metadata(metadata: dict) -> dict:
+    """Restores the date columns of metadata that went through the shared cache as JSON."""
+    for field in METADATA_DATE_FIELDS:
+        if metadata.get(field):
+            metadata[field] = date.fromisoformat(metadata[field][:10])
+    for field in METADATA_TIMESTAMP_FIELDS:
+        if metadata.get(field):
+            metadata[field] = datetime.fromisoformat(metadata[field])
+    return metadata
+
+def get_course_metadata_bulk_cached(course_codes: list) -> dict:
+    """
+    Reads course metadata from the shared cache, querying the database only for courses whose
+    metadata hasn't been read in the last HOT_METADATA_TTL_SECONDS. Together with the course payload
+    cache this lets hot courses be served without any database round trip.
+    """
+    metadata_by_code = {}
+    missing_codes = []
+    for course_code in course_codes:
+        metadata = shared_cache.get_json(get_metadata_cache_key(course_code))
+        if metadata is not None:
+            metadata_by_code[course_code] = decode_cached_metadata(metadata)
+        else:
+            missing_codes.append(course_code)
+
+    if missing_codes:
+        for course_code, metadata in get_course_metadata_bulk(missing_codes).items():
+            metadata_by_code[course_code] = metadata
+            shared_cache.set_json(get_metadata_cache_key(course_code), metadata, HOT_METADATA_TTL_SECONDS)
+    return metadata_by_code
+
+def forget_course(course_code: str):
+    """Drops a course's cached metadata and assembled responses after this instance changed it."""
+    shared_cache.delete(get_metadata_cache_key(course_code))
+    analyze_response_cache.invalidate_course(course_code)
+
+def get_catalog_version_cached() -> list:
+    """
+    The dataset version stamp, re-read from the database at most every HOT_METADATA_TTL_SECONDS.
+    Within a request it is looked up once, so the ETag and the search cache key share one read.
+    """
+    from flask import g, has_request_context
+    if has_request_context() and 'catalog_version' in g:
+        return g.catalog_version
+    cache_key = make_cache_key('catalog_version')
+    version = shared_cache.get_json(cache_key)
+    if version is None:
+        latest_update, course_count = get_catalog_version()
+        version = [latest_update.isoformat() if latest_update else None, course_count]
+        shared_cache.set_json(cache_key, version, HOT_METADATA_TTL_SECONDS)
+    if has_request_context():
+        g.catalog_version = version
+    return version
+
+def get_course_payload_cache_key(course_code: str, metadata: dict) -> str:
+    """
+    Cache key for an up-to-date course's data. Every scrape rewrites the course's metadata row,
+    so keying on its updated_at and instance list means a changed course never hits an old entry.
+    """
+    return make_cache_key('course', course_code, metadata.get('updated_at'), metadata.get('relevant_periods'))
+
+def get_up_to_date_course_data(course_code: str, metadata: dict) -> dict:
+    """Returns an up-to-date course's data from the shared cache, loading it from the database on a miss."""
+    cache_key = get_course_payload_cache_key(course_code, metadata)
+    data = shared_cache.get_json(cache_key)
+    if data is None:
+        data = get_course_data_by_keys(metadata.get('relevant_periods', []))
+        shared_cache.set_json(cache_key, data, COURSE_PAYLOAD_CACHE_TTL_SECONDS)
+    return data
 
 # --- Main Workflow (Adapted from workflow.py) ---
 
@@ -43,7 +136,16 @@ def get_course_data_and_update_cache(course_code: str) -> dict:
     Main service function to get course data.
     Checks database, scrapes if necessary, and returns all relevant data.
     """
-    metadata = get_course_metadata(course_code)
+    if is_known_course(course_code) is False:
+        print(f"Course {course_code} is not a known course code. Skipping lookup.")
+        return {}
+
+    metadata = get_course_metadata_bulk_cached([course_code]).get(course_code)
+
+    # Negative cache: courses known to have no evaluations cost a single metadata read
+    if metadata and has_fresh_negative_entry(metadata):
+        print(f"Course {course_code} has no evaluations until {metadata['no_data_until']}. Returning empty result.")
+        return {}
 
     # Check if the last scraping attempt failed for this course
     if metadata and metadata.get('last_period_failed', False):
@@ -53,11 +155,21 @@ def get_course_data_and_update_cache(course_code: str) -> dict:
     # Check if course is up-to-date
     if metadata and is_course_up_to_date(metadata.get('last_period_gathered'), metadata):
         print(f"Course {course_code} is up-to-date. Returning cached data.")
-        relevant_keys = metadata.get('relevant_periods', [])
-        return get_course_data_by_keys(relevant_keys)
+        return get_up_to_date_course_data(course_code, metadata)
+
+    # The cached metadata can predate another instance's scrape, so everything from here on, and
+    # any write-back in particular, works from the database copy
+    metadata = get_course_metadata(course_code)
+    if metadata and is_course_up_to_date(metadata.get('last_period_gathered'), metadata):
+        print(f"Course {course_code} was gathered since its metadata was cached. Returning stored data.")
+        forget_course(course_code)
+        return get_up_to_date_course_data(course_code, metadata)
 
     # If not up-to-date, use the shared core scraping function
     print(f"--- Starting scraper for course: {course_code} ---")
+    import requests
+    from .scraping_logic import get_authenticated_session
+    from .workflow_helpers import scrape_course_data_core
     
     try:
         session = get_authenticated_session()
@@ -68,10 +180,12 @@ def get_course_data_and_update_cache(course_code: str) -> dict:
             metadata = {"last_period_gathered": None, "last_period_failed": False, "relevant_periods": [], "last_scrape_during_grace_period": None}
         metadata['last_period_failed'] = True
         update_course_metadata(course_code, metadata)
+        forget_course(course_code)
         return {"error": "Failed to authenticate with scraping service."}
 
     # Use the shared core scraping function (skip grace period logic for web interface)
     result = scrape_course_data_core(course_code, session, skip_grace_period_logic=False)
+    forget_course(course_code)
     
     if not result['success']:
         print(f"--- Scraping failed for {course_code}: {result['error']} ---")
@@ -80,12 +194,116 @@ def get_course_data_and_update_cache(course_code: str) -> dict:
     print(f"--- Workflow for {course_code} complete. ---")
     return result['data']
 
+def get_courses_data_batch(course_codes: list, filters: dict = None) -> dict:
+    """
+    Batch version of get_course_data_and_update_cache for several courses (e.g. a course group).
+    Metadata for every course is read in one query and the data of all up-to-date courses in a
+    second one. Only the stale courses go through the full per-course path, concurrently.
+
+    If analysis filters are given they are pushed into the data query for up-to-date courses.
+    Stale courses are returned unfiltered, so callers still apply filter_instances to the result.
+
+    Returns:
+        dict: Maps each course code to what get_course_data_and_update_cache would return for it.
+    """
+    results = {}
+    candidates = []
+    for course_code in dict.fromkeys(course_codes):
+        if is_known_course(course_code) is False:
+            print(f"Course {course_code} is not a known course code. Skipping lookup.")
+            results[course_code] = {}
+        else:
+            candidates.append(course_code)
+
+    metadata_by_code = get_course_metadata_bulk_cached(candidates) if candidates else {}
+
+    fresh_keys = {}
+    stale_codes = []
+    for course_code in candidates:
+        metadata = metadata_by_code.get(course_code)
+        if metadata and has_fresh_negative_entry(metadata):
+            results[course_code] = {}
+        elif metadata and metadata.get('last_period_failed', False):
+            results[course_code] = {"error": f"The last attempt to gather data for course {course_code} failed. Please try again later or contact support if this persists."}
+        elif metadata and is_course_up_to_date(metadata.get('last_period_gathered'), metadata):
+            fresh_keys[course_code] = metadata.get('relevant_periods') or []
+        else:
+            stale_codes.append(course_code)
+
+    if fresh_keys:
+        print(f"Courses {', '.join(fresh_keys)} are up-to-date. Returning cached data.")
+        # Whole payloads are cached, so the shared cache only serves unfiltered requests
+        if not filters:
+            for course_code in list(fresh_keys):
+                data = shared_cache.get_json(get_course_payload_cache_key(course_code, metadata_by_code[course_code]))
+                if data is not None:
+                    results[course_code] = data
+                    del fresh_keys[course_code]
+
+    if fresh_keys:
+        data_by_code = get_course_data_by_keys_grouped([key for keys in fresh_keys.values() for key in keys], filters)
+        for course_code in fresh_keys:
+            results[course_code] = data_by_code.get(course_code, {})
+            if not filters:
+                cache_key = get_course_payload_cache_key(course_code, metadata_by_code[course_code])
+                shared_cache.set_json(cache_key, results[course_code], COURSE_PAYLOAD_CACHE_TTL_SECONDS)
+
+    if stale_codes:
+        print(f"Refreshing stale courses: {', '.join(stale_codes)}")
+        with ThreadPoolExecutor(max_workers=min(BATCH_REFRESH_WORKERS, len(stale_codes))) as executor:
+            futures = {course_code: executor.submit(get_course_data_and_update_cache, course_code) for course_code in stale_codes}
+            for course_code, future in futures.items():
+                try:
+                    results[course_code] = future.result()
+                except Exception as e:
+                    print(f"Warning: Could not refresh course {course_code}: {e}")
+                    results[course_code] = {"error": f"Could not load data for course {course_code}."}
+
+    return results
+
+def get_course_versions(course_codes: list) -> tuple:
+    """
+    Reads the metadata of several courses (from the shared cache or in one query), without touching
+    their data, to build HTTP cache validators.
+
+    Returns:
+        tuple: (all_fresh, versions) where all_fresh is True if every course would be served
+               from the database as-is (up-to-date or negatively cached), and versions is a list
+               of [course_code, updated_at, relevant_periods] entries.
+    """
+    course_codes = list(dict.fromkeys(course_codes))
+    known_codes = [code for code in course_codes if is_known_course(code) is not False]
+    metadata_by_code = get_course_metadata_bulk_cached(known_codes) if known_codes else {}
+
+    all_fresh = True
+    versions = []
+    for course_code in course_codes:
+        if course_code not in known_codes:
+            versions.append([course_code, None, None])
+            continue
+        metadata = metadata_by_code.get(course_code)
+        if not metadata:
+            all_fresh = False
+            versions.append([course_code, None, None])
+            continue
+        is_fresh = has_fresh_negative_entry(metadata) or (
+            not metadata.get('last_period_failed', False)
+            and is_course_up_to_date(metadata.get('last_period_gathered'), metadata)
+        )
+        all_fresh = all_fresh and is_fresh
+        versions.append([course_code, metadata.get('updated_at'), metadata.get('relevant_periods')])
+    return all_fresh, versions
+
 def force_recheck_course(course_code: str) -> dict:
     """
     Force recheck a course by ignoring grace period logic.
-    This is used when the user explicitly requests an update.
+    This is used when the user explicitly requests an update. It bypasses the known course filter,
+    so a course the filter wrongly rejects can always be looked up this way.
     """
     print(f"--- Force rechecking course: {course_code} ---")
+    import requests
+    from .scraping_logic import get_authenticated_session
+    from .workflow_helpers import scrape_course_data_core
     
     try:
         session = get_authenticated_session()
@@ -95,11 +313,14 @@ def force_recheck_course(course_code: str) -> dict:
 
     # Use the shared core scraping function with grace period logic enabled
     result = scrape_course_data_core(course_code, session, skip_grace_period_logic=True)
+    forget_course(course_code)
     
     if not result['success']:
         print(f"--- Force recheck failed for {course_code}: {result['error']} ---")
         return {"error": result['error']}
     
+    if result['data']:
+        mark_course_found(course_code)
     print(f"--- Force recheck for {course_code} complete. ---")
     return result['data']
 
@@ -126,22 +347,85 @@ def get_course_grace_status(course_code: str) -> dict:
         "last_scrape_date": last_scrape_during_grace.isoformat() if last_scrape_during_grace else None
     }
 
+def get_cached_search(namespace: str, search, *params):
+    """
+    Runs a search through the shared cache. Keys include the dataset version stamp, so results
+    are recomputed after any course is scraped.
+    """
+    cache_key = make_cache_key(namespace, *params, get_catalog_version_cached())
+    results = shared_cache.get_json(cache_key)
+    if results is None:
+        results = search(*params)
+        shared_cache.set_json(cache_key, results, SEARCH_CACHE_TTL_SECONDS)
+    return results
+
+def get_course_rankings(question: str, sort_by: str, limit: int, min_n: int, departments=None,
+                        min_period: str = None, max_period: str = None) -> list:
+    """
+    Ranks course groups by one question's mean or response count (see rankings.compute_course_rankings).
+    Results are shared through the cache until the next scrape.
+    """
+    from .rankings import compute_course_rankings
+    departments = sorted(departments) if departments else None
+    return get_cached_search(
+        'rankings', compute_course_rankings, question, sort_by, limit, min_n, departments, min_period, max_period
+    )
+
+def get_course_trend(course_codes: list, stats: list = None, method: str = 'none', window: int = 3,
+                     data_version: str = None) -> dict:
+    """
+    Builds a course group's per-period series and optional trend lines (see trends.compute_course_trend).
+    Results are shared through the cache under data_version, a validator built from the member courses'
+    versions, so refreshing any member moves the group to a new entry. Without a data_version the
+    members are not settled and the trend is computed without caching.
+    """
+    from .trends import compute_course_trend
+    params = (sorted(course_codes), stats, method, window)
+    if data_version is None:
+        return compute_course_trend(*params)
+    cache_key = make_cache_key('trend', *params, data_version)
+    trend = shared_cache.get_json(cache_key)
+    if trend is None:
+        trend = compute_course_trend(*params)
+        shared_cache.set_json(cache_key, trend, SEARCH_CACHE_TTL_SECONDS)
+    return trend
+
 def find_courses_by_name(search_query: str) -> list:
     """
     Finds course codes by searching for a query in the course names in the database.
     """
-    return find_courses_by_name_db(search_query)
+    return get_cached_search('search_course_name', find_courses_by_name_db, search_query)
 
 def find_courses_by_name_with_details(search_query: str, limit: int = None, offset: int = None) -> dict:
     """
     Finds courses by name with detailed results including course names.
     Returns a dictionary with results and metadata.
     """
-    total_count = count_courses_by_name_db(search_query)
-    results = find_courses_by_name_with_details_db(search_query, limit, offset)
+    def search(search_query, limit, offset):
+        return {
+            "results": find_courses_by_name_with_details_db(search_query, limit, offset),
+            "total_count": count_courses_by_name_db(search_query),
+            "search_query": search_query
+        }
 
-    return {
-        "results": results,
-        "total_count": total_count,
-        "search_query": search_query
-    }
\ No newline at end of file
+    return get_cached_search('search_course_name_detailed', search, search_query, limit, offset)
+
+def find_instructor_variants(instructor_name: str) -> list:
+    """
+    Finds variations of an instructor's name in the database.
+    """
+    return get_cached_search('search_instructor', find_instructor_variants_db, instructor_name)
+
+def find_instructors(instructor_name: str) -> list:
+    """
+    Finds canonical instructors (with their IDs and name variants) sharing a name's last name.
+    """
+    return get_cached_search('search_instructor_ids', find_instructors_db, instructor_name)
+
+def get_instructor_profile(instructor_id: int):
+    """
+    Aggregates an instructor's stats across every course (see instructors.get_instructor_profile).
+    Results are shared through the cache until the next scrape.
+    """
+    from .instructors import get_instructor_profile as compute_instructor_profile
+    return get_cached_search('instructor_profile', compute_instructor_profile, instructor_id)
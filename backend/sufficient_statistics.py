@@ -0,0 +1,70 @@
+# Leaf module: the database layer imports it while writing instances, so it must not import
+# analysis or anything that reaches db_utils.
+
+# --- Mappings for Statistical Calculations ---
+
+# Maps frequency keys to a tuple: (name for UI, numerical value mapping)
+STAT_MAPPINGS = {
+    "overall_quality_frequency": (
+        "Overall Quality",
+        {"Poor": 1, "Weak": 2, "Satisfactory": 3, "Good": 4, "Excellent": 5}
+    ),
+    "instructor_effectiveness_frequency": (
+        "Instructor Effectiveness",
+        {"Poor": 1, "Weak": 2, "Satisfactory": 3, "Good": 4, "Excellent": 5}
+    ),
+    "intellectual_challenge_frequency": (
+        "Intellectual Challenge",
+        {"Poor": 1, "Weak": 2, "Satisfactory": 3, "Good": 4, "Excellent": 5}
+    ),
+    "workload_frequency": (
+        "Workload",
+        {"Much lighter": 1, "Somewhat lighter": 2, "Typical": 3, "Somewhat heavier": 4, "Much heavier": 5}
+    ),
+    "feedback_frequency": (
+        "Helpful Feedback",
+        {"Disagree strongly": 1, "Disagree somewhat": 2, "Neither agree nor disagree": 3, "Agree somewhat": 4, "Agree strongly": 5}
+    ),
+    "ta_frequency": (
+        "TA Quality",
+        {"Poor": 1, "Weak": 2, "Satisfactory": 3, "Good": 4, "Excellent": 5}
+    ),
+    "periods_course_has_been_run": (
+        "Periods Course Has Been Run",
+        {}  # Special case - computed field, no frequency mapping needed
+    )
+}
+
+
+def _simplify_name(name: str) -> str:
+    """Simplifies a name to only its lowercase letters."""
+    if not isinstance(name, str):
+        return ""
+    return "".join(filter(str.isalpha, name)).lower()
+
+
+def compute_sufficient_statistics(instance_data: dict) -> dict:
+    """
+    Reduces each frequency question of one instance to the sufficient statistics stored alongside it
+    at scrape time: the response count, the sum and sum of squares of the response values, and the
+    count per option ordered by value (option_counts[0] holds the responses worth 1).
+
+    Returns:
+        dict: {question: (n, total, total_squares, option_counts)} for every question in the instance.
+    """
+    statistics = {}
+    for question, (_, value_mapping) in STAT_MAPPINGS.items():
+        frequency_dict = instance_data.get(question)
+        if not value_mapping or not isinstance(frequency_dict, dict):
+            continue
+        option_counts = [0] * max(value_mapping.values())
+        n = total = total_squares = 0
+        for response_text, count in frequency_dict.items():
+            value = value_mapping.get(response_text)
+            if value is not None and count > 0:
+                option_counts[value - 1] += count
+                n += count
+                total += count * value
+                total_squares += count * value * value
+        statistics[question] = (n, total, total_squares, option_counts)
+    return statistics
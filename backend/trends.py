@@ -0,0 +1,147 @@
+from .analysis import STAT_MAPPINGS, get_backend_stat_keys, get_stats_to_calculate, moments_to_statistics
+from .db_utils import get_period_rollup_sums
+
+TREND_METHODS = ('none', 'moving_average', 'regression')
+
+
+def get_period_position(period_order: int) -> float:
+    """Places a period_order (e.g. 20173 for FA17) on a continuous year axis, e.g. 2017.75."""
+    return period_order // 10 + (period_order % 10) / 4
+
+
+def build_trend_series(rows: list, questions: list) -> tuple:
+    """
+    Lays summed period rollups out as one aligned series per question.
+
+    Args:
+        rows (list): (period, period_order, question, n, total, total_squares, instance_count) tuples,
+            as returned by db_utils.get_period_rollup_sums.
+        questions (list): The questions to lay out.
+
+    Returns:
+        tuple: (periods, period_orders, instance_counts, sums) where sums is {question: [(n, total,
+               total_squares) per period]}; periods without responses to a question hold zeros.
+    """
+    positions = {}
+    periods = []
+    period_orders = []
+    instance_counts = []
+    for period, period_order, _, _, _, _, instance_count in sorted(rows, key=lambda row: (row[1], row[0])):
+        if period not in positions:
+            positions[period] = len(periods)
+            periods.append(period)
+            period_orders.append(period_order)
+            instance_counts.append(instance_count)
+        else:
+            # Not every instance answers every question; the busiest question counts them all
+            instance_counts[positions[period]] = max(instance_counts[positions[period]], instance_count)
+
+    sums = {question: [(0, 0, 0)] * len(periods) for question in questions}
+    for period, _, question, n, total, total_squares, _ in rows:
+        if question in sums:
+            sums[question][positions[period]] = (n, total, total_squares)
+    return periods, period_orders, instance_counts, sums
+
+
+def compute_trend_lines(period_orders: list, sums: dict, method: str, window: int = 3) -> dict:
+    """
+    Fits a trend line to every question's series in a single pass over the periods.
+
+    moving_average pools the responses of each period with those of the window - 1 periods before it,
+    so quiet periods weigh less than busy ones. regression fits the per-period means by least squares
+    weighted by each period's n, with time in years.
+
+    Returns:
+        dict: {question: {"values": [...]}} for moving_average, or {question: {"slope_per_year": ...,
+              "values": [...]}} for regression. Values are None where there is no data to fit.
+    """
+    questions = list(sums)
+    period_count = len(period_orders)
+    values = {question: [None] * period_count for question in questions}
+    if method == 'moving_average':
+        window_sums = {question: [0, 0] for question in questions}
+        for index in range(period_count):
+            for question in questions:
+                series = sums[question]
+                running = window_sums[question]
+                running[0] += series[index][0]
+                running[1] += series[index][1]
+                if index >= window:
+                    running[0] -= series[index - window][0]
+                    running[1] -= series[index - window][1]
+                if running[0]:
+                    values[question][index] = round(running[1] / running[0], 2)
+        return {question: {"values": values[question]} for question in questions}
+
+    # Weighted least squares accumulators: sum of w, w*x, w*y, w*x*x, w*x*y per question
+    x_values = [get_period_position(period_order) for period_order in period_orders]
+    accumulators = {question: [0, 0.0, 0.0, 0.0, 0.0] for question in questions}
+    for index, x in enumerate(x_values):
+        for question in questions:
+            n, total, _ = sums[question][index]
+            if n:
+                accumulator = accumulators[question]
+                # With weight n and y = total / n, w*y is simply the total
+                accumulator[0] += n
+                accumulator[1] += n * x
+                accumulator[2] += total
+                accumulator[3] += n * x * x
+                accumulator[4] += x * total
+
+    lines = {}
+    for question, (weight, weighted_x, weighted_y, weighted_xx, weighted_xy) in accumulators.items():
+        denominator = weight * weighted_xx - weighted_x * weighted_x
+        # Fewer than two periods with responses have no slope
+        if not weight or denominator <= 1e-9 * weight * weight:
+            lines[question] = {"slope_per_year": None, "values": values[question]}
+            continue
+        slope = (weight * weighted_xy - weighted_x * weighted_y) / denominator
+        intercept = (weighted_y - slope * weighted_x) / weight
+        lines[question] = {
+            "slope_per_year": round(slope, 4),
+            "values": [round(intercept + slope * x, 2) for x in x_values],
+        }
+    return lines
+
+
+def compute_course_trend(course_codes: list, stats: list = None, method: str = 'none', window: int = 3) -> dict:
+    """
+    Builds the per-period series of a course group from course_period_rollups, without reading
+    instance rows.
+
+    Args:
+        course_codes (list): The course group's member codes.
+        stats (list, optional): Frontend stat keys; defaults to every stat /api/analyze calculates.
+        method (str): One of TREND_METHODS.
+        window (int): How many periods moving_average pools.
+
+    Returns:
+        dict: "periods" in chronological order, "instances" per period and "series" {stat: [{"mean",
+              "std", "n"} per period]}, plus "trend" {"method", "window", "lines": {stat: ...}} when a
+              trend method is requested. None if the group has no rollups.
+    """
+    rows = get_period_rollup_sums(course_codes)
+    if not rows:
+        return None
+
+    stats_to_calculate = get_stats_to_calculate({'stats_to_calculate': stats} if stats else {})
+    backend_keys, statkey_reverse_map = get_backend_stat_keys(stats_to_calculate)
+    questions = [key for key in backend_keys if STAT_MAPPINGS.get(key, (None, None))[1]]
+    periods, period_orders, instance_counts, sums = build_trend_series(rows, questions)
+
+    trend = {
+        "periods": periods,
+        "instances": instance_counts,
+        "series": {
+            statkey_reverse_map[question]: [moments_to_statistics(*period_sums) for period_sums in series]
+            for question, series in sums.items()
+        },
+    }
+    if method != 'none':
+        lines = compute_trend_lines(period_orders, sums, method, window)
+        trend["trend"] = {
+            "method": method,
+            "window": window if method == 'moving_average' else None,
+            "lines": {statkey_reverse_map[question]: line for question, line in lines.items()},
+        }
+    return trend
@@ -1,8 +1,20 @@
-from .db_utils import get_course_metadata, update_course_metadata, update_course_data, get_course_data_by_keys
+from .db_utils import (
+    get_course_metadata,
+    get_course_metadata_bulk,
+    update_course_metadata,
+    bulk_update_course_metadata,
+    bulk_update_course_data,
+    get_course_data_by_keys,
+    get_existing_instance_keys,
+    get_sis_catalog,
+)
 from .period_logic import (
     get_current_period,
+    get_next_release_date,
     is_grace_period_over,
     get_period_from_instance_key,
+    get_section_from_instance_key,
+    get_course_code_from_instance_key,
     get_year_from_period_string,
     find_latest_year_from_keys,
     find_oldest_year_from_keys,
@@ -10,24 +22,57 @@ from .period_logic import (
 from .scraping_logic import get_authenticated_session
 from .scrape_search import get_evaluation_report_links
 from .scrape_link import scrape_evaluation_data
+from .config import SECTION_LOOKAHEAD, EARLIEST_REPORT_YEAR
 import requests
+import re
 from datetime import date
 
-def get_all_links_by_section(session, course_code):
+def get_years_to_scan(start_year: int, end_year: int, sis_catalog: dict = None) -> list:
+    """
+    Returns the years from start_year to end_year (inclusive) that are worth a listing request.
+    With a SIS catalog for the course, years whose terms were all synced for the course's schools but in
+    which the course never ran are skipped. Years the sync does not fully cover are always scanned.
+    """
+    years = range(start_year, end_year + 1)
+    if not sis_catalog:
+        return list(years)
+    return [year for year in years if year in sis_catalog['years'] or year not in sis_catalog['covered_years']]
+
+def get_sis_sections(sis_catalog: dict, start_year: int) -> list:
+    """
+    Returns the course's sections from the SIS catalog if the sync covers every year from start_year
+    through the current academic year, or None if a section could have run unlisted and every
+    section has to be scanned.
+    """
+    if not sis_catalog or not sis_catalog['sections'] or not start_year:
+        return None
+    current_academic_year = get_year_from_period_string(get_current_period())
+    if any(year not in sis_catalog['covered_years'] for year in range(start_year, current_academic_year + 1)):
+        return None
+    return sis_catalog['sections']
+
+def get_all_links_by_section(session, course_code, sections=None, start_year=None, sis_catalog=None):
     """
     Iterates through sections 00-99 for a course to find all possible report links.
     If any section returns 20 or more links, break up the section gathering by year for future-proof robustness.
+    A list of two-digit section strings can be passed to only scan those sections, and start_year
+    skips the years before it when a section has to be broken up by year.
+    With a SIS catalog, only the sections and years in which the course actually ran are queried,
+    as far as the synced SIS terms cover the years being scanned.
     """
     print(f"--- Switching to section-based link gathering for {course_code} ---")
     all_links = {}
 
-    for i in range(100):
+    if sections is None:
+        sections = get_sis_sections(sis_catalog, start_year) or [f"{i:02d}" for i in range(100)]
+
+    for section in sections:
         # e.g., creates AS.020.101.01, AS.020.101.02, etc.
-        section_course_code = f"{course_code}.{i:02d}"
+        section_course_code = f"{course_code}.{section}"
         try:
             links, has_more = get_evaluation_report_links(session, section_course_code)
             if links:
-                print(f"Found {len(links)} links for section {i:02d}.")
+                print(f"Found {len(links)} links for section {section}.")
                 if not has_more:
                     all_links.update(links)
                 else:
@@ -36,13 +81,15 @@ def get_all_links_by_section(session, course_code):
                     keys = list(links.keys())
                     if keys:
                         # Use available keys to determine start year for the section
-                        start_year = find_oldest_year_from_keys(keys)
+                        section_start_year = find_oldest_year_from_keys(keys)
                     else:
                         # Fallback if links dict is empty for some reason
-                        start_year = 2010
+                        section_start_year = 2010
+                    if start_year:
+                        section_start_year = max(section_start_year, start_year)
                     current_academic_year = get_year_from_period_string(get_current_period())
                     section_yearly_links = {}
-                    for year in range(start_year, current_academic_year + 2):  # +2 for robustness
+                    for year in get_years_to_scan(section_start_year, current_academic_year + 1, sis_catalog):  # +1 for robustness
                         print(f"  Scanning section {section_course_code}, year {year}...")
                         try:
                             yearly_links, _ = get_evaluation_report_links(session, section_course_code, year=year)
@@ -58,6 +105,190 @@ def get_all_links_by_section(session, course_code):
             print(f"--- Could not get links for section {section_course_code}: {e} ---")
     return all_links
 
+class LinkDiscoveryError(Exception):
+    """Raised when report link discovery for a course cannot be completed."""
+    pass
+
+def can_probe_current_period(course_metadata: dict, current_period: str) -> bool:
+    """
+    Decides whether a single year-filtered listing request is enough to refresh a course.
+    The probe only covers the current period's year, so it is only trusted when the last
+    successful scrape already reached that year (e.g. grace period rechecks).
+    """
+    last_period = course_metadata.get('last_period_gathered')
+    if not last_period or course_metadata.get('last_period_failed', False):
+        return False
+    return get_year_from_period_string(last_period) == get_year_from_period_string(current_period)
+
+def probe_current_period(session, course_code: str, course_metadata: dict, current_period: str):
+    """
+    Lightweight freshness probe: one listing request filtered to the current period's year.
+    Records the outcome in course_metadata and returns the links to process, or None if
+    the probe was inconclusive and a full discovery pass is needed.
+    """
+    probe_year = get_year_from_period_string(current_period)
+    print(f"Probing {course_code} for new reports in {probe_year}...")
+    probe_links, probe_has_more = get_evaluation_report_links(session=session, course_code=course_code, year=probe_year)
+
+    course_metadata['last_probe_date'] = date.today().isoformat()
+    if probe_has_more:
+        print(f"Probe for {probe_year} is paginated. Falling back to full discovery.")
+        course_metadata['last_probe_outcome'] = 'paginated'
+        return None
+
+    known_keys = set(course_metadata.get('relevant_periods') or [])
+    if any(key not in known_keys for key in probe_links):
+        print(f"Probe found new reports for {course_code}.")
+        course_metadata['last_probe_outcome'] = 'new_reports'
+    else:
+        print(f"Probe found no new reports for {course_code}. Skipping full discovery.")
+        course_metadata['last_probe_outcome'] = 'no_new_reports'
+    return probe_links
+
+def get_sections_to_scan(known_sections: list, sis_catalog: dict = None, start_year: int = None) -> list:
+    """
+    Returns the sections to scan for a course that is known to need section-based discovery:
+    every section seen before plus SECTION_LOOKAHEAD section numbers after the highest one.
+    When the SIS catalog lists the course's sections for every year since start_year, those replace
+    the lookahead guess.
+    This is only used for rescans within an academic year whose sections were already swept in full.
+    """
+    sections = {section for section in known_sections if section}
+    sis_sections = get_sis_sections(sis_catalog, start_year)
+    if sis_sections:
+        return sorted(sections | set(sis_sections))
+    if not sections:
+        return [f"{i:02d}" for i in range(100)]
+    highest = max(int(section) for section in sections)
+    for i in range(highest + 1, min(highest + 1 + SECTION_LOOKAHEAD, 100)):
+        sections.add(f"{i:02d}")
+    return sorted(sections)
+
+def remember_discovery_strategy(course_metadata: dict, mode: str, links: dict):
+    """
+    Stores the discovery mode that worked ('simple', 'yearly' or 'section') along with
+    every section seen so far, so the next scrape can skip straight to that strategy.
+    """
+    known_sections = set(course_metadata.get('known_sections') or [])
+    known_sections.update(get_section_from_instance_key(key) for key in links.keys())
+    known_sections.update(get_section_from_instance_key(key) for key in (course_metadata.get('relevant_periods') or []))
+    known_sections.discard(None)
+    course_metadata['discovery_mode'] = mode
+    course_metadata['known_sections'] = sorted(known_sections)
+
+def discover_report_links(session, course_code: str, course_metadata: dict) -> dict:
+    """
+    Full report link discovery for a course, starting from the unfiltered listing and
+    falling back to year-by-year and then section-based scans when results are paginated.
+    If a previous scrape already found that the course needs year-by-year or section-based
+    discovery, the pagination checks that are known to fail are skipped.
+
+    Raises:
+        LinkDiscoveryError: If a listing request fails part-way through discovery.
+    """
+    discovery_mode = course_metadata.get('discovery_mode')
+    sis_catalog = get_sis_catalog(course_code)
+    last_period = course_metadata.get('last_period_gathered')
+    last_period_year = get_year_from_period_string(last_period) if last_period else 0
+
+    if discovery_mode == 'section' and course_metadata.get('known_sections'):
+        print(f"Using remembered section-based discovery for {course_code}.")
+        if last_period_year == get_year_from_period_string(get_current_period()):
+            sections = get_sections_to_scan(course_metadata['known_sections'], sis_catalog, last_period_year)
+        else:
+            # A new academic year can add sections far above the known ones (e.g. 8x evening
+            # sections), so the first scrape of each year sweeps the full section range
+            print(f"First scrape of {course_code} this academic year. Scanning every section.")
+            sections = None
+        section_links = get_all_links_by_section(session, course_code, sections=sections, start_year=last_period_year or None, sis_catalog=sis_catalog)
+        remember_discovery_strategy(course_metadata, 'section', section_links)
+        return section_links
+
+    if discovery_mode == 'yearly' and last_period_year:
+        print(f"Using remembered year-by-year discovery for {course_code}.")
+        links_to_process = {}
+        smart_start_year = last_period_year
+    else:
+        try:
+            print(f"Fetching initial report links for {course_code}...")
+            initial_links, has_more_initial = get_evaluation_report_links(session=session, course_code=course_code)
+        except Exception as e:
+            raise LinkDiscoveryError(f"Failed to get initial report links: {e}")
+
+        if not initial_links:
+            print("No report links found on the main page.")
+
+        # Main logic branch: Decide scraping strategy based on "Show more results" button
+        if not has_more_initial:
+            # ✅ Simple Case: No "Show more results" button. Scrape what we found.
+            print("No pagination detected (no 'Show more results' button). Processing initial links.")
+            remember_discovery_strategy(course_metadata, 'simple', initial_links)
+            return initial_links
+
+        # ⚠️ Paginated Case: "Show more results" button present. Use optimized scraping strategy.
+        print("Pagination detected ('Show more results' button present). Using optimized scraping strategy.")
+
+        links_to_process = initial_links.copy()
+        latest_initial_year = find_latest_year_from_keys(initial_links.keys()) if initial_links else 0
+        smart_start_year = max(last_period_year, latest_initial_year)
+        print(f"Initial links cover up to year {latest_initial_year}.")
+
+    current_academic_year = get_year_from_period_string(get_current_period())
+    print(f"Starting additional year-by-year scraping from {smart_start_year} to {current_academic_year + 1}.")
+
+    switchToSectionScraping = False
+    all_yearly_links = {}
+
+    for year in get_years_to_scan(smart_start_year, current_academic_year + 1, sis_catalog): # +1 to be safe
+        print(f"\n--- Checking year: {year} ---")
+        try:
+            yearly_links, has_more_yearly = get_evaluation_report_links(session=session, course_code=course_code, year=year)
+        except Exception as e:
+            raise LinkDiscoveryError(f"Failed during year-by-year scan at year {year}: {e}")
+
+        if has_more_yearly:
+            print(f"CRITICAL EDGE CASE: Year {year} has 'Show more results' button. Aborting year-by-year scan.")
+            switchToSectionScraping = True
+            break
+
+        if yearly_links:
+            print(f"Found {len(yearly_links)} links for {year}.")
+            all_yearly_links.update(yearly_links)
+
+    if switchToSectionScraping:
+        section_links = get_all_links_by_section(session, course_code, sis_catalog=sis_catalog)
+        links_to_process.update(section_links)
+        remember_discovery_strategy(course_metadata, 'section', links_to_process)
+    else:
+        print("Year-by-year scan complete.")
+        links_to_process.update(all_yearly_links)
+        remember_discovery_strategy(course_metadata, 'yearly', links_to_process)
+
+    return links_to_process
+
+def mark_course_gathered(course_metadata: dict, newly_scraped_keys, current_period: str):
+    """
+    Marks a successfully scraped course as gathered up to the current period and sets or
+    clears its grace period flag depending on whether current period data was found.
+    Finding new reports also clears any negative cache entry for the course.
+    """
+    course_metadata['last_period_gathered'] = current_period
+    if newly_scraped_keys:
+        course_metadata['no_data_until'] = None
+
+    newly_scraped_periods = {get_period_from_instance_key(key) for key in newly_scraped_keys}
+    current_period_data_found = current_period in newly_scraped_periods
+
+    if current_period_data_found:
+        print(f"Found data for current period {current_period}. Clearing grace period flag.")
+        course_metadata['last_scrape_during_grace_period'] = None
+    elif is_grace_period_over(current_period):
+        print("No current period data found, but grace period is over. Marking as up-to-date.")
+        course_metadata['last_scrape_during_grace_period'] = None
+    else:
+        print("No current period data found and still in grace period. Marking for re-check.")
+        course_metadata['last_scrape_during_grace_period'] = date.today().isoformat()
+
 # Helper function to sort links chronologically before scraping
 def scrape_course_data_core(course_code: str, session: requests.Session = None, skip_grace_period_logic: bool = True) -> dict:
     """
@@ -82,67 +313,24 @@ def scrape_course_data_core(course_code: str, session: requests.Session = None,
             return {'success': False, 'error': f"Could not get authenticated session: {e}", 'metadata': course_metadata, 'data': {}, 'new_data_found': False}
 
     # --- PHASE 1: LINK COLLECTION ---
-    links_to_process = {}
-    
-    try:
-        print(f"Fetching initial report links for {course_code}...")
-        initial_links, has_more_initial = get_evaluation_report_links(session=session, course_code=course_code)
-    except Exception as e:
-        course_metadata['last_period_failed'] = True
-        update_course_metadata(course_code, course_metadata)
-        return {'success': False, 'error': f"Failed to get initial report links: {e}", 'metadata': course_metadata, 'data': {}, 'new_data_found': False}
+    current_period = get_current_period()
+    links_to_process = None
 
-    if not initial_links:
-        print("No report links found on the main page.")
+    if can_probe_current_period(course_metadata, current_period):
+        try:
+            links_to_process = probe_current_period(session, course_code, course_metadata, current_period)
+        except Exception as e:
+            print(f"Freshness probe failed for {course_code}: {e}. Falling back to full discovery.")
+            course_metadata['last_probe_date'] = date.today().isoformat()
+            course_metadata['last_probe_outcome'] = 'failed'
 
-    # Main logic branch: Decide scraping strategy based on "Show more results" button
-    if not has_more_initial:
-        # ✅ Simple Case: No "Show more results" button. Scrape what we found.
-        print("No pagination detected (no 'Show more results' button). Processing initial links.")
-        links_to_process = initial_links
-    else:
-        # ⚠️ Paginated Case: "Show more results" button present. Use optimized scraping strategy.
-        print("Pagination detected ('Show more results' button present). Using optimized scraping strategy.")
-        
-        links_to_process = initial_links.copy()
-        
-        last_period = course_metadata.get('last_period_gathered')
-        last_period_year = get_year_from_period_string(last_period) if last_period else 0
-        latest_initial_year = find_latest_year_from_keys(initial_links.keys()) if initial_links else 0
-        
-        smart_start_year = max(last_period_year, latest_initial_year)
-        current_academic_year = get_year_from_period_string(get_current_period())
-        
-        print(f"Initial links cover up to year {latest_initial_year}.")
-        print(f"Starting additional year-by-year scraping from {smart_start_year} to {current_academic_year + 1}.")
-        
-        switchToSectionScraping = False
-        all_yearly_links = {}
-
-        for year in range(smart_start_year, current_academic_year + 2): # +2 to be safe
-            print(f"\n--- Checking year: {year} ---")
-            try:
-                yearly_links, has_more_yearly = get_evaluation_report_links(session=session, course_code=course_code, year=year)
-            except Exception as e:
-                course_metadata['last_period_failed'] = True
-                update_course_metadata(course_code, course_metadata)
-                return {'success': False, 'error': f"Failed during year-by-year scan at year {year}: {e}", 'metadata': course_metadata, 'data': {}, 'new_data_found': False}
-
-            if has_more_yearly:
-                print(f"CRITICAL EDGE CASE: Year {year} has 'Show more results' button. Aborting year-by-year scan.")
-                switchToSectionScraping = True
-                break
-            
-            if yearly_links:
-                print(f"Found {len(yearly_links)} links for {year}.")
-                all_yearly_links.update(yearly_links)
-        
-        if switchToSectionScraping:
-            section_links = get_all_links_by_section(session, course_code)
-            links_to_process.update(section_links)
-        else:
-            print("Year-by-year scan complete.")
-            links_to_process.update(all_yearly_links)
+    if links_to_process is None:
+        try:
+            links_to_process = discover_report_links(session, course_code, course_metadata)
+        except LinkDiscoveryError as e:
+            course_metadata['last_period_failed'] = True
+            update_course_metadata(course_code, course_metadata)
+            return {'success': False, 'error': str(e), 'metadata': course_metadata, 'data': {}, 'new_data_found': False}
 
     # --- PHASE 2: UNIFIED SCRAPING ---
     print(f"\nFound a total of {len(links_to_process)} unique reports to potentially process.")
@@ -152,6 +340,8 @@ def scrape_course_data_core(course_code: str, session: requests.Session = None,
     existing_course_keys = get_course_data_by_keys(list(links_to_process.keys())).keys()
 
     sorted_links = links_to_process.items()
+    # Written in one transaction after the loop, so the course's cube cells and rollups are updated once
+    new_rows = []
 
     for instance_key, link_url in sorted_links:
         if instance_key in existing_course_keys:
@@ -166,7 +356,7 @@ def scrape_course_data_core(course_code: str, session: requests.Session = None,
             continue
 
         if scraped_data:
-            update_course_data(instance_key, course_code, scraped_data)
+            new_rows.append((instance_key, course_code, scraped_data))
             if instance_key not in course_metadata['relevant_periods']:
                 course_metadata['relevant_periods'].append(instance_key)
             new_data_found = True
@@ -176,27 +366,28 @@ def scrape_course_data_core(course_code: str, session: requests.Session = None,
             batch_failed = True
             break
 
+    bulk_update_course_data(new_rows)
+
     # --- PHASE 3: FINALIZATION ---
+    if new_data_found:
+        # Rows were written, so the course must not stay negatively cached even if the batch failed
+        course_metadata['no_data_until'] = None
+
     if not batch_failed and not new_data_found:
         print("No new reports found to scrape.")
         course_metadata['last_period_failed'] = False
 
-    current_period = get_current_period()
     if not course_metadata['last_period_failed']:
-        course_metadata['last_period_gathered'] = current_period
-
-        newly_scraped_periods = {get_period_from_instance_key(key) for key in links_to_process.keys() if key not in existing_course_keys}
-        current_period_data_found = current_period in newly_scraped_periods
+        newly_scraped_keys = [key for key in links_to_process.keys() if key not in existing_course_keys]
+        mark_course_gathered(course_metadata, newly_scraped_keys, current_period)
 
-        if current_period_data_found:
-            print(f"Found data for current period {current_period}. Clearing grace period flag.")
-            course_metadata['last_scrape_during_grace_period'] = None
-        elif is_grace_period_over(current_period):
-            print("No current period data found, but grace period is over. Marking as up-to-date.")
-            course_metadata['last_scrape_during_grace_period'] = None
+        if not links_to_process and not course_metadata['relevant_periods']:
+            # Negative cache entry: no evaluations can appear before the next release date
+            no_data_until = get_next_release_date()
+            print(f"No evaluations exist for {course_code}. Caching empty result until {no_data_until}.")
+            course_metadata['no_data_until'] = no_data_until.isoformat()
         else:
-            print("No current period data found and still in grace period. Marking for re-check.")
-            course_metadata['last_scrape_during_grace_period'] = date.today().isoformat()
+            course_metadata['no_data_until'] = None
     
     update_course_metadata(course_code, course_metadata)
 
@@ -211,3 +402,140 @@ def scrape_course_data_core(course_code: str, session: requests.Session = None,
         'error': f"Scraping halted for {course_code} due to a failed report." if batch_failed else None
     }
 
+
+def get_prefix_refinements(prefix: str) -> list:
+    """
+    Splits a listing prefix into the ten narrower prefixes that partition it.
+    Example: "EN.601" -> ["EN.601.0", ..., "EN.601.9"], "EN.601.22" -> ["EN.601.220", ..., "EN.601.229"]
+    """
+    if re.fullmatch(r'[A-Z]{2}\.\d{3}(?:\.\d{3})?', prefix):
+        prefix += '.'
+    return [f"{prefix}{digit}" for digit in range(10)]
+
+def get_department_report_links(session, prefix: str, year: int, term_id: str = None) -> dict:
+    """
+    Gathers every report link whose course code starts with prefix for one year (and optionally one term).
+    A single listing request covers the whole slice unless it paginates, in which case the prefix is
+    refined one digit at a time and only the paginated slices are fanned out.
+
+    Raises:
+        requests.exceptions.RequestException: If a listing request fails.
+    """
+    links, has_more = get_evaluation_report_links(session=session, course_code=prefix, year=year, term_id=term_id)
+    if not has_more:
+        return links
+
+    if re.fullmatch(r'[A-Z]{2}\.\d{3}\.\d{3}\.\d{2}', prefix):
+        print(f"Warning: Section {prefix} is still paginated for {year}. Some reports may be missing.")
+        return links
+
+    print(f"Slice {prefix} for {year} is paginated. Fanning out.")
+    all_links = dict(links)
+    for refined_prefix in get_prefix_refinements(prefix):
+        all_links.update(get_department_report_links(session, refined_prefix, year, term_id))
+    return all_links
+
+def scrape_department_data(department_prefix: str, start_year: int = None, term_id: str = None, session: requests.Session = None) -> dict:
+    """
+    Refreshes every course under a department prefix (e.g. "EN.601") using year-sliced listing
+    requests for the whole department instead of one listing walk per course.
+    Links are attributed back to their course codes, new reports are scraped, and course data
+    and metadata are written in bulk.
+
+    Courses are only marked as gathered up to the current period when the crawl covered every
+    year since their last successful scrape and was not restricted to a single term.
+
+    Returns:
+        dict: Per-course summary of {"links": int, "new_reports": int, "failed": bool}.
+    """
+    current_period = get_current_period()
+    current_academic_year = get_year_from_period_string(current_period)
+    start_year = start_year or EARLIEST_REPORT_YEAR
+
+    if session is None:
+        session = get_authenticated_session()
+
+    # --- PHASE 1: DEPARTMENT-WIDE LINK COLLECTION ---
+    links_by_course = {}
+    failed_years = []
+    for year in range(start_year, current_academic_year + 2):  # +2 to be safe
+        print(f"\n--- Scanning {department_prefix} for year {year} ---")
+        try:
+            year_links = get_department_report_links(session, department_prefix, year, term_id)
+        except Exception as e:
+            print(f"--- Could not get links for {department_prefix}, year {year}: {e} ---")
+            failed_years.append(year)
+            continue
+        for instance_key, link_url in year_links.items():
+            course_code = get_course_code_from_instance_key(instance_key)
+            if course_code and course_code.startswith(department_prefix):
+                links_by_course.setdefault(course_code, {})[instance_key] = link_url
+
+    print(f"\nFound reports for {len(links_by_course)} courses under {department_prefix}.")
+    if not links_by_course:
+        return {}
+
+    # Create any missing metadata records up front to prevent foreign key violations
+    metadata_by_code = get_course_metadata_bulk(links_by_course.keys())
+    missing_codes = [code for code in links_by_course if code not in metadata_by_code]
+    for course_code in missing_codes:
+        metadata_by_code[course_code] = {
+            "last_period_gathered": None, "last_period_failed": False,
+            "relevant_periods": [], "last_scrape_during_grace_period": None
+        }
+    bulk_update_course_metadata({code: metadata_by_code[code] for code in missing_codes})
+
+    all_keys = [key for links in links_by_course.values() for key in links]
+    existing_course_keys = get_existing_instance_keys(all_keys)
+
+    # --- PHASE 2: SCRAPING AND BULK WRITES ---
+    summary = {}
+    for course_code, links in sorted(links_by_course.items()):
+        course_metadata = metadata_by_code[course_code]
+        if course_metadata.get('relevant_periods') is None:
+            course_metadata['relevant_periods'] = []
+        new_rows = []
+        course_failed = False
+
+        for instance_key, link_url in links.items():
+            if instance_key in existing_course_keys:
+                continue
+
+            scraped_data = scrape_evaluation_data(link_url, session)
+
+            if scraped_data and scraped_data.get("scrape_failed", False):
+                print(f"Warning: Scraping failed for {instance_key}. See server logs for details.")
+                continue
+
+            if scraped_data:
+                new_rows.append((instance_key, course_code, scraped_data))
+                if instance_key not in course_metadata['relevant_periods']:
+                    course_metadata['relevant_periods'].append(instance_key)
+            else:
+                print(f"Failed to scrape {instance_key}. Halting scraping for {course_code} to prevent incomplete data.")
+                course_failed = True
+                break
+
+        bulk_update_course_data(new_rows)
+        if new_rows:
+            # Even term-restricted crawls that don't mark the course as gathered prove it has evaluations
+            course_metadata['no_data_until'] = None
+
+        known_sections = set(course_metadata.get('known_sections') or [])
+        known_sections.update(get_section_from_instance_key(key) for key in links)
+        known_sections.discard(None)
+        course_metadata['known_sections'] = sorted(known_sections)
+
+        last_period = course_metadata.get('last_period_gathered')
+        covers_history = start_year <= EARLIEST_REPORT_YEAR or (last_period and get_year_from_period_string(last_period) >= start_year)
+        if course_failed:
+            course_metadata['last_period_failed'] = True
+        elif not failed_years and covers_history and term_id is None:
+            course_metadata['last_period_failed'] = False
+            mark_course_gathered(course_metadata, [row[0] for row in new_rows], current_period)
+
+        summary[course_code] = {"links": len(links), "new_reports": len(new_rows), "failed": course_failed}
+
+    # --- PHASE 3: FINALIZATION ---
+    bulk_update_course_metadata(metadata_by_code)
+    return summary
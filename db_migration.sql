@@ -0,0 +1,108 @@
+-- Upgrades a database created from the original db_schema.sql (course_metadata and courses only)
+-- to the current schema. Every statement is idempotent, so it can be re-run after a partial upgrade.
+-- Run it with one-time-scripts/db_migrate.py, which executes the statements one at a time outside
+-- a transaction, as CREATE INDEX CONCURRENTLY requires. PostgreSQL 15+ is needed for NULLS NOT DISTINCT.
+--
+-- Run it BEFORE deploying the new backend: its queries read the columns and tables added here.
+-- Then run the backfills listed in db_migrate.py so derived tables cover existing instances.
+
+-- course_metadata: freshness probe, discovery mode, known sections and negative cache
+ALTER TABLE course_metadata
+    ADD COLUMN IF NOT EXISTS last_probe_date DATE,
+    ADD COLUMN IF NOT EXISTS last_probe_outcome VARCHAR(20),
+    ADD COLUMN IF NOT EXISTS discovery_mode VARCHAR(10),
+    ADD COLUMN IF NOT EXISTS known_sections JSONB,
+    ADD COLUMN IF NOT EXISTS no_data_until DATE;
+
+CREATE TABLE IF NOT EXISTS instructors (
+    instructor_id SERIAL PRIMARY KEY,
+    canonical_key VARCHAR(255) NOT NULL UNIQUE,
+    display_name TEXT NOT NULL,
+    latest_period_order INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS instructor_name_variants (
+    name TEXT PRIMARY KEY,
+    instructor_id INTEGER NOT NULL REFERENCES instructors(instructor_id) ON DELETE CASCADE,
+    last_name VARCHAR(255) NOT NULL
+);
+
+-- Adding STORED generated columns rewrites the whole courses table under an ACCESS EXCLUSIVE lock:
+-- reads and writes of courses block until it finishes, so run it in a quiet window. All four
+-- columns are added in one statement so the table is rewritten once.
+ALTER TABLE courses
+    ADD COLUMN IF NOT EXISTS period_year SMALLINT GENERATED ALWAYS AS (2000 + substring(instance_key from '(\d{2})$')::int) STORED,
+    ADD COLUMN IF NOT EXISTS period_season VARCHAR(2) GENERATED ALWAYS AS (substring(instance_key from '\.(FA|SP|SU|IN)\d{2}$')) STORED,
+    ADD COLUMN IF NOT EXISTS instructor_name TEXT GENERATED ALWAYS AS (data->>'instructor_name') STORED,
+    ADD COLUMN IF NOT EXISTS instructor_id INTEGER REFERENCES instructors(instructor_id);
+
+CREATE TABLE IF NOT EXISTS instance_question_stats (
+    instance_key VARCHAR(255) NOT NULL REFERENCES courses(instance_key) ON DELETE CASCADE,
+    course_code VARCHAR(255) NOT NULL,
+    question VARCHAR(64) NOT NULL,
+    n INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    total_squares INTEGER NOT NULL,
+    option_counts INTEGER[] NOT NULL,
+    PRIMARY KEY (instance_key, question)
+);
+
+CREATE TABLE IF NOT EXISTS analysis_cube (
+    course_code VARCHAR(255) NOT NULL,
+    period VARCHAR(10),
+    instructor_name TEXT,
+    course_name TEXT,
+    instance_count INTEGER NOT NULL,
+    option_counts JSONB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS course_period_rollups (
+    course_code VARCHAR(255) NOT NULL,
+    department VARCHAR(16) NOT NULL,
+    period VARCHAR(10) NOT NULL,
+    period_order INTEGER NOT NULL,
+    question VARCHAR(64) NOT NULL,
+    n BIGINT NOT NULL,
+    total BIGINT NOT NULL,
+    total_squares BIGINT NOT NULL,
+    instance_count INTEGER NOT NULL,
+    PRIMARY KEY (course_code, period, question)
+);
+
+CREATE TABLE IF NOT EXISTS sis_sections (
+    course_code VARCHAR(255) NOT NULL,
+    section VARCHAR(10) NOT NULL,
+    period VARCHAR(10) NOT NULL,
+    school VARCHAR(255),
+    PRIMARY KEY (course_code, period, section)
+);
+
+CREATE TABLE IF NOT EXISTS sis_catalog_terms (
+    school VARCHAR(255) NOT NULL,
+    term VARCHAR(50) NOT NULL,
+    period VARCHAR(10) NOT NULL,
+    section_count INTEGER DEFAULT 0,
+    synced_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (school, term)
+);
+
+-- Indexes are built CONCURRENTLY so existing tables stay writable. A failed concurrent build leaves
+-- an INVALID index that IF NOT EXISTS skips; drop it and re-run the migration.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_instructor_name_variants_last_name ON instructor_name_variants (last_name);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_instructor_name_variants_instructor ON instructor_name_variants (instructor_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_courses_course_code ON courses (course_code);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_course_metadata_updated_at ON course_metadata (updated_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_courses_course_code_year ON courses (course_code, period_year);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_courses_course_code_season ON courses (course_code, period_season);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_courses_course_code_instructor ON courses (course_code, instructor_name);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_courses_instructor_id ON courses (instructor_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_courses_unlinked_instructor ON courses (instance_key) WHERE instructor_id IS NULL AND instructor_name ~ '[[:alpha:]]';
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_instance_question_stats_course_question ON instance_question_stats (course_code, question);
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_analysis_cube_cell ON analysis_cube (course_code, period, instructor_name, course_name) NULLS NOT DISTINCT;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_course_period_rollups_question_period ON course_period_rollups (question, period_order);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_course_period_rollups_department ON course_period_rollups (department, question, period_order);
+
+-- Databases created from an intermediate schema had a plain course_code index on the cube, which
+-- idx_analysis_cube_cell now covers
+DROP INDEX CONCURRENTLY IF EXISTS idx_analysis_cube_course_code;
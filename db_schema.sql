@@ -7,19 +7,139 @@ CREATE TABLE course_metadata (
     last_period_failed BOOLEAN DEFAULT FALSE,
     relevant_periods JSONB,
     last_scrape_during_grace_period DATE,
+    last_probe_date DATE,
+    last_probe_outcome VARCHAR(20),
+    discovery_mode VARCHAR(10),
+    known_sections JSONB,
+    no_data_until DATE,
     created_at TIMESTAMPTZ DEFAULT NOW(),
     updated_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- Instructor dimension: one row per canonical instructor, assigned when instances are written.
+-- canonical_key is the name reduced to its lowercase letters, the same key /api/analyze uses to merge
+-- spellings of a name; display_name is the spelling from the most recent period.
+CREATE TABLE instructors (
+    instructor_id SERIAL PRIMARY KEY,
+    canonical_key VARCHAR(255) NOT NULL UNIQUE,
+    display_name TEXT NOT NULL,
+    latest_period_order INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Every spelling of an instructor's name seen in the data, with its lowercase last name for variant search
+CREATE TABLE instructor_name_variants (
+    name TEXT PRIMARY KEY,
+    instructor_id INTEGER NOT NULL REFERENCES instructors(instructor_id) ON DELETE CASCADE,
+    last_name VARCHAR(255) NOT NULL
+);
+
+CREATE INDEX idx_instructor_name_variants_last_name ON instructor_name_variants (last_name);
+CREATE INDEX idx_instructor_name_variants_instructor ON instructor_name_variants (instructor_id);
+
 -- Table to store the detailed course evaluation data for each course instance
 CREATE TABLE courses (
     instance_key VARCHAR(255) PRIMARY KEY,
     course_code VARCHAR(255) REFERENCES course_metadata(course_code),
     data JSONB,
+    -- Filter columns derived from the instance key (e.g. EN.601.475.01.FA17) and data, so filters can run in SQL
+    period_year SMALLINT GENERATED ALWAYS AS (2000 + substring(instance_key from '(\d{2})$')::int) STORED,
+    period_season VARCHAR(2) GENERATED ALWAYS AS (substring(instance_key from '\.(FA|SP|SU|IN)\d{2}$')) STORED,
+    instructor_name TEXT GENERATED ALWAYS AS (data->>'instructor_name') STORED,
+    instructor_id INTEGER REFERENCES instructors(instructor_id),
     created_at TIMESTAMPTZ DEFAULT NOW(),
     updated_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- Index for looking up all instances of a course
+CREATE INDEX idx_courses_course_code ON courses (course_code);
+
+-- Index for the dataset version stamp used by HTTP caching
+CREATE INDEX idx_course_metadata_updated_at ON course_metadata (updated_at);
+
+-- Indexes for filtering a course's instances by year, season and instructor
+CREATE INDEX idx_courses_course_code_year ON courses (course_code, period_year);
+CREATE INDEX idx_courses_course_code_season ON courses (course_code, period_season);
+CREATE INDEX idx_courses_course_code_instructor ON courses (course_code, instructor_name);
+
+-- Index for aggregating an instructor's instances across every course
+CREATE INDEX idx_courses_instructor_id ON courses (instructor_id);
+
+-- Instances with an instructor name not yet linked to an instructor. Empty once
+-- one-time-scripts/backfill_instructors.py has run; instructor search scans courses until then.
+CREATE INDEX idx_courses_unlinked_instructor ON courses (instance_key) WHERE instructor_id IS NULL AND instructor_name ~ '[[:alpha:]]';
+
+-- Per-instance, per-question sufficient statistics, written with each instance's data so group
+-- means and standard deviations can be summed in SQL without decoding the JSONB data.
+-- option_counts holds the response count per option, ordered by value (index 1 is the option worth 1).
+CREATE TABLE instance_question_stats (
+    instance_key VARCHAR(255) NOT NULL REFERENCES courses(instance_key) ON DELETE CASCADE,
+    course_code VARCHAR(255) NOT NULL,
+    question VARCHAR(64) NOT NULL,
+    n INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    total_squares INTEGER NOT NULL,
+    option_counts INTEGER[] NOT NULL,
+    PRIMARY KEY (instance_key, question)
+);
+
+CREATE INDEX idx_instance_question_stats_course_question ON instance_question_stats (course_code, question);
+
+-- Pre-aggregated analysis cube: one cell per (course, period, instructor, course name) with the
+-- summed per-option response counts of its instances ({question: [count per option, ordered by value]}).
+-- Cells are updated in place whenever instances are written; course groups, instructor canonical
+-- names, filters and separations are all answered by rolling cells up at query time.
+CREATE TABLE analysis_cube (
+    course_code VARCHAR(255) NOT NULL,
+    period VARCHAR(10),
+    instructor_name TEXT,
+    course_name TEXT,
+    instance_count INTEGER NOT NULL,
+    option_counts JSONB NOT NULL
+);
+
+-- One row per cell, so written instances can be added to their cells in place. NULLS NOT DISTINCT
+-- (PostgreSQL 15+) makes cells with a NULL period, instructor or course name unique too.
+CREATE UNIQUE INDEX idx_analysis_cube_cell ON analysis_cube (course_code, period, instructor_name, course_name) NULLS NOT DISTINCT;
+
+-- Per-course, per-period, per-question rollups of instance_question_stats, recomputed for the
+-- periods of the instances written. Catalog-wide rankings sum them per course group without touching
+-- instance rows. period_order is year * 10 + season order (IN=0, SP=1, SU=2, FA=3) for range filters.
+CREATE TABLE course_period_rollups (
+    course_code VARCHAR(255) NOT NULL,
+    department VARCHAR(16) NOT NULL,
+    period VARCHAR(10) NOT NULL,
+    period_order INTEGER NOT NULL,
+    question VARCHAR(64) NOT NULL,
+    n BIGINT NOT NULL,
+    total BIGINT NOT NULL,
+    total_squares BIGINT NOT NULL,
+    instance_count INTEGER NOT NULL,
+    PRIMARY KEY (course_code, period, question)
+);
+
+CREATE INDEX idx_course_period_rollups_question_period ON course_period_rollups (question, period_order);
+CREATE INDEX idx_course_period_rollups_department ON course_period_rollups (department, question, period_order);
+
+-- Table caching the SIS class catalog: which sections of each course ran in which period
+CREATE TABLE sis_sections (
+    course_code VARCHAR(255) NOT NULL,
+    section VARCHAR(10) NOT NULL,
+    period VARCHAR(10) NOT NULL,
+    school VARCHAR(255),
+    PRIMARY KEY (course_code, period, section)
+);
+
+-- Table tracking which SIS terms have already been synced for each school
+CREATE TABLE sis_catalog_terms (
+    school VARCHAR(255) NOT NULL,
+    term VARCHAR(50) NOT NULL,
+    period VARCHAR(10) NOT NULL,
+    section_count INTEGER DEFAULT 0,
+    synced_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (school, term)
+);
+
 -- Create a function to automatically update the updated_at timestamp
 CREATE OR REPLACE FUNCTION trigger_set_timestamp()
 RETURNS TRIGGER AS $$
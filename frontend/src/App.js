@@ -12,6 +12,7 @@ import { API_BASE_URL } from './config';
 import Footer from './components/Footer';
 import { addToSearchHistory } from './utils/storageUtils';
 import { processAnalysisRequest } from './utils/analysisEngine.js';
+import { decodeRawData } from './utils/columnarPayload';
 
 function App() {
   const [analysisResult, setAnalysisResult] = useState(null);
@@ -97,7 +98,7 @@ function App() {
       raw_data_mode: true // NEW FLAG
     };
 
-    fetch(`${API_BASE_URL}/api/analyze/${code}`, {
+    fetch(`${API_BASE_URL}/api/analyze/${code}?format=columnar`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify(params),
@@ -119,8 +120,9 @@ function App() {
         return;
       }
       
-      setRawCourseData({ courseCode: code, data: data.raw_data });
-      const result = processAnalysisRequest(data.raw_data, {
+      const rawData = decodeRawData(data.raw_data);
+      setRawCourseData({ courseCode: code, data: rawData });
+      const result = processAnalysisRequest(rawData, {
           stats: options.stats,
           filters: options.filters,
           separationKeys: options.separationKeys
@@ -82,9 +82,10 @@ export function filterInstances(allInstances, filters) {
   return filtered;
 }
 
+// Groups map their instance keys to their instances, so keys never have to be matched back to instances
 export function separateInstances(instances, separationKeys = []) {
   if (!separationKeys || separationKeys.length === 0) {
-    return { "All Data": Object.values(instances) };
+    return { "All Data": { ...instances } };
   }
 
   const simplifiedToDisplayName = {};
@@ -99,7 +100,10 @@ export function separateInstances(instances, separationKeys = []) {
       if (
         !tempMap[simplified] ||
         periodTuple.year > tempMap[simplified][0].year ||
-        (periodTuple.year === tempMap[simplified][0].year && periodTuple.semesterNum > tempMap[simplified][0].semesterNum)
+        (periodTuple.year === tempMap[simplified][0].year && periodTuple.semesterNum > tempMap[simplified][0].semesterNum) ||
+        // Variants from the same period are ordered by name, like the backend
+        (periodTuple.year === tempMap[simplified][0].year && periodTuple.semesterNum === tempMap[simplified][0].semesterNum &&
+          instructor > tempMap[simplified][1])
       ) {
         tempMap[simplified] = [periodTuple, instructor];
       }
@@ -133,8 +137,8 @@ export function separateInstances(instances, separationKeys = []) {
       groupParts.push(value);
     }
     const groupName = groupParts.join(", ");
-    if (!groups[groupName]) groups[groupName] = [];
-    groups[groupName].push(instance);
+    if (!groups[groupName]) groups[groupName] = {};
+    groups[groupName][key] = instance;
   }
   return groups;
 }
@@ -228,11 +232,8 @@ export function processAnalysisRequest(rawData, params) {
   // Map frontend stat keys to backend keys
   const statsToSend = Object.keys(params.stats).filter(k => params.stats[k]);
 
-  for (const [groupName, instances] of Object.entries(separated)) {
-    // Get instance keys for this group
-    const groupInstanceKeys = Object.keys(filtered).filter(key => instances.includes(filtered[key]));
-    
-    const result = calculateGroupStatistics(instances, statsToSend, groupInstanceKeys);
+  for (const [groupName, group] of Object.entries(separated)) {
+    const result = calculateGroupStatistics(Object.values(group), statsToSend, Object.keys(group));
     
     // Use keys directly - no transformation needed
     const groupData = result.values;
@@ -0,0 +1,50 @@
+// Decoder for the compact columnar raw_data.instances payload (see backend/payload_encoding.py)
+const COLUMNAR_FORMAT = 'columnar';
+const COLUMNAR_VERSION = 1;
+
+export function decodeInstancesColumnar(payload) {
+  if (payload.format !== COLUMNAR_FORMAT || payload.version !== COLUMNAR_VERSION) {
+    throw new Error(`Unsupported payload format: ${payload.format} v${payload.version}`);
+  }
+
+  const { keys, strings, columns } = payload;
+  const instances = keys.map(() => ({}));
+
+  for (const [field, column] of Object.entries(columns)) {
+    if (column.type === 'frequency') {
+      const options = column.options.map(index => strings[index]);
+      column.counts.forEach((counts, i) => {
+        if (counts === null) return;
+        const frequency = {};
+        counts.forEach((count, j) => {
+          if (count !== null) frequency[options[j]] = count;
+        });
+        instances[i][field] = frequency;
+      });
+    } else if (column.type === 'raw') {
+      const missing = new Set(column.missing || []);
+      column.values.forEach((value, i) => {
+        if (!missing.has(i)) instances[i][field] = value;
+      });
+    } else {
+      column.values.forEach((value, i) => {
+        if (value === null) return;
+        instances[i][field] = column.type === 'string'
+          ? strings[value]
+          : value.map(index => strings[index]);
+      });
+    }
+  }
+
+  const decoded = {};
+  keys.forEach((key, i) => { decoded[key] = instances[i]; });
+  return decoded;
+}
+
+// Returns raw_data with its instances in the default dict-of-dicts shape, whichever format was sent
+export function decodeRawData(rawData) {
+  if (rawData && rawData.instances && rawData.instances.format === COLUMNAR_FORMAT) {
+    return { ...rawData, instances: decodeInstancesColumnar(rawData.instances) };
+  }
+  return rawData;
+}
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+import os
+import sys
+import argparse
+
+# Add the project root to the Python path so the backend package can be imported
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+
+from backend.db_utils import get_db_connection, refresh_analysis_cube
+
+def fetch_batch(cur, after_code, batch_size, only_missing):
+    """Fetches the next batch of course codes with stored instances, in course code order."""
+    missing_clause = """
+        AND NOT EXISTS (SELECT 1 FROM analysis_cube a WHERE a.course_code = c.course_code)
+    """ if only_missing else ""
+    cur.execute(
+        f"""
+        SELECT DISTINCT c.course_code
+        FROM courses c
+        WHERE c.course_code > %s {missing_clause}
+        ORDER BY c.course_code
+        LIMIT %s
+        """,
+        (after_code, batch_size)
+    )
+    return [row[0] for row in cur.fetchall()]
+
+def main():
+    parser = argparse.ArgumentParser(description='Build analysis_cube cells for courses scraped before it existed.')
+    parser.add_argument('--batch-size', type=int, default=200, help='Courses rebuilt per transaction')
+    parser.add_argument('--all', action='store_true', help='Rebuild every course, not just the ones without cells')
+    args = parser.parse_args()
+
+    after_code = ''
+    total = 0
+    while True:
+        # One transaction per batch, so an interrupted backfill keeps its progress
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                course_codes = fetch_batch(cur, after_code, args.batch_size, only_missing=not args.all)
+                if not course_codes:
+                    break
+                refresh_analysis_cube(cur, course_codes)
+        after_code = course_codes[-1]
+        total += len(course_codes)
+        print(f"Built cube cells for {total} courses (through {after_code})")
+
+    print(f"Done. {total} courses backfilled.")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+import os
+import sys
+import argparse
+
+# Add the project root to the Python path so the backend package can be imported
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+
+from backend.db_utils import get_db_connection, write_question_stats
+
+def fetch_batch(cur, after_key, batch_size, only_missing):
+    """Fetches the next batch of (instance_key, course_code, data) rows in instance key order."""
+    missing_clause = """
+        AND NOT EXISTS (SELECT 1 FROM instance_question_stats s WHERE s.instance_key = c.instance_key)
+    """ if only_missing else ""
+    cur.execute(
+        f"""
+        SELECT c.instance_key, c.course_code, c.data
+        FROM courses c
+        WHERE c.instance_key > %s {missing_clause}
+        ORDER BY c.instance_key
+        LIMIT %s
+        """,
+        (after_key, batch_size)
+    )
+    return cur.fetchall()
+
+def main():
+    parser = argparse.ArgumentParser(description='Fill instance_question_stats for instances scraped before it existed.')
+    parser.add_argument('--batch-size', type=int, default=500, help='Instances written per transaction')
+    parser.add_argument('--all', action='store_true', help='Recompute every instance, not just the ones without statistics')
+    args = parser.parse_args()
+
+    after_key = ''
+    total = 0
+    while True:
+        # One transaction per batch, so an interrupted backfill keeps its progress
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                rows = fetch_batch(cur, after_key, args.batch_size, only_missing=not args.all)
+                if not rows:
+                    break
+                write_question_stats(cur, [row for row in rows if isinstance(row[2], dict)])
+        after_key = rows[-1][0]
+        total += len(rows)
+        print(f"Backfilled {total} instances (through {after_key})")
+
+    print(f"Done. {total} instances backfilled.")
+
+if __name__ == '__main__':
+    main()
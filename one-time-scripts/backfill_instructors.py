@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+import os
+import sys
+import argparse
+
+# Add the project root to the Python path so the backend package can be imported
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+
+from backend.db_utils import get_db_connection, assign_instructors
+
+def fetch_batch(cur, after_key, batch_size, only_missing):
+    """Fetches the next batch of (instance_key, course_code, data) rows in instance key order."""
+    missing_clause = "AND instructor_id IS NULL AND data->>'instructor_name' IS NOT NULL" if only_missing else ""
+    cur.execute(
+        f"""
+        SELECT instance_key, course_code, data
+        FROM courses
+        WHERE instance_key > %s {missing_clause}
+        ORDER BY instance_key
+        LIMIT %s
+        """,
+        (after_key, batch_size)
+    )
+    return cur.fetchall()
+
+def main():
+    parser = argparse.ArgumentParser(description='Link instances scraped before the instructor dimension existed to their instructors.')
+    parser.add_argument('--batch-size', type=int, default=500, help='Instances linked per transaction')
+    parser.add_argument('--all', action='store_true', help='Relink every instance, not just the ones without an instructor')
+    args = parser.parse_args()
+
+    after_key = ''
+    total = 0
+    while True:
+        # One transaction per batch, so an interrupted backfill keeps its progress
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                rows = fetch_batch(cur, after_key, args.batch_size, only_missing=not args.all)
+                if not rows:
+                    break
+                assign_instructors(cur, rows)
+        after_key = rows[-1][0]
+        total += len(rows)
+        print(f"Linked {total} instances (through {after_key})")
+
+    print(f"Done. {total} instances linked.")
+
+if __name__ == '__main__':
+    main()
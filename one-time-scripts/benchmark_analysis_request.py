@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import argparse
+
+# Add the project root to the Python path so the backend package can be imported
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+
+from backend.analysis import process_analysis_request, separate_instances
+from benchmark_data import make_synthetic_instances
+
+SEPARATIONS = [None, ['instructor'], ['exact_period'], ['instructor', 'year']]
+
+# Budget for one process_analysis_request call on the benchmark group, checked with --check
+REQUEST_BUDGET_MS = 500
+
+def time_call(func, repeat):
+    """Returns the best wall time in milliseconds over repeat calls, and the last result."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+def legacy_key_matching(instances, separation_keys):
+    """The previous group-to-key matching: a list membership test with dict equality per instance."""
+    for group in separate_instances(instances, separation_keys).values():
+        group_instances = list(group.values())
+        [key for key, instance in instances.items() if instance in group_instances]
+
+def main():
+    parser = argparse.ArgumentParser(description='Time process_analysis_request on a large course group.')
+    parser.add_argument('--instances', type=int, default=5000, help='Instances in the synthetic group')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetitions per measurement (best time is reported)')
+    parser.add_argument('--legacy', action='store_true', help='Also time the previous quadratic key matching')
+    parser.add_argument('--check', action='store_true', help='Exit with an error if any request exceeds its budget')
+    parser.add_argument('--budget-ms', type=float, default=REQUEST_BUDGET_MS, help='Per-request budget used by --check')
+    args = parser.parse_args()
+
+    instances = make_synthetic_instances(args.instances)
+    print(f"{len(instances)} instances\n")
+
+    over_budget = []
+    for separation_keys in SEPARATIONS:
+        params = {"filters": {}, "separation_keys": separation_keys, "stats": {"overall_quality": True}}
+        elapsed_ms, result = time_call(lambda: process_analysis_request(instances, params), args.repeat)
+        label = ', '.join(separation_keys) if separation_keys else 'no separation'
+        print(f"  {label:<24}{len(result['data']):>6} groups {elapsed_ms:>10.2f} ms")
+        if args.legacy:
+            legacy_ms, _ = time_call(lambda: legacy_key_matching(instances, separation_keys), 1)
+            print(f"  {'':<24}{'':>13} {legacy_ms:>10.2f} ms for the previous key matching alone")
+        if elapsed_ms > args.budget_ms:
+            over_budget.append(label)
+
+    if args.check:
+        if over_budget:
+            print(f"\nFAIL: over the {args.budget_ms:.0f} ms budget: {', '.join(over_budget)}")
+            sys.exit(1)
+        print(f"\nOK: every request is within the {args.budget_ms:.0f} ms budget.")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import time
+import argparse
+
+# Add the project root to the Python path so the backend package can be imported
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+
+from backend.analysis_cube import build_cube_cells, rollup_cube
+from backend.analysis_result_cache import AnalysisResultCache
+from benchmark_data import make_synthetic_instances
+
+# A session of someone flipping between separation and filter settings in AdvancedOptions
+SESSION = [
+    ({}, ['instructor', 'year']),
+    ({}, ['instructor']),
+    ({}, ['year']),
+    ({}, None),
+    ({}, ['year', 'instructor']),
+    ({"seasons": ["Fall"]}, ['instructor', 'exact_period']),
+    ({"seasons": ["Fall"]}, ['instructor']),
+    ({"seasons": ["Fall"]}, ['exact_period']),
+    ({}, ['instructor']),
+    ({"min_year": "2015"}, ['course_code', 'instructor']),
+    ({"min_year": 2015}, ['course_code']),
+    ({"seasons": ["Fall"]}, None),
+]
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay an options session against the analysis result cache.')
+    parser.add_argument('--instances', type=int, default=5000, help='Instances in the synthetic group')
+    args = parser.parse_args()
+
+    instances = make_synthetic_instances(args.instances)
+    # Cells are decoded on every miss, as they are when read from the analysis_cube table
+    stored_cells = json.dumps(build_cube_cells(instances))
+    course_codes = ["EN.601.475", "EN.601.675"]
+    cache = AnalysisResultCache(max_entries=64)
+
+    mismatches = 0
+    uncached_seconds = 0.0
+    cached_seconds = 0.0
+    for filters, separation_keys in SESSION:
+        params = {"filters": filters, "separation_keys": separation_keys, "stats": {"overall_quality": True}}
+
+        start = time.perf_counter()
+        expected = rollup_cube(json.loads(stored_cells), params)
+        uncached_seconds += time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = cache.rollup(course_codes, "v1", params, lambda: json.loads(stored_cells))
+        cached_seconds += time.perf_counter() - start
+        if actual != expected:
+            mismatches += 1
+            print(f"  MISMATCH: separation {separation_keys}, filters {filters}")
+
+    print(f"\n{len(SESSION)} requests, {mismatches} mismatches")
+    print(f"  uncached {uncached_seconds * 1000:>8.2f} ms")
+    print(f"  cached   {cached_seconds * 1000:>8.2f} ms")
+    print(f"  {cache.stats()}")
+    if mismatches:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import tempfile
+import argparse
+import statistics
+
+# Add the project root to the Python path so the backend package can be imported
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+
+from backend.cache_backends import MemoryCacheBackend, SQLiteCacheBackend, make_cache_key
+from backend.response_utils import dumps_json
+from benchmark_data import make_synthetic_instances
+
+def time_hits(backend, keys, decode, rounds):
+    """Returns per-lookup latencies in microseconds for repeated hits on keys."""
+    lookup = backend.get_json if decode else backend.get
+    latencies = []
+    for _ in range(rounds):
+        for key in keys:
+            start = time.perf_counter()
+            value = lookup(key)
+            latencies.append((time.perf_counter() - start) * 1e6)
+            if value is None:
+                raise RuntimeError(f"Unexpected miss for {key} on {backend.name}")
+    return latencies
+
+def report(label, latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"  {label:<28}median {statistics.median(latencies):>10.1f} us    p95 {p95:>10.1f} us")
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare cache hit latency across cache backends.')
+    parser.add_argument('--courses', type=int, default=50, help='Number of distinct cached course payloads')
+    parser.add_argument('--instances', type=int, default=40, help='Instances per cached course payload')
+    parser.add_argument('--rounds', type=int, default=20, help='Lookups per key')
+    args = parser.parse_args()
+
+    payloads = {
+        make_cache_key('course', f"EN.601.{index:03d}"): make_synthetic_instances(args.instances, seed=index)
+        for index in range(args.courses)
+    }
+    payload_bytes = sum(len(dumps_json(payload)) for payload in payloads.values()) // len(payloads)
+    print(f"{args.courses} payloads of {args.instances} instances ({payload_bytes} bytes each on average)\n")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        backends = [
+            MemoryCacheBackend(1024 * 1024 * 1024),
+            SQLiteCacheBackend(os.path.join(temp_dir, 'cache.sqlite3'), 1024 * 1024 * 1024),
+        ]
+        for backend in backends:
+            for key, payload in payloads.items():
+                backend.set_json(key, payload, ttl_seconds=3600)
+            print(backend.name)
+            report("hit (bytes)", time_hits(backend, list(payloads), decode=False, rounds=args.rounds))
+            report("hit (decoded payload)", time_hits(backend, list(payloads), decode=True, rounds=args.rounds))
+
+        # A fresh SQLiteCacheBackend on the same file stands in for another worker process
+        other_worker = SQLiteCacheBackend(os.path.join(temp_dir, 'cache.sqlite3'), 1024 * 1024 * 1024)
+        print("sqlite (another worker)")
+        report("hit (decoded payload)", time_hits(other_worker, list(payloads), decode=True, rounds=args.rounds))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+# The API is imported from the project root, like Vercel does
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Modules that must only be loaded on first use: the scrapers and their parsing/HTTP dependencies,
+# the database driver, and the analysis helpers. Importing any of them at startup is a regression.
+LAZY_MODULES = [
+    'bs4', 'requests', 'psycopg2', 'dateutil', 'dotenv',
+    'backend.workflow_helpers', 'backend.scrape_search', 'backend.scrape_link',
+    'backend.scraping_logic', 'backend.analysis',
+]
+
+# Budget for importing backend.app itself (interpreter startup excluded), checked with --check
+IMPORT_BUDGET_MS = 300
+
+IMPORT_SCRIPT = "import sys, backend.app; print(' '.join(sorted(sys.modules)))"
+
+def import_once():
+    """
+    Imports the API in a fresh interpreter.
+    Returns the wall time in ms, the -X importtime report and the names of the loaded modules.
+    """
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', IMPORT_SCRIPT],
+        cwd=project_root, capture_output=True, text=True
+    )
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing backend.app failed:\n{completed.stderr}")
+    loaded_modules = set(completed.stdout.strip().splitlines()[-1].split())
+    return elapsed_ms, completed.stderr, loaded_modules
+
+def parse_import_times(report):
+    """Parses -X importtime output into (cumulative us, module) entries, slowest first."""
+    entries = []
+    for line in report.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line[len('import time:'):].split('|')
+        entries.append((int(cumulative), module.strip()))
+    return sorted(entries, reverse=True)
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the cold-start import time of the API.')
+    parser.add_argument('--runs', type=int, default=5, help='Number of fresh interpreters to time')
+    parser.add_argument('--top', type=int, default=15, help='Number of slowest imports to list')
+    parser.add_argument('--check', action='store_true', help='Exit with an error if cold start regressed')
+    parser.add_argument('--budget-ms', type=float, default=IMPORT_BUDGET_MS, help='Import budget for backend.app used by --check')
+    args = parser.parse_args()
+
+    timings = []
+    app_import_timings = []
+    report = ''
+    loaded_modules = set()
+    for _ in range(args.runs):
+        elapsed_ms, report, loaded_modules = import_once()
+        timings.append(elapsed_ms)
+        app_import_us = next(cumulative for cumulative, module in parse_import_times(report) if module == 'backend.app')
+        app_import_timings.append(app_import_us / 1000)
+
+    app_import_ms = statistics.median(app_import_timings)
+    print(f"Cold start over {args.runs} runs:")
+    print(f"  interpreter start + import: median {statistics.median(timings):.0f} ms, min {min(timings):.0f} ms, max {max(timings):.0f} ms")
+    print(f"  import backend.app:         median {app_import_ms:.0f} ms (budget {args.budget_ms:.0f} ms)\n")
+    print("Slowest imports in the last run (cumulative, including their dependencies):")
+    for cumulative_us, module in parse_import_times(report)[:args.top]:
+        print(f"  {cumulative_us / 1000:>8.1f} ms  {module}")
+
+    eager_modules = [module for module in LAZY_MODULES if module in loaded_modules]
+    if eager_modules:
+        print(f"\nLoaded at import time but should be lazy: {', '.join(eager_modules)}")
+
+    if args.check:
+        if eager_modules or app_import_ms > args.budget_ms:
+            print("\nFAIL: cold start regressed.")
+            sys.exit(1)
+        print("\nOK: cold start is within budget.")
+
+if __name__ == '__main__':
+    main()
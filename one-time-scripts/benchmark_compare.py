@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import argparse
+
+# Add the project root to the Python path so the backend package can be imported
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+
+from backend.analysis import process_analysis_request
+from backend.analysis_cube import build_cube_cells
+from backend.compare import compare_course_groups
+from benchmark_data import make_synthetic_instances
+
+PARAMS = {"filters": {"min_year": "2014"}, "separation_keys": ["instructor", "year"], "stats": {"overall_quality": True}}
+
+def time_call(func, repeat):
+    """Returns the best wall time in milliseconds over repeat calls, and the last result."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+def main():
+    parser = argparse.ArgumentParser(description='Time comparing course groups in one pass against one analysis per course.')
+    parser.add_argument('--courses', type=int, default=10, help='Courses compared (each grouped with a shared course)')
+    parser.add_argument('--instances', type=int, default=1000, help='Instances per course')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetitions per measurement (best time is reported)')
+    args = parser.parse_args()
+
+    # Every course is grouped with the same cross-listed course, so members overlap between groups
+    shared_code = "EN.601.999"
+    course_codes = [f"EN.601.{400 + index:03d}" for index in range(args.courses)]
+    instances_by_code = {
+        course_code: make_synthetic_instances(args.instances, (course_code,), seed=index)
+        for index, course_code in enumerate(course_codes + [shared_code])
+    }
+    cells = [cell for instances in instances_by_code.values() for cell in build_cube_cells(instances)]
+    member_codes_by_course = {course_code: [course_code, shared_code] for course_code in course_codes}
+    load_calls = []
+
+    def load_cells(codes):
+        load_calls.append(codes)
+        return [cell for cell in cells if cell["course_code"] in codes]
+
+    def analyze_each():
+        # What the frontend does today: one /api/analyze per course, each over its group's raw instances
+        results = {}
+        for course_code, member_codes in member_codes_by_course.items():
+            group_instances = {}
+            for member_code in member_codes:
+                group_instances.update(instances_by_code[member_code])
+            results[course_code] = process_analysis_request(group_instances, PARAMS)
+        return results
+
+    def compare_all():
+        # No data version, so every run recomputes instead of hitting the result cache
+        return compare_course_groups(member_codes_by_course, PARAMS, None, load_cells)
+
+    print(f"{args.courses} courses x {args.instances} instances, one shared member, {len(cells)} cube cells\n")
+    for label, call in [("one analysis per course", analyze_each), ("one comparison", compare_all)]:
+        load_calls.clear()
+        elapsed_ms, _ = time_call(call, args.repeat)
+        loads = f"{len(load_calls) // args.repeat} cell load(s)" if load_calls else "raw instances"
+        print(f"  {label:<26}{elapsed_ms:>10.1f} ms   ({loads})")
+
+if __name__ == '__main__':
+    main()
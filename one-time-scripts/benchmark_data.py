@@ -0,0 +1,49 @@
+import json
+import random
+
+# Option labels per frequency question, as scraped by backend/scrape_link.py
+QUALITY_OPTIONS = ["Poor", "Weak", "Satisfactory", "Good", "Excellent"]
+FREQUENCY_OPTIONS = {
+    "overall_quality_frequency": QUALITY_OPTIONS,
+    "instructor_effectiveness_frequency": QUALITY_OPTIONS,
+    "intellectual_challenge_frequency": QUALITY_OPTIONS,
+    "ta_frequency": QUALITY_OPTIONS,
+    "feedback_frequency": ["Disagree strongly", "Disagree somewhat", "Neither agree nor disagree", "Agree somewhat", "Agree strongly"],
+    "workload_frequency": ["Much lighter", "Somewhat lighter", "Typical", "Somewhat heavier", "Much heavier"],
+}
+SEASONS = ["IN", "SP", "SU", "FA"]
+
+def make_synthetic_instances(count, course_codes=("EN.601.475", "EN.601.675"), seed=0):
+    """
+    Builds a dict of instance key -> instance data shaped like the scraped data in the courses table,
+    spread over several course codes, sections, periods and instructors.
+    """
+    rng = random.Random(seed)
+    instructors = [f"Instructor {chr(ord('A') + i)} Lastname{i}" for i in range(12)]
+    instances = {}
+    i = 0
+    while len(instances) < count:
+        course_code = course_codes[i % len(course_codes)]
+        section = (i // len(course_codes)) % 100
+        period = f"{SEASONS[(i // 200) % 4]}{10 + (i // 800) % 16:02d}"
+        instance_key = f"{course_code}.{section:02d}.{period}"
+        i += 1
+        if instance_key in instances:
+            continue
+        students = rng.randint(5, 250)
+        instance = {
+            "course_name": f"Course {course_code}",
+            "instructor_name": rng.choice(instructors),
+            "ta_names": ["N/A"],
+        }
+        for question, options in FREQUENCY_OPTIONS.items():
+            weights = [rng.random() for _ in options]
+            total = sum(weights)
+            instance[question] = {option: int(students * weight / total) for option, weight in zip(options, weights)}
+        instances[instance_key] = instance
+    return instances
+
+def load_instances(path):
+    """Loads real instance data exported by export_data.py (data.json)."""
+    with open(path, 'r') as f:
+        return json.load(f)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+import os
+import re
+import sys
+import time
+import argparse
+
+# Add the project root to the Python path so the backend package can be imported
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+
+from backend.instance_keys import parse_instance_key
+from backend.analysis import get_instance_year, get_instance_season, parse_semester_year, compute_periods_from_instance_keys
+from backend.period_logic import get_period_from_instance_key, get_section_from_instance_key, get_course_code_from_instance_key
+from benchmark_data import make_synthetic_instances
+
+# The regex-per-call helpers the parser replaced, kept as the reference
+def legacy_year(key):
+    match = re.search(r'\.(?:FA|SP|SU|IN)(\d{2})$', key)
+    return 2000 + int(match.group(1)) if match else 0
+
+def legacy_season(key):
+    match = re.search(r'\.((?:FA|SP|SU|IN))\d{2}$', key)
+    return {"FA": "Fall", "SP": "Spring", "SU": "Summer", "IN": "Intersession"}.get(match.group(1)) if match else "Unknown"
+
+def legacy_sort_key(key):
+    match = re.search(r'\.((?:IN|SP|SU|FA))(\d{2})$', key)
+    return (int('20' + match.group(2)), {'IN': 0, 'SP': 1, 'SU': 2, 'FA': 3}[match.group(1)]) if match else (0, 0)
+
+def legacy_period(key):
+    match = re.search(r'\.((?:FA|SP|SU|IN)\d{2})$', key)
+    return match.group(1) if match else None
+
+def legacy_section(key):
+    match = re.search(r'\.(\d{2})\.(?:FA|SP|SU|IN)\d{2}$', key)
+    return match.group(1) if match else None
+
+def legacy_course_code(key):
+    match = re.match(r'([A-Z]{2}\.\d{3}\.\d{3})', key)
+    return match.group(1) if match else None
+
+def legacy_request(keys):
+    """The key parsing of one analyze request: filtering, separation, sorting, periods and grouping."""
+    for key in keys:
+        legacy_year(key), legacy_season(key), legacy_year(key), legacy_period(key), legacy_sort_key(key), legacy_course_code(key)
+    {legacy_period(key) for key in keys}
+
+def parsed_request(keys):
+    for key in keys:
+        get_instance_year(key), get_instance_season(key), get_instance_year(key), get_period_from_instance_key(key), parse_semester_year(key), get_course_code_from_instance_key(key)
+    compute_periods_from_instance_keys(keys)
+
+def check_equivalence(keys):
+    """Returns the keys on which the parsed helpers disagree with the regex helpers."""
+    helpers = [
+        (get_instance_year, legacy_year), (get_instance_season, legacy_season), (parse_semester_year, legacy_sort_key),
+        (get_period_from_instance_key, legacy_period), (get_section_from_instance_key, legacy_section),
+        (get_course_code_from_instance_key, legacy_course_code),
+    ]
+    return [key for key in keys for new, old in helpers if new(key) != old(key)]
+
+def time_call(func, repeat):
+    """Returns the best wall time in milliseconds over repeat calls."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare per-request instance key parsing with and without the parsed key cache.')
+    parser.add_argument('--instances', type=int, default=5000, help='Instance keys per request')
+    parser.add_argument('--repeat', type=int, default=5, help='Repetitions per measurement (best time is reported)')
+    args = parser.parse_args()
+
+    keys = list(make_synthetic_instances(args.instances))
+    # Grouped analyze keys are prefixed with their member course code
+    keys += [f"EN.601.675_{key}" for key in keys[:args.instances // 2]]
+    odd_keys = ["EN.601.475.FA17", "EN.601.475.01", "garbage", "EN.601.475.01.XX17", ""]
+
+    mismatches = check_equivalence(keys + odd_keys)
+    print(f"{len(keys)} keys, {len(mismatches)} disagreements with the regex helpers\n")
+
+    legacy_ms = time_call(lambda: legacy_request(keys), args.repeat)
+    parse_instance_key.cache_clear()
+    cold_ms = time_call(lambda: parsed_request(keys), 1)
+    warm_ms = time_call(lambda: parsed_request(keys), args.repeat)
+    print(f"  regex per call            {legacy_ms:>8.2f} ms per request")
+    print(f"  parsed, first request     {cold_ms:>8.2f} ms")
+    print(f"  parsed, later requests    {warm_ms:>8.2f} ms   ({legacy_ms / warm_ms:.1f}x)")
+    print(f"\n  cache: {parse_instance_key.cache_info()}")
+
+if __name__ == '__main__':
+    main()
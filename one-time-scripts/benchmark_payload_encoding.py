@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import gzip
+import time
+import argparse
+
+# Add the project root to the Python path so the backend package can be imported
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+
+from backend.payload_encoding import encode_instances_columnar, decode_instances_columnar
+from benchmark_data import make_synthetic_instances, load_instances
+
+def time_call(func, repeat):
+    """Returns the best wall time in milliseconds over repeat calls, and the last result."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+def benchmark(instances, repeat):
+    default_ms, default_json = time_call(lambda: json.dumps(instances), repeat)
+    columnar_ms, columnar_json = time_call(lambda: json.dumps(encode_instances_columnar(instances)), repeat)
+    default_parse_ms, _ = time_call(lambda: json.loads(default_json), repeat)
+    columnar_parse_ms, decoded = time_call(lambda: decode_instances_columnar(json.loads(columnar_json)), repeat)
+    assert decoded == instances, "Columnar round trip does not match the original instances"
+
+    rows = [
+        ("default", len(default_json), len(gzip.compress(default_json.encode())), default_ms, default_parse_ms),
+        ("columnar", len(columnar_json), len(gzip.compress(columnar_json.encode())), columnar_ms, columnar_parse_ms),
+    ]
+    print(f"{len(instances)} instances")
+    print(f"  {'format':<10}{'bytes':>12}{'gzip bytes':>12}{'encode ms':>12}{'decode ms':>12}")
+    for name, size, gz_size, encode_ms, decode_ms in rows:
+        print(f"  {name:<10}{size:>12}{gz_size:>12}{encode_ms:>12.2f}{decode_ms:>12.2f}")
+    print(f"  columnar is {rows[1][1] / rows[0][1]:.0%} of the default size ({rows[1][2] / rows[0][2]:.0%} gzipped)\n")
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the default and columnar /api/analyze instance payloads.')
+    parser.add_argument('--data', default=None, help='Path to a data.json export to benchmark instead of synthetic groups')
+    parser.add_argument('--repeat', type=int, default=5, help='Repetitions per measurement (best time is reported)')
+    args = parser.parse_args()
+
+    if args.data:
+        benchmark(load_instances(args.data), args.repeat)
+    else:
+        for count in (50, 500, 5000):
+            benchmark(make_synthetic_instances(count), args.repeat)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import random
+import argparse
+
+# Add the project root to the Python path so the backend package can be imported
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+
+from backend.rankings import rank_course_groups
+
+DEPARTMENTS = ["EN.601", "EN.553", "EN.520", "EN.540", "AS.050", "AS.110", "AS.171", "AS.180", "AS.200", "AS.230"]
+
+def time_call(func, repeat):
+    """Returns the best wall time in milliseconds over repeat calls, and the last result."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+def make_catalog_sums(course_count, seed=0):
+    """Builds per-course rollup sums shaped like db_utils.get_course_rollup_sums for a synthetic catalog."""
+    rng = random.Random(seed)
+    sums_by_code = {}
+    while len(sums_by_code) < course_count:
+        course_code = f"{rng.choice(DEPARTMENTS)}.{rng.randint(100, 899):03d}"
+        n = rng.randint(1, 5000)
+        mean = rng.uniform(2.5, 4.8)
+        total = int(n * mean)
+        sums_by_code[course_code] = (n, total, int(total * mean * 1.1), rng.randint(1, 60))
+    return sums_by_code
+
+def main():
+    parser = argparse.ArgumentParser(description='Time ranking course groups over a catalog of rollup sums.')
+    parser.add_argument('--courses', type=int, default=6000, help='Courses in the synthetic catalog')
+    parser.add_argument('--repeat', type=int, default=5, help='Repetitions per measurement (best time is reported)')
+    args = parser.parse_args()
+
+    sums_by_code = make_catalog_sums(args.courses)
+    print(f"{len(sums_by_code)} courses\n")
+    for label, call in [
+        ("top 10 by n", lambda: rank_course_groups(sums_by_code, 'n', 10)),
+        ("top 10 by mean", lambda: rank_course_groups(sums_by_code, 'mean', 10, 20)),
+        ("top 10 by mean, EN.601", lambda: rank_course_groups(sums_by_code, 'mean', 10, 20, ['EN.601'])),
+    ]:
+        elapsed_ms, _ = time_call(call, args.repeat)
+        print(f"  {label:<26}{elapsed_ms:>10.2f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import gzip
+import time
+import argparse
+
+# Add the project root to the Python path so the backend package can be imported
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+
+from backend.payload_encoding import encode_instances_columnar
+from benchmark_data import make_synthetic_instances, load_instances
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+def time_call(func, repeat):
+    """Returns the best wall time in milliseconds over repeat calls, and the last result."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+def analyze_payload(instances, columnar):
+    """Builds a payload shaped like the /api/analyze response."""
+    return {
+        "raw_data": {
+            "instances": encode_instances_columnar(instances) if columnar else instances,
+            "metadata": {"current_name": "Course", "former_names": []},
+            "grouping_metadata": {"grouped_courses": [], "group_description": "", "is_grouped": False}
+        }
+    }
+
+def benchmark(label, payload, repeat):
+    serializers = [("json", lambda: json.dumps(payload, sort_keys=True).encode('utf-8'))]
+    if orjson is not None:
+        serializers.append(("orjson", lambda: orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS)))
+
+    print(label)
+    body = None
+    for name, serialize in serializers:
+        elapsed_ms, body = time_call(serialize, repeat)
+        print(f"  serialize with {name:<8}{elapsed_ms:>10.2f} ms")
+
+    encoders = [("identity", lambda: body), ("gzip", lambda: gzip.compress(body, compresslevel=6))]
+    if brotli is not None:
+        encoders.append(("br", lambda: brotli.compress(body, quality=5)))
+    for name, encode in encoders:
+        elapsed_ms, wire = time_call(encode, repeat)
+        print(f"  {name:<10}{len(wire):>12} bytes on wire{elapsed_ms:>10.2f} ms to compress")
+    print()
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure serialize time and bytes on wire for /api/analyze payloads.')
+    parser.add_argument('--data', default=None, help='Path to a data.json export to benchmark instead of synthetic groups')
+    parser.add_argument('--repeat', type=int, default=5, help='Repetitions per measurement (best time is reported)')
+    args = parser.parse_args()
+
+    if orjson is None:
+        print("orjson is not installed; only the stdlib encoder is measured.")
+    if brotli is None:
+        print("Brotli is not installed; only gzip is measured.")
+
+    datasets = [("data.json", load_instances(args.data))] if args.data else [
+        (f"{count} synthetic instances", make_synthetic_instances(count)) for count in (50, 500, 5000)
+    ]
+    for label, instances in datasets:
+        benchmark(f"{label} (default)", analyze_payload(instances, columnar=False), args.repeat)
+        benchmark(f"{label} (columnar)", analyze_payload(instances, columnar=True), args.repeat)
+
+if __name__ == '__main__':
+    main()
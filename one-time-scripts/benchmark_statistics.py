@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import random
+import argparse
+
+# Add the project root to the Python path so the backend package can be imported
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+
+from backend.analysis import STAT_MAPPINGS, calculate_statistics_batch, separate_instances
+from benchmark_data import FREQUENCY_OPTIONS, make_synthetic_instances
+
+STAT_KEYS = list(FREQUENCY_OPTIONS)
+
+def legacy_detailed_statistics(frequency_dict, value_mapping):
+    """The previous implementation, which materializes every response, kept as the reference."""
+    if not frequency_dict or not value_mapping:
+        return {"mean": None, "std": None, "n": 0}
+    data_points = []
+    total_responses = 0
+    for response_text, count in frequency_dict.items():
+        if response_text in value_mapping and count > 0:
+            data_points.extend([value_mapping[response_text]] * count)
+            total_responses += count
+    if total_responses == 0:
+        return {"mean": None, "std": None, "n": 0}
+    mean = sum(data_points) / total_responses
+    if total_responses == 1:
+        std = 0.0
+    else:
+        variance = sum((x - mean) ** 2 for x in data_points) / (total_responses - 1)
+        std = variance ** 0.5
+    return {"mean": round(mean, 2), "std": round(std, 2), "n": total_responses}
+
+def legacy_statistics(groups):
+    """Aggregates each group's frequencies and computes its statistics the previous way."""
+    results = {}
+    for group_name, instances in groups.items():
+        results[group_name] = {}
+        for key in STAT_KEYS:
+            aggregated = {}
+            for instance in instances.values():
+                for response_text, count in instance.get(key, {}).items():
+                    aggregated[response_text] = aggregated.get(response_text, 0) + count
+            results[group_name][key] = legacy_detailed_statistics(aggregated, STAT_MAPPINGS[key][1])
+    return results
+
+def time_call(func, repeat):
+    """Returns the best wall time in milliseconds over repeat calls, and the last result."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+def check_small_groups(trials, seed):
+    """Compares both implementations on many small random frequency dicts, where rounding is most fragile."""
+    rng = random.Random(seed)
+    mismatches = 0
+    for _ in range(trials):
+        key = rng.choice(STAT_KEYS)
+        frequency_dict = {option: rng.randint(0, 12) for option in FREQUENCY_OPTIONS[key] if rng.random() < 0.7}
+        groups = {"group": {"instance": {key: frequency_dict}}}
+        expected = legacy_detailed_statistics(frequency_dict, STAT_MAPPINGS[key][1])
+        if calculate_statistics_batch(groups, [key])["group"][key] != expected:
+            mismatches += 1
+    return mismatches
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the closed-form statistics engine with the materializing implementation.')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetitions per measurement (best time is reported)')
+    parser.add_argument('--trials', type=int, default=20000, help='Random small groups to check for identical output')
+    args = parser.parse_args()
+
+    for count, separation_keys in ((500, None), (5000, None), (5000, ['instructor', 'year'])):
+        groups = separate_instances(make_synthetic_instances(count), separation_keys)
+        responses = sum(sum(instance[STAT_KEYS[0]].values()) for instances in groups.values() for instance in instances.values())
+        legacy_ms, expected = time_call(lambda: legacy_statistics(groups), args.repeat)
+        batch_ms, actual = time_call(lambda: calculate_statistics_batch(groups, STAT_KEYS), args.repeat)
+        label = f"{count} instances, {len(groups)} group(s), {responses} responses per stat"
+        print(label)
+        print(f"  materialized responses {legacy_ms:>10.2f} ms")
+        print(f"  closed form, batched   {batch_ms:>10.2f} ms   ({legacy_ms / batch_ms:.1f}x)")
+        print(f"  identical output:      {actual == expected}\n")
+
+    mismatches = check_small_groups(args.trials, seed=0)
+    print(f"{args.trials} random small groups: {mismatches} mismatches")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+import os
+import psycopg2
+from dotenv import load_dotenv
+
+# Backfills that fill the new derived tables for instances scraped before they existed, in the order
+# they must run: rollups are summed from instance_question_stats. The cube and rollups are rebuilt
+# with --all, since a course written by the new backend before its backfill has partial cells that
+# the default (courses without any cells) would skip.
+BACKFILLS = [
+    "backfill_instance_statistics.py",
+    "backfill_course_rollups.py --all",
+    "backfill_analysis_cube.py --all",
+    "backfill_instructors.py",
+    "sync_sis_catalog.py",
+]
+
+def split_statements(migration_sql):
+    """Splits the migration into its statements, dropping comment-only lines."""
+    lines = [line for line in migration_sql.splitlines() if not line.lstrip().startswith('--')]
+    return [statement.strip() for statement in "\n".join(lines).split(';') if statement.strip()]
+
+def migrate_database():
+    """
+    Connects to the PostgreSQL database and upgrades an existing schema to the one in db_schema.sql.
+    """
+    load_dotenv()
+    conn_string = os.getenv("DATABASE_URL")
+    if not conn_string:
+        print("DATABASE_URL environment variable not set.")
+        return
+
+    try:
+        conn = psycopg2.connect(conn_string)
+        # Each statement runs on its own, outside a transaction, as CREATE INDEX CONCURRENTLY requires
+        conn.autocommit = True
+        cur = conn.cursor()
+
+        # Read the migration file
+        try:
+            with open('../db_migration.sql', 'r') as f:
+                migration_sql = f.read()
+        except FileNotFoundError:
+            raise FileNotFoundError("Likely caused by not running this from the one-time-scripts/ directory")
+
+        for statement in split_statements(migration_sql):
+            print(f"Running: {statement.splitlines()[0]}")
+            cur.execute(statement)
+        print("Database schema migrated successfully.")
+        print("Now run, from this directory and in this order:")
+        for script in BACKFILLS:
+            print(f"  python {script}")
+
+        cur.close()
+        conn.close()
+
+    except psycopg2.Error as e:
+        print(f"Error migrating database: {e}")
+
+if __name__ == '__main__':
+    migrate_database()
@@ -5,6 +5,87 @@ from urllib.parse import quote
 from dotenv import load_dotenv
 import os
 
+# This list contains all terms from Spring 2009 to a year into the future.
+# As per the prompt, you have already generated this list.
+TERMS = [
+  "Fall 2026",
+  "Summer 2026",
+  "Intersession 2026",
+  "Spring 2026",
+  "Fall 2025",
+  "Summer 2025",
+  "Intersession 2025",
+  "Spring 2025",
+  "Fall 2024",
+  "Summer 2024",
+  "Spring 2024",
+  "Intersession 2024",
+  "Fall 2023",
+  "Summer 2023",
+  "Spring 2023",
+  "Intersession 2023",
+  "Fall 2022",
+  "Summer 2022",
+  "Spring 2022",
+  "Intersession 2022",
+  "Fall 2021",
+  "Summer 2021",
+  "Spring 2021",
+  "Intersession 2021",
+  "Fall 2020",
+  "Summer 2020",
+  "Spring 2020",
+  "Intersession 2020",
+  "Fall 2019",
+  "Summer 2019",
+  "Spring 2019",
+  "Intersession 2019",
+  "Fall 2018",
+  "Summer 2018",
+  "Spring 2018",
+  "Intersession 2018",
+  "Fall 2017",
+  "Summer 2017",
+  "Spring 2017",
+  "Intersession 2017",
+  "Fall 2016",
+  "Summer 2016",
+  "Intersession 2016",
+  "Spring 2016",
+  "Fall 2015",
+  "Summer 2015",
+  "Intersession 2015",
+  "Spring 2015",
+  "Fall 2014",
+  "Summer 2014",
+  "Spring 2014",
+  "Intersession 2014",
+  "Fall 2013",
+  "Summer 2013",
+  "Intersession 2013",
+  "Spring 2013",
+  "Fall 2012",
+  "Summer 2012",
+  "Spring 2012",
+  "Intersession 2012",
+  "Fall 2011",
+  "Summer 2011",
+  "Intersession 2011",
+  "Spring 2011",
+  "Fall 2010",
+  "Summer 2010",
+  "Spring 2010",
+  "Intersession 2010",
+  "Fall 2009",
+  "Summer 2009",
+  "Spring 2009"
+]  # curl "https://sis.jhu.edu/api/classes/codes/terms?key="
+
+SCHOOLS = [
+    "Krieger School of Arts and Sciences",
+    "Whiting School of Engineering"
+]
+
 def get_api_key():
     """
     Retrieves the JHU SIS API key from an environment variable or user input.
@@ -71,95 +152,14 @@ def main():
         print("API key is required to proceed. Exiting.")
         return
 
-    # This list contains all terms from Spring 2009 to a year into the future.
-    # As per the prompt, you have already generated this list.
-    terms = [
-      "Fall 2026",
-      "Summer 2026",
-      "Intersession 2026",
-      "Spring 2026",
-      "Fall 2025",
-      "Summer 2025",
-      "Intersession 2025",
-      "Spring 2025",
-      "Fall 2024",
-      "Summer 2024",
-      "Spring 2024",
-      "Intersession 2024",
-      "Fall 2023",
-      "Summer 2023",
-      "Spring 2023",
-      "Intersession 2023",
-      "Fall 2022",
-      "Summer 2022",
-      "Spring 2022",
-      "Intersession 2022",
-      "Fall 2021",
-      "Summer 2021",
-      "Spring 2021",
-      "Intersession 2021",
-      "Fall 2020",
-      "Summer 2020",
-      "Spring 2020",
-      "Intersession 2020",
-      "Fall 2019",
-      "Summer 2019",
-      "Spring 2019",
-      "Intersession 2019",
-      "Fall 2018",
-      "Summer 2018",
-      "Spring 2018",
-      "Intersession 2018",
-      "Fall 2017",
-      "Summer 2017",
-      "Spring 2017",
-      "Intersession 2017",
-      "Fall 2016",
-      "Summer 2016",
-      "Intersession 2016",
-      "Spring 2016",
-      "Fall 2015",
-      "Summer 2015",
-      "Intersession 2015",
-      "Spring 2015",
-      "Fall 2014",
-      "Summer 2014",
-      "Spring 2014",
-      "Intersession 2014",
-      "Fall 2013",
-      "Summer 2013",
-      "Intersession 2013",
-      "Spring 2013",
-      "Fall 2012",
-      "Summer 2012",
-      "Spring 2012",
-      "Intersession 2012",
-      "Fall 2011",
-      "Summer 2011",
-      "Intersession 2011",
-      "Spring 2011",
-      "Fall 2010",
-      "Summer 2010",
-      "Spring 2010",
-      "Intersession 2010",
-      "Fall 2009",
-      "Summer 2009",
-      "Spring 2009"
-    ]  # curl "https://sis.jhu.edu/api/classes/codes/terms?key="
-
-    schools = [
-        "Krieger School of Arts and Sciences",
-        "Whiting School of Engineering"
-    ]
-    
     # Use a set to automatically handle duplicate course codes
     all_course_codes = set()
     
     # Use a requests Session for connection pooling and efficiency
     with requests.Session() as session:
-        for school in schools:
+        for school in SCHOOLS:
             print(f"\n--- Starting school: {school} ---")
-            for term in terms:
+            for term in TERMS:
                 print(f"Fetching courses for term: {term}...")
                 
                 courses = fetch_courses_for_school_and_term(school, term, api_key, session)
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+import os
+import sys
+import argparse
+
+# Add the project root to the Python path so the backend package can be imported
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+
+from backend.workflow_helpers import scrape_department_data
+
+def main():
+    parser = argparse.ArgumentParser(description='Refresh every course under a department prefix (e.g. EN.601) with department-level link discovery.')
+    parser.add_argument('department', help='Department prefix to crawl, e.g. EN.601')
+    parser.add_argument('--start-year', type=int, default=None, help='First year to scan (defaults to the earliest report year)')
+    parser.add_argument('--term-id', default=None, help='Only scan a single EvaluationKit term ID')
+    args = parser.parse_args()
+
+    summary = scrape_department_data(args.department.upper(), start_year=args.start_year, term_id=args.term_id)
+
+    total_new = sum(course['new_reports'] for course in summary.values())
+    failed = sorted(code for code, course in summary.items() if course['failed'])
+    print("\n-----------------------------------------")
+    print(f"Refreshed {len(summary)} courses under {args.department}, {total_new} new reports scraped.")
+    if failed:
+        print(f"Courses with failed scrapes: {', '.join(failed)}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+import os
+import sys
+import argparse
+import threading
+import requests
+import psycopg2
+from psycopg2.extras import execute_values
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dotenv import load_dotenv
+
+from get_all_courses import TERMS, SCHOOLS, get_api_key, fetch_courses_for_school_and_term
+
+# Add the project root to the Python path so the backend package can be imported
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+
+from backend.period_logic import get_period_from_sis_term
+
+# requests.Session is not thread-safe, so each worker thread gets its own
+thread_local = threading.local()
+
+def get_thread_session():
+    if not hasattr(thread_local, 'session'):
+        thread_local.session = requests.Session()
+    return thread_local.session
+
+def fetch_sections(school, term, api_key):
+    """
+    Fetches one school/term from the SIS API and returns its (course_code, section) pairs,
+    or None if the request failed.
+    """
+    courses = fetch_courses_for_school_and_term(school, term, api_key, get_thread_session())
+    if courses is None:
+        return None
+    sections = set()
+    for course in courses:
+        course_code = course.get('OfferingName')
+        section = course.get('SectionName')
+        if course_code and section:
+            sections.add((course_code, str(section).zfill(2)))
+    return sections
+
+def sync_sis_catalog(max_workers=8, force=False):
+    """
+    Caches the SIS class catalog (sections and periods per course) in the database.
+    Each school/term pair is fetched concurrently and only once, unless force is set.
+    """
+    load_dotenv()
+    conn_string = os.getenv("DATABASE_URL")
+    if not conn_string:
+        print("DATABASE_URL environment variable not set.")
+        return
+
+    api_key = get_api_key()
+    if not api_key:
+        print("API key is required to proceed. Exiting.")
+        return
+
+    conn = psycopg2.connect(conn_string)
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT school, term FROM sis_catalog_terms")
+        synced = set(cur.fetchall())
+
+        pending = [
+            (school, term) for school in SCHOOLS for term in TERMS
+            if force or (school, term) not in synced
+        ]
+        print(f"{len(synced)} school/term pairs already synced, {len(pending)} to fetch.")
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(fetch_sections, school, term, api_key): (school, term)
+                for school, term in pending
+            }
+            for future in as_completed(futures):
+                school, term = futures[future]
+                period = get_period_from_sis_term(term)
+                sections = future.result()
+                if sections is None or period is None:
+                    print(f"  -> Skipping {term} for {school} due to a request error.")
+                    continue
+
+                # Writes happen on the main thread, one transaction per school/term
+                execute_values(
+                    cur,
+                    """
+                    INSERT INTO sis_sections (course_code, section, period, school)
+                    VALUES %s
+                    ON CONFLICT (course_code, period, section) DO NOTHING;
+                    """,
+                    [(course_code, section, period, school) for course_code, section in sections]
+                )
+                cur.execute(
+                    """
+                    INSERT INTO sis_catalog_terms (school, term, period, section_count)
+                    VALUES (%s, %s, %s, %s)
+                    ON CONFLICT (school, term) DO UPDATE SET
+                        section_count = EXCLUDED.section_count,
+                        synced_at = NOW();
+                    """,
+                    (school, term, period, len(sections))
+                )
+                conn.commit()
+                print(f"Synced {len(sections)} sections for {term} ({school}).")
+
+        cur.close()
+    except psycopg2.Error as e:
+        print(f"Database error: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Cache the SIS class catalog (sections and terms per course) in the database.')
+    parser.add_argument('--workers', type=int, default=8, help='Number of concurrent SIS API requests')
+    parser.add_argument('--force', action='store_true', help='Re-fetch terms that were already synced')
+    args = parser.parse_args()
+    sync_sis_catalog(max_workers=args.workers, force=args.force)
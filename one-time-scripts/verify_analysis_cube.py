@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from itertools import combinations
+
+# Add the project root to the Python path so the backend package can be imported
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+
+from backend.analysis import process_analysis_request
+from backend.analysis_cube import CUBE_SEPARATION_KEYS, build_cube_cells, rollup_cube
+from benchmark_data import load_instances, make_synthetic_instances
+
+FILTERS = [
+    {},
+    {"min_year": "2014", "max_year": "2020"},
+    {"seasons": ["Fall", "Intersession"]},
+    {"instructors": ["Instructor B Lastname1", "instructor c lastname2"]},
+    {"min_year": "2012", "seasons": ["Spring"], "instructors": ["Instructor D Lastname3", "INSTRUCTOR D LASTNAME3"]},
+]
+
+def time_call(func, repeat):
+    """Returns the best wall time in milliseconds over repeat calls, and the last result."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+def add_name_variants(instances, seed=0):
+    """Respells some instructor names and drops some fields, so canonical names and Unknown groups are exercised."""
+    rng = random.Random(seed)
+    for instance in instances.values():
+        roll = rng.random()
+        if roll < 0.1:
+            instance["instructor_name"] = instance["instructor_name"].lower()
+        elif roll < 0.15:
+            instance["instructor_name"] = instance["instructor_name"].upper()
+        elif roll < 0.17:
+            del instance["instructor_name"]
+        elif roll < 0.19:
+            instance["course_name"] = f"{instance['course_name']} (Renamed)"
+        elif roll < 0.2:
+            del instance["overall_quality_frequency"]
+    return instances
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that analysis cube roll-ups match process_analysis_request.')
+    parser.add_argument('--instances', type=int, default=3000, help='Instances in the synthetic group')
+    parser.add_argument('--data', help='Path to an exported data.json to check instead of synthetic data')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetitions per timing (best time is reported)')
+    args = parser.parse_args()
+
+    instances = load_instances(args.data) if args.data else add_name_variants(make_synthetic_instances(args.instances))
+    # Cells go through JSON, as they do when stored in the analysis_cube table
+    cells = json.loads(json.dumps(build_cube_cells(instances)))
+    print(f"{len(instances)} instances in {len(cells)} cube cells\n")
+
+    separations = [None] + [list(keys) for size in (1, 2, 3) for keys in combinations(sorted(CUBE_SEPARATION_KEYS), size)]
+    mismatches = 0
+    checked = 0
+    for separation_keys in separations:
+        for filters in FILTERS:
+            params = {"filters": filters, "separation_keys": separation_keys, "stats": {"overall_quality": True}}
+            expected = process_analysis_request(instances, params)
+            actual = rollup_cube(cells, params)
+            checked += 1
+            if {k: expected[k] for k in ("data", "statistics_metadata")} != actual:
+                mismatches += 1
+                print(f"  MISMATCH: separation {separation_keys}, filters {filters}")
+
+    print(f"{checked} requests checked, {mismatches} mismatches\n")
+
+    for separation_keys in [None, ['instructor'], ['instructor', 'year'], ['course_code', 'exact_period']]:
+        params = {"filters": {}, "separation_keys": separation_keys, "stats": {"overall_quality": True}}
+        raw_ms, _ = time_call(lambda: process_analysis_request(instances, params), args.repeat)
+        cube_ms, _ = time_call(lambda: rollup_cube(cells, params), args.repeat)
+        label = ', '.join(separation_keys) if separation_keys else 'no separation'
+        print(f"  {label:<28}{raw_ms:>10.2f} ms raw {cube_ms:>10.2f} ms cube")
+
+    if mismatches:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
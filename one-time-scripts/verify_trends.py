@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import argparse
+
+# Add the project root to the Python path so the backend package can be imported
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+
+from backend.analysis import (
+    STAT_MAPPINGS, compute_sufficient_statistics, get_backend_stat_keys, get_stats_to_calculate,
+    moments_to_statistics, process_analysis_request
+)
+from backend.instance_keys import parse_instance_key
+from backend.trends import build_trend_series, compute_trend_lines, get_period_position
+from benchmark_data import load_instances, make_synthetic_instances
+
+QUESTIONS = [key for key, (_, value_mapping) in STAT_MAPPINGS.items() if value_mapping]
+
+def time_call(func, repeat):
+    """Returns the best wall time in milliseconds over repeat calls, and the last result."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+def make_period_rows(instances):
+    """Sums instances per period and question, like db_utils.get_period_rollup_sums over course_period_rollups."""
+    sums = {}
+    for instance_key, instance in instances.items():
+        parsed_key = parse_instance_key(instance_key)
+        if not parsed_key.period:
+            continue
+        for question, (n, total, total_squares, _) in compute_sufficient_statistics(instance).items():
+            row = sums.setdefault((parsed_key.period, parsed_key.period_order, question), [0, 0, 0, 0])
+            row[0] += n
+            row[1] += total
+            row[2] += total_squares
+            row[3] += 1
+    return [(period, period_order, question, *row) for (period, period_order, question), row in sums.items()]
+
+def naive_trend_lines(period_orders, sums, method, window):
+    """Fits every question's trend line on its own, straight from the definitions."""
+    lines = {}
+    for question, series in sums.items():
+        if method == 'moving_average':
+            values = []
+            for index in range(len(series)):
+                pooled = series[max(index - window + 1, 0):index + 1]
+                n = sum(point[0] for point in pooled)
+                values.append(round(sum(point[1] for point in pooled) / n, 2) if n else None)
+            lines[question] = {"values": values}
+            continue
+        points = [(get_period_position(order), total / n, n)
+                  for order, (n, total, _) in zip(period_orders, series) if n]
+        if len({x for x, _, _ in points}) < 2:
+            lines[question] = {"slope_per_year": None, "values": [None] * len(series)}
+            continue
+        weight = sum(w for _, _, w in points)
+        mean_x = sum(x * w for x, _, w in points) / weight
+        mean_y = sum(y * w for _, y, w in points) / weight
+        slope = (sum(w * (x - mean_x) * (y - mean_y) for x, y, w in points)
+                 / sum(w * (x - mean_x) ** 2 for x, _, w in points))
+        lines[question] = {
+            "slope_per_year": round(slope, 4),
+            "values": [round(mean_y + slope * (get_period_position(order) - mean_x), 2) for order in period_orders],
+        }
+    return lines
+
+def main():
+    parser = argparse.ArgumentParser(description='Check /api/trend series and trend lines against the analysis they summarize.')
+    parser.add_argument('--instances', type=int, default=3000, help='Instances in the synthetic group')
+    parser.add_argument('--data', help='Path to an exported data.json to check instead of synthetic data')
+    parser.add_argument('--repeat', type=int, default=5, help='Repetitions per timing (best time is reported)')
+    args = parser.parse_args()
+
+    instances = load_instances(args.data) if args.data else make_synthetic_instances(args.instances)
+    rows = make_period_rows(instances)
+    periods, period_orders, _, sums = build_trend_series(rows, QUESTIONS)
+    print(f"{len(instances)} instances over {len(periods)} periods, {len(rows)} period rollups\n")
+
+    # Each period's series point must equal /api/analyze separated by exact period
+    _, statkey_reverse_map = get_backend_stat_keys(get_stats_to_calculate({}))
+    expected = process_analysis_request(instances, {"separation_keys": ["exact_period"]})
+    mismatches = 0
+    for question in QUESTIONS:
+        stat = statkey_reverse_map.get(question, question)
+        for period, period_sums in zip(periods, sums[question]):
+            actual = moments_to_statistics(*period_sums)
+            reference = {"mean": expected["data"][period].get(stat), **expected["statistics_metadata"][period][stat]}
+            if reference != actual:
+                mismatches += 1
+                print(f"  SERIES MISMATCH: {stat} in {period}: {actual} != {reference}")
+
+    for method, window in [('moving_average', 1), ('moving_average', 3), ('moving_average', 8), ('regression', None)]:
+        batched = compute_trend_lines(period_orders, sums, method, window or 3)
+        if batched != naive_trend_lines(period_orders, sums, method, window or 3):
+            mismatches += 1
+            print(f"  TREND MISMATCH: {method} (window {window})")
+    print(f"{mismatches} mismatches\n")
+
+    for label, call in [
+        ("series", lambda: build_trend_series(rows, QUESTIONS)),
+        ("moving average, batched", lambda: compute_trend_lines(period_orders, sums, 'moving_average', 3)),
+        ("moving average, naive", lambda: naive_trend_lines(period_orders, sums, 'moving_average', 3)),
+        ("regression, batched", lambda: compute_trend_lines(period_orders, sums, 'regression')),
+        ("regression, naive", lambda: naive_trend_lines(period_orders, sums, 'regression', 3)),
+    ]:
+        elapsed_ms, _ = time_call(call, args.repeat)
+        print(f"  {label:<26}{elapsed_ms:>10.3f} ms")
+
+if __name__ == '__main__':
+    main()